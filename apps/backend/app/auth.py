@@ -1,27 +1,136 @@
 import os
-from datetime import datetime
-from typing import Optional
-
-from apps.backend.app.database import get_session
+import time
+from typing import Any, Dict, List, Optional
+
+from apps.backend.app.database import get_session, set_session_user
+from apps.backend.app.logging_config import logger
+from apps.backend.app.metrics import (
+    Counter,
+    Gauge,
+    auth_verification_duration,
+    registry,
+)
 from apps.backend.app.models.user import User
+from apps.backend.app.repositories.users_repository import UsersRepository
+from apps.backend.app.single_flight import SingleFlight
+from apps.backend.app.token_verifier import (
+    AuthProviderUnavailableError,
+    TokenVerificationError,
+    TokenVerifier,
+)
+from apps.backend.app.user_cache import UserIdentityCache
 from apps.backend.app.utils import load_env
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
 from supabase import Client, create_client
 
 # Load environment variables from .env file
 load_env()
 
-# Create Supabase client directly in auth.py instead of importing from main
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+_supabase_client: Optional[Client] = None
+_token_verifier: Optional[TokenVerifier] = None
+
+
+def get_supabase_client() -> Client:
+    """The Supabase client, created on first use"""
+    global _supabase_client
+    if _supabase_client is None:
+        supabase_url = os.getenv("SUPABASE_URL")
+        supabase_service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+        if not supabase_url or not supabase_service_key:
+            raise ValueError("Missing Supabase environment variables")
+        _supabase_client = create_client(supabase_url, supabase_service_key)
+    return _supabase_client
+
 
-if not supabase_url or not supabase_service_key:
-    raise ValueError("Missing Supabase environment variables")
+def get_token_verifier() -> TokenVerifier:
+    """
+    The token verifier, created on first use.
 
-supabase: Client = create_client(supabase_url, supabase_service_key)
+    Tokens are verified locally where possible; Supabase is only asked about
+    tokens signed with a key we don't know yet (or always, in "remote" mode),
+    so the Supabase client itself is only created when that first happens.
+    """
+    global _token_verifier
+    if _token_verifier is None:
+        supabase_url = os.getenv("SUPABASE_URL")
+        if not supabase_url:
+            raise ValueError("Missing Supabase environment variables")
+        _token_verifier = TokenVerifier(
+            supabase_client_factory=get_supabase_client,
+            supabase_url=supabase_url,
+            jwt_secret=os.getenv("SUPABASE_JWT_SECRET"),
+            mode=os.getenv("AUTH_VERIFICATION_MODE", "local"),
+            jwks_ttl_seconds=float(os.getenv("AUTH_JWKS_CACHE_TTL", "3600")),
+            rejected_token_ttl_seconds=float(
+                os.getenv("AUTH_REJECTED_TOKEN_TTL_SECONDS", "30")
+            ),
+            remote_timeout_seconds=float(os.getenv("AUTH_REMOTE_TIMEOUT_SECONDS", "5")),
+            breaker_failure_threshold=int(
+                os.getenv("AUTH_BREAKER_FAILURE_THRESHOLD", "5")
+            ),
+            breaker_reset_seconds=float(os.getenv("AUTH_BREAKER_RESET_SECONDS", "30")),
+        )
+    return _token_verifier
+
+
+def _forget_clients_after_fork() -> None:
+    # Clients hold connections and event-loop state; a forked child creates
+    # its own on first use
+    global _supabase_client, _token_verifier
+    _supabase_client = None
+    _token_verifier = None
+
+
+os.register_at_fork(after_in_child=_forget_clients_after_fork)
+
+# Users whose row already matches their token claims skip the upsert
+user_cache = UserIdentityCache(
+    max_size=int(os.getenv("USER_CACHE_MAX_SIZE", "10000")),
+    ttl_seconds=float(os.getenv("USER_CACHE_TTL_SECONDS", "300")),
+)
+users_repository = UsersRepository()
+# Concurrent requests with the same token share one verification and upsert
+auth_flight = SingleFlight(name="auth")
+
+
+def collect_user_cache_metrics() -> List:
+    """User identity cache counters, read when /metrics is scraped"""
+    stats = user_cache.stats()
+    lookups = Counter(
+        name="user_cache_lookups_total",
+        documentation="User identity cache lookups by result",
+        label_names=("result",),
+    )
+    lookups.inc(labels=("hit",), amount=stats["hits"])
+    lookups.inc(labels=("miss",), amount=stats["misses"])
+    size = Gauge(name="user_cache_size", documentation="Cached user identities")
+    size.set(value=stats["size"])
+    return [lookups, size]
+
+
+registry.register_collector(collector=collect_user_cache_metrics)
+
+
+def collect_rejected_token_metrics() -> List:
+    """Rejected-token cache counters, read when /metrics is scraped"""
+    if _token_verifier is None:
+        return []
+    stats = _token_verifier.rejected_tokens.stats()
+    hits = Counter(
+        name="auth_rejected_token_cache_hits_total",
+        documentation="Tokens turned away because they were rejected recently",
+    )
+    hits.inc(amount=stats["hits"])
+    size = Gauge(
+        name="auth_rejected_token_cache_size", documentation="Cached rejected tokens"
+    )
+    size.set(value=stats["size"])
+    return [hits, size]
+
+
+registry.register_collector(collector=collect_rejected_token_metrics)
 
 # Security bearer token scheme
 security = HTTPBearer()
@@ -36,67 +145,60 @@ async def get_current_user(
     Verify JWT token, upsert user into database, and return user data.
 
     This function:
-    1. Verifies the JWT token with Supabase
-    2. Gets user data from Supabase Auth
-    3. Upserts user info into our local users table
+    1. Verifies the JWT token (locally, or with Supabase for unknown keys)
+    2. Extracts user data from the token claims
+    3. Upserts user info into our local users table, unless the identity
+       cache says the row is already up to date
     4. Returns the user object from our database
+
+    Concurrent requests bearing the same token share steps 1-3. The
+    request's session is then tied to the user for read-your-writes.
     """
+    snapshot = await auth_flight.do(
+        key=(credentials.credentials,),
+        fn=lambda: _authenticate(token=credentials.credentials, session=session),
+    )
+    await set_session_user(session=session, user_id=snapshot["id"])
+    return User(**snapshot)
+
+
+async def _authenticate(token: str, session: AsyncSession) -> Dict[str, Any]:
+    """Verify ``token`` and sync its user's row; returns the user's fields"""
+    start = time.perf_counter()
+    verifier = get_token_verifier()
     try:
-        token = credentials.credentials
-        # Verify the JWT token with Supabase
-        supabase_user = supabase.auth.get_user(token)
-
-        if not supabase_user or not supabase_user.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        # Extract user data from Supabase Auth
-        auth_user = supabase_user.user
-        user_id = auth_user.id
-        email = auth_user.email
-        name = (
-            auth_user.user_metadata.get("full_name")
-            if auth_user.user_metadata
-            else None
+        identity = await verifier.verify(token=token)
+    except TokenVerificationError as e:
+        auth_verification_duration.observe(
+            value=time.perf_counter() - start, labels=("error",)
         )
-        avatar_url = (
-            auth_user.user_metadata.get("avatar_url")
-            if auth_user.user_metadata
-            else None
-        )
-
-        # Check if user exists in our database
-        statement = select(User).where(User.id == user_id)
-        result = await session.execute(statement)
-        db_user = result.scalar_one_or_none()
-
-        if db_user:
-            # Update existing user
-            db_user.email = email
-            db_user.name = name
-            db_user.avatar_url = avatar_url
-            db_user.updated_at = datetime.utcnow()
-            session.add(db_user)
-            await session.commit()
-            await session.refresh(db_user)
-        else:
-            # Create new user
-            db_user = User(id=user_id, email=email, name=name, avatar_url=avatar_url)
-            session.add(db_user)
-            await session.commit()
-            await session.refresh(db_user)
-
-        return db_user
-
-    except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Authentication error: {str(e)}",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    except AuthProviderUnavailableError as e:
+        auth_verification_duration.observe(
+            value=time.perf_counter() - start, labels=("unavailable",)
+        )
+        logger.warning(f"Token verification unavailable: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication provider unavailable",
+            headers={"Retry-After": str(int(verifier.breaker.reset_timeout))},
+        )
+
+    auth_verification_duration.observe(
+        value=time.perf_counter() - start, labels=("ok",)
+    )
+
+    cached_user = user_cache.get(identity=identity)
+    if cached_user is not None:
+        return cached_user.model_dump()
+
+    db_user = await users_repository.upsert(identity=identity, session=session)
+    user_cache.put(identity=identity, user=db_user)
+    return db_user.model_dump()
 
 
 async def get_optional_user(
@@ -105,13 +207,16 @@ async def get_optional_user(
 ) -> Optional[User]:
     """
     Similar to get_current_user but returns None instead of raising an exception
-    when authentication fails. Useful for endpoints that work both for
-    authenticated and anonymous users.
+    when the token is rejected. Useful for endpoints that work both for
+    authenticated and anonymous users. An unavailable auth provider still
+    raises 503, so a signed-in user isn't silently served as anonymous.
     """
     if not credentials:
         return None
 
     try:
-        return await get_current_user(credentials, session)
-    except HTTPException:
+        return await get_current_user(credentials=credentials, session=session)
+    except HTTPException as e:
+        if e.status_code != status.HTTP_401_UNAUTHORIZED:
+            raise
         return None
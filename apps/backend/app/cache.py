@@ -0,0 +1,249 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import redis.asyncio as redis
+from apps.backend.app.metrics import registry
+
+TRACKS_CACHE_BACKEND = os.getenv("TRACKS_CACHE_BACKEND", "memory")
+TRACKS_CACHE_TTL_SECONDS = int(os.getenv("TRACKS_CACHE_TTL_SECONDS", "300"))
+TRACKS_CACHE_MAX_ENTRIES = int(os.getenv("TRACKS_CACHE_MAX_ENTRIES", "10000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# How long a cold key's repopulation lock is held, and how long other
+# processes wait for the holder to fill the key before loading it themselves
+CACHE_LOCK_TTL_SECONDS = 5.0
+CACHE_LOCK_POLL_SECONDS = 0.05
+# Versions outlive every entry cached under them
+VERSION_TTL_SECONDS = 30 * 24 * 3600
+
+cache_requests = registry.counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result",
+    label_names=("cache", "result"),
+)
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry TTLs"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def add(self, key: str, value: bytes, ttl_seconds: float) -> bool:
+        """Set ``key`` only if it doesn't exist; True if it was set"""
+        if await self.get(key=key) is not None:
+            return False
+        await self.set(key=key, value=value, ttl_seconds=ttl_seconds)
+        return True
+
+    async def incr(self, key: str) -> int:
+        entry = self._entries.get(key)
+        expires_at = entry[0] if entry else float("inf")
+        value = int(entry[1] if entry else 0) + 1
+        self._entries[key] = (expires_at, str(value).encode())
+        self._entries.move_to_end(key)
+        return value
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Cache backend for anything that speaks the Redis protocol"""
+
+    def __init__(self, url: str = REDIS_URL, client: Optional[redis.Redis] = None):
+        self.client = client or redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self.client.set(key, value, px=int(ttl_seconds * 1000))
+
+    async def add(self, key: str, value: bytes, ttl_seconds: float) -> bool:
+        """Set ``key`` only if it doesn't exist; True if it was set"""
+        return bool(
+            await self.client.set(key, value, px=int(ttl_seconds * 1000), nx=True)
+        )
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(key)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_cache_backend(kind: str):
+    """Build the configured cache backend, or None when caching is off"""
+    if kind == "memory":
+        return MemoryCacheBackend(max_entries=TRACKS_CACHE_MAX_ENTRIES)
+    if kind == "redis":
+        return RedisCacheBackend(url=REDIS_URL)
+    if kind in ("", "none"):
+        return None
+    raise ValueError(f"Unknown cache backend: {kind}")
+
+
+class VersionedCache:
+    """
+    Read-through cache of per-user entries with versioned invalidation.
+
+    Every key embeds the owner's current version number, so invalidating all
+    of a user's entries is a single atomic INCR; stale entries simply become
+    unreachable and age out. A cold key is repopulated by one caller only:
+    concurrent callers in this process await the same load, and other
+    processes wait on a short-lived lock key before falling back to loading.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend,
+        ttl_seconds: float = TRACKS_CACHE_TTL_SECONDS,
+    ):
+        self.name = name
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._loading: Dict[str, asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def get(self, owner_id: str, key: str) -> Optional[bytes]:
+        """
+        The cached value, or None without loading it. Only hits are counted;
+        a miss is counted by the get_or_load that follows, if any.
+        """
+        if self.backend is None:
+            return None
+        full_key = await self._full_key(owner_id=owner_id, key=key)
+        value = await self.backend.get(key=full_key)
+        if value is not None:
+            cache_requests.inc(labels=(self.name, "hit"))
+        return value
+
+    async def get_or_load(
+        self, owner_id: str, key: str, loader: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        if self.backend is None:
+            return await loader()
+
+        full_key = await self._full_key(owner_id=owner_id, key=key)
+
+        value = await self.backend.get(key=full_key)
+        if value is not None:
+            cache_requests.inc(labels=(self.name, "hit"))
+            return value
+        cache_requests.inc(labels=(self.name, "miss"))
+
+        in_flight = self._loading.get(full_key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[full_key] = future
+        try:
+            value = await self._load(key=full_key, loader=loader)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't warn about an unread exception
+            future.exception()
+            raise
+        finally:
+            self._loading.pop(full_key, None)
+
+    async def invalidate(self, owner_id: str) -> None:
+        """Make every cached entry of ``owner_id`` unreachable"""
+        if self.backend is None:
+            return
+        version_key = self._version_key(owner_id=owner_id)
+        await self._seed_version(version_key=version_key)
+        await self.backend.incr(key=version_key)
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        lock_key = f"{key}:lock"
+        locked = await self.backend.add(
+            key=lock_key, value=b"1", ttl_seconds=CACHE_LOCK_TTL_SECONDS
+        )
+        if not locked:
+            # Another process is filling this key; wait for it briefly
+            deadline = time.monotonic() + CACHE_LOCK_TTL_SECONDS
+            while time.monotonic() < deadline:
+                await asyncio.sleep(CACHE_LOCK_POLL_SECONDS)
+                value = await self.backend.get(key=key)
+                if value is not None:
+                    return value
+        try:
+            value = await loader()
+            await self.backend.set(key=key, value=value, ttl_seconds=self.ttl_seconds)
+            return value
+        finally:
+            if locked:
+                await self.backend.delete(key=lock_key)
+
+    async def _full_key(self, owner_id: str, key: str) -> str:
+        version = await self._current_version(owner_id=owner_id)
+        return f"{self.name}:{owner_id}:{version}:{key}"
+
+    async def _current_version(self, owner_id: str) -> str:
+        version_key = self._version_key(owner_id=owner_id)
+        version = await self.backend.get(key=version_key)
+        if version is None:
+            await self._seed_version(version_key=version_key)
+            version = await self.backend.get(key=version_key)
+        return version.decode() if isinstance(version, bytes) else str(version)
+
+    async def _seed_version(self, version_key: str) -> None:
+        # A missing version (never set, or evicted) starts from the clock
+        # rather than 0, so it can't collide with entries cached under an
+        # earlier version
+        await self.backend.add(
+            key=version_key,
+            value=str(time.time_ns()).encode(),
+            ttl_seconds=VERSION_TTL_SECONDS,
+        )
+
+    def _version_key(self, owner_id: str) -> str:
+        return f"{self.name}:{owner_id}:version"
+
+
+tracks_cache = VersionedCache(
+    name="tracks", backend=create_cache_backend(kind=TRACKS_CACHE_BACKEND)
+)
@@ -0,0 +1,105 @@
+import time
+from typing import Awaitable, Callable, Tuple, Type, TypeVar
+
+from apps.backend.app.metrics import registry
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+circuit_breaker_state = registry.gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    label_names=("breaker",),
+)
+circuit_breaker_rejected = registry.counter(
+    "circuit_breaker_rejected_total",
+    "Calls failed fast because the circuit was open",
+    label_names=("breaker",),
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a dependency that keeps failing, so callers fail fast
+    instead of each waiting on it.
+
+    Closed: calls go through, and ``failure_threshold`` consecutive failures
+    open the circuit. Open: calls raise CircuitOpenError without reaching the
+    dependency for ``reset_timeout`` seconds. Half-open: one probe call goes
+    through while others keep failing fast; its success closes the circuit
+    and its failure opens it again.
+
+    Any exception counts as a failure except ``ignored`` ones, which mean the
+    dependency answered (e.g. it rejected the request).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        ignored: Tuple[Type[BaseException], ...] = (),
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.ignored = ignored
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        circuit_breaker_state.set(value=STATE_VALUES[CLOSED], labels=(name,))
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._set_state(state=HALF_OPEN)
+        return self._state
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._probing):
+            circuit_breaker_rejected.inc(labels=(self.name,))
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+
+        probe = state == HALF_OPEN
+        self._probing = self._probing or probe
+        try:
+            result = await fn()
+        except self.ignored:
+            self._record_success()
+            raise
+        except Exception:
+            self._record_failure()
+            raise
+        finally:
+            if probe:
+                self._probing = False
+        self._record_success()
+        return result
+
+    def _record_success(self) -> None:
+        self._failures = 0
+        if self._state != CLOSED:
+            self._set_state(state=CLOSED)
+
+    def _record_failure(self) -> None:
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state(state=OPEN)
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        circuit_breaker_state.set(value=STATE_VALUES[state], labels=(self.name,))
@@ -1,9 +1,21 @@
+import asyncio
+import contextvars
+import functools
 import os
-from typing import AsyncGenerator
+import time
+import uuid
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
 
+from apps.backend.app.cache import TRACKS_CACHE_BACKEND, create_cache_backend
+from apps.backend.app.logging_config import logger
+from apps.backend.app.metrics import Counter, Gauge, instrument_engine, registry
 from apps.backend.app.utils import load_env
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from sqlmodel import SQLModel
+from starlette.requests import Request
 
 # Load environment variables from .env file
 load_env()
@@ -17,30 +29,593 @@ RDS_PORT = os.getenv("RDS_PORT", "5432")
 RDS_DATABASE = os.getenv("RDS_DATABASE")
 RDS_USERNAME = os.getenv("RDS_USERNAME")
 
+# Connection pool and driver settings
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+# PgBouncer (transaction pooling) can't keep prepared statements or startup
+# parameters across transactions, so this mode disables both and lets
+# PgBouncer do the pooling
+DB_PGBOUNCER_MODE = os.getenv("DB_PGBOUNCER_MODE", "false").lower() == "true"
+
+
+class PoolMetrics:
+    """Counters describing how long requests wait for a pooled connection"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_seconds_total = 0.0
+        self.checkout_wait_seconds_max = 0.0
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        self.checkouts += 1
+        self.checkout_wait_seconds_total += wait_seconds
+        if wait_seconds > self.checkout_wait_seconds_max:
+            self.checkout_wait_seconds_max = wait_seconds
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records checkout wait times"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.checkout_timeouts += 1
+            raise
+        pool_metrics.record_checkout(wait_seconds=time.perf_counter() - start)
+        return connection
+
+
+def build_engine_options(database_url: str) -> Dict[str, Any]:
+    """Build create_async_engine keyword arguments from the pool settings"""
+    options: Dict[str, Any] = {"echo": DB_ECHO}
+    if not database_url.startswith("postgresql+asyncpg://"):
+        return options
+
+    if DB_PGBOUNCER_MODE:
+        options["poolclass"] = NullPool
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            # Unique names avoid collisions between server connections that
+            # PgBouncer hands to different clients
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+        return options
+
+    connect_args: Dict[str, Any] = {
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+    }
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)
+        }
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    return options
+
+
+# Only run SQLModel.metadata.create_all on startup when explicitly enabled
+# (local development); the schema is otherwise managed by Alembic migrations
+DB_CREATE_TABLES = os.getenv("DB_CREATE_TABLES", "false").lower() == "true"
+
+
+def to_async_url(url: str) -> str:
+    """Convert postgres:// and postgresql:// URLs to postgresql+asyncpg://"""
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
 # Fallback to traditional DATABASE_URL if AWS credentials are not provided
 DATABASE_URL = os.getenv("DATABASE_URL")
-
-# Convert postgres:// to postgresql+asyncpg:// for async support
 if DATABASE_URL:
-    if DATABASE_URL.startswith("postgres://"):
-        DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
-    elif DATABASE_URL.startswith("postgresql://"):
-        DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+    DATABASE_URL = to_async_url(url=DATABASE_URL)
+
+# Read replicas (comma-separated URLs). Reads of GET requests and of
+# read_only repository methods go to a healthy replica, picked by
+# "least_connections" or "round_robin"; everything else uses DATABASE_URL
+DATABASE_REPLICA_URLS = [
+    to_async_url(url=url.strip())
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+DB_REPLICA_BALANCE = os.getenv("DB_REPLICA_BALANCE", "least_connections")
+DB_REPLICA_HEALTH_INTERVAL_SECONDS = float(
+    os.getenv("DB_REPLICA_HEALTH_INTERVAL_SECONDS", "5")
+)
+DB_REPLICA_HEALTH_TIMEOUT_SECONDS = float(
+    os.getenv("DB_REPLICA_HEALTH_TIMEOUT_SECONDS", "2")
+)
+# How long GET /api/health/db waits for the primary to answer SELECT 1
+DB_HEALTH_TIMEOUT_SECONDS = float(os.getenv("DB_HEALTH_TIMEOUT_SECONDS", "2"))
+# After a user commits a write, their reads stay on the primary this long.
+# Keep it above the replicas' usual replication lag.
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+REPLICA_BALANCE_MODES = {"least_connections", "round_robin"}
+
+_engine: Optional[AsyncEngine] = None
 
-    # Create async engine
-    engine = create_async_engine(DATABASE_URL, echo=True)
-    print("Using async database connection with asyncpg")
-else:
-    raise ValueError("No DATABASE_URL found. Please set DATABASE_URL in your .env file")
+
+def get_engine() -> AsyncEngine:
+    """The process-wide async engine, created on first use"""
+    global _engine
+    if _engine is None:
+        if not DATABASE_URL:
+            raise ValueError(
+                "No DATABASE_URL found. Please set DATABASE_URL in your .env file"
+            )
+        _engine = create_async_engine(
+            DATABASE_URL, **build_engine_options(DATABASE_URL)
+        )
+        instrument_engine(engine=_engine.sync_engine)
+    return _engine
+
+
+def _forget_engine_after_fork() -> None:
+    # A forked child (e.g. a pre-forking server) must not share the parent's
+    # pooled connections: drop them without closing the parent's sockets,
+    # and let the child create its own engine on first use
+    global _engine
+    if _engine is not None:
+        _engine.sync_engine.dispose(close=False)
+        _engine = None
+    replicas.forget_after_fork()
+
+
+os.register_at_fork(after_in_child=_forget_engine_after_fork)
+
+
+async def dispose_engine() -> None:
+    """Close all pooled connections (on shutdown)"""
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+    await replicas.dispose()
 
 
 async def create_db_and_tables():
     """Create database tables from SQLModel models"""
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Get an async database session"""
-    async with AsyncSession(engine) as session:
+async def ping_primary(timeout: float = DB_HEALTH_TIMEOUT_SECONDS) -> None:
+    """Run SELECT 1 on a pooled connection to the primary; raises on failure"""
+
+    async def ping() -> None:
+        async with get_engine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.wait_for(ping(), timeout=timeout)
+
+
+class Replica:
+    """A read replica: its engine, health, and the sessions reading from it"""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url
+        self.healthy = True
+        self.last_error: Optional[str] = None
+        self.sessions = 0
+        self._engine: Optional[AsyncEngine] = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            options = build_engine_options(database_url=self.url)
+            if options.get("poolclass") is InstrumentedQueuePool:
+                # Checkout wait metrics describe the primary's pool
+                options["poolclass"] = AsyncAdaptedQueuePool
+            self._engine = create_async_engine(self.url, **options)
+            instrument_engine(engine=self._engine.sync_engine)
+        return self._engine
+
+    async def check(self, timeout: float) -> None:
+        """Mark the replica healthy if it answers SELECT 1 within ``timeout``"""
+        try:
+            await asyncio.wait_for(self._ping(), timeout=timeout)
+        except Exception as e:
+            if self.healthy:
+                logger.warning(f"Read replica {self.name} is unavailable: {e}")
+            self.healthy = False
+            self.last_error = str(e) or type(e).__name__
+            return
+        if not self.healthy:
+            logger.info(f"Read replica {self.name} is available again")
+        self.healthy = True
+        self.last_error = None
+
+    async def _ping(self) -> None:
+        async with self.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    def forget_after_fork(self) -> None:
+        if self._engine is not None:
+            self._engine.sync_engine.dispose(close=False)
+            self._engine = None
+        self.sessions = 0
+
+    async def dispose(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+
+class ReplicaSet:
+    """
+    The configured read replicas. ``choose`` picks a healthy one for a new
+    reading session, or None when there is none and reads fall back to the
+    primary; a background task re-checks every replica's health every
+    ``health_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        balance: str,
+        health_interval: float,
+        health_timeout: float,
+    ):
+        if balance not in REPLICA_BALANCE_MODES:
+            raise ValueError(f"Unknown replica balance mode: {balance}")
+        self.replicas = [
+            Replica(name=f"replica{index}", url=url) for index, url in enumerate(urls)
+        ]
+        self.balance = balance
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self._turn = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        self._turn += 1
+        offset = self._turn % len(healthy)
+        if self.balance == "round_robin":
+            return healthy[offset]
+        # Least connections; rotating the candidates spreads ties round-robin
+        candidates = healthy[offset:] + healthy[:offset]
+        return min(candidates, key=lambda replica: replica.sessions)
+
+    async def check(self) -> None:
+        await asyncio.gather(
+            *[replica.check(timeout=self.health_timeout) for replica in self.replicas]
+        )
+
+    async def start(self) -> None:
+        """Check every replica once, then keep checking in the background"""
+        if not self.replicas or self._task is not None:
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._run(), name="replica-health")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Replica health check failed: {e}", exc_info=True)
+
+    def forget_after_fork(self) -> None:
+        self._task = None
+        for replica in self.replicas:
+            replica.forget_after_fork()
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "sessions": replica.sessions,
+                "last_error": replica.last_error,
+            }
+            for replica in self.replicas
+        ]
+
+
+replicas = ReplicaSet(
+    urls=DATABASE_REPLICA_URLS,
+    balance=DB_REPLICA_BALANCE,
+    health_interval=DB_REPLICA_HEALTH_INTERVAL_SECONDS,
+    health_timeout=DB_REPLICA_HEALTH_TIMEOUT_SECONDS,
+)
+
+
+class RecentWriters:
+    """
+    Users who committed a write in the last ``window`` seconds. Kept in the
+    tracks cache's Redis when it uses one, so every worker sees the mark;
+    otherwise in this process.
+    """
+
+    def __init__(self, window: float, backend_kind: str):
+        self.window = window
+        self.backend_kind = backend_kind
+        self._backend = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = create_cache_backend(kind=self.backend_kind)
+        return self._backend
+
+    async def mark(self, user_id: str) -> None:
+        if self.window <= 0:
+            return
+        try:
+            await self.backend.set(
+                key=self._key(user_id=user_id), value=b"1", ttl_seconds=self.window
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record a write for read-your-writes: {e}")
+
+    async def wrote_recently(self, user_id: str) -> bool:
+        if self.window <= 0:
+            return False
+        try:
+            return await self.backend.get(key=self._key(user_id=user_id)) is not None
+        except Exception as e:
+            # Can't tell, so read from the primary
+            logger.warning(f"Failed to look up recent writes: {e}")
+            return True
+
+    async def close(self) -> None:
+        if self._backend is not None:
+            await self._backend.close()
+            self._backend = None
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f"recent-write:{user_id}"
+
+
+recent_writers = RecentWriters(
+    window=READ_YOUR_WRITES_SECONDS,
+    backend_kind="redis" if TRACKS_CACHE_BACKEND == "redis" else "memory",
+)
+
+read_routes = registry.counter(
+    "db_read_routes_total",
+    "Reading sessions by the database their reads were routed to",
+    label_names=("target",),
+)
+
+# Set while a read_only repository method runs
+_read_only_call: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "read_only_call", default=False
+)
+
+
+def read_only(fn: Callable) -> Callable:
+    """
+    Mark a repository method as a plain read that a replica may answer,
+    even in a request that writes. Only for reads whose results aren't
+    written back: a replica may lag the primary.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        token = _read_only_call.set(True)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _read_only_call.reset(token)
+
+    return wrapper
+
+
+class ReplicaRoutingSession(Session):
+    """
+    Routes a session's reads to one replica when ``info["read_replica"]``
+    is set (GET requests) or a read_only method is running. Flushes,
+    DML, locking reads and raw SQL go to the primary, and once a session
+    has used the primary for those, all its statements do.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = get_engine().sync_engine
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info["wrote"] = True
+            self.info["primary_only"] = True
+            return primary
+        is_plain_read = (
+            getattr(clause, "is_select", False)
+            and getattr(clause, "_for_update_arg", None) is None
+        )
+        if not is_plain_read:
+            self.info["primary_only"] = True
+            return primary
+        if self.info.get("primary_only") or not (
+            self.info.get("read_replica") or _read_only_call.get()
+        ):
+            return primary
+
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = replicas.choose()
+            if replica is None:
+                read_routes.inc(labels=("primary_fallback",))
+                self.info["primary_only"] = True
+                return primary
+            read_routes.inc(labels=("replica",))
+            replica.sessions += 1
+            self.info["replica"] = replica
+        return replica.engine.sync_engine
+
+
+class RoutingAsyncSession(AsyncSession):
+    """AsyncSession over ReplicaRoutingSession that records users' writes"""
+
+    sync_session_class = ReplicaRoutingSession
+
+    async def commit(self) -> None:
+        await super().commit()
+        user_id = self.info.get("user_id")
+        if self.info.pop("wrote", False) and user_id:
+            await recent_writers.mark(user_id=user_id)
+
+    async def close(self) -> None:
+        replica = self.info.pop("replica", None)
+        if replica is not None:
+            replica.sessions -= 1
+        await super().close()
+
+
+def new_session(read_replica: bool = False) -> AsyncSession:
+    """
+    A session on the primary that, with replicas configured, sends its
+    reads to one when ``read_replica`` is set
+    """
+    if not replicas.replicas:
+        return AsyncSession(get_engine())
+    session = RoutingAsyncSession(get_engine())
+    session.info["read_replica"] = read_replica
+    return session
+
+
+async def set_session_user(session: AsyncSession, user_id: str) -> None:
+    """
+    Record the user a session acts for: their commits mark them as a recent
+    writer, and a recent writer's reads stay on the primary
+    """
+    session.info["user_id"] = user_id
+    if isinstance(session, RoutingAsyncSession) and not session.info.get(
+        "primary_only"
+    ):
+        if await recent_writers.wrote_recently(user_id=user_id):
+            read_routes.inc(labels=("primary_recent_write",))
+            session.info["primary_only"] = True
+
+
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Get an async database session; GET requests may read from a replica"""
+    async with new_session(read_replica=request.method in ("GET", "HEAD")) as session:
         yield session
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Current pool occupancy plus checkout wait statistics"""
+    pool = get_engine().sync_engine.pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    checkouts = pool_metrics.checkouts
+    stats.update(
+        checkouts=checkouts,
+        checkout_timeouts=pool_metrics.checkout_timeouts,
+        checkout_wait_seconds_avg=(
+            pool_metrics.checkout_wait_seconds_total / checkouts if checkouts else 0.0
+        ),
+        checkout_wait_seconds_max=pool_metrics.checkout_wait_seconds_max,
+    )
+    return stats
+
+
+def collect_pool_metrics() -> List:
+    """Pool stats as metrics, read when /metrics is scraped"""
+    if _engine is None:
+        return []
+    stats = pool_stats()
+
+    connections = Gauge(
+        name="db_pool_connections",
+        documentation="Pooled database connections by state",
+        label_names=("state",),
+    )
+    for state in ("size", "checked_in", "checked_out", "overflow"):
+        if state in stats:
+            connections.set(value=stats[state], labels=(state,))
+    checkouts = Counter(
+        name="db_pool_checkouts_total", documentation="Connection pool checkouts"
+    )
+    checkouts.inc(amount=stats["checkouts"])
+    timeouts = Counter(
+        name="db_pool_checkout_timeouts_total",
+        documentation="Checkouts that timed out waiting for a connection",
+    )
+    timeouts.inc(amount=stats["checkout_timeouts"])
+    wait_total = Counter(
+        name="db_pool_checkout_wait_seconds_total",
+        documentation="Total time spent waiting for a pooled connection",
+    )
+    wait_total.inc(amount=pool_metrics.checkout_wait_seconds_total)
+    wait_max = Gauge(
+        name="db_pool_checkout_wait_seconds_max",
+        documentation="Longest wait for a pooled connection",
+    )
+    wait_max.set(value=stats["checkout_wait_seconds_max"])
+    return [connections, checkouts, timeouts, wait_total, wait_max]
+
+
+registry.register_collector(collector=collect_pool_metrics)
+
+
+def collect_replica_metrics() -> List:
+    """Replica health and reading sessions, read when /metrics is scraped"""
+    if not replicas.replicas:
+        return []
+    healthy = Gauge(
+        name="db_replica_healthy",
+        documentation="Whether a read replica passed its last health check",
+        label_names=("replica",),
+    )
+    sessions = Gauge(
+        name="db_replica_sessions",
+        documentation="Open sessions reading from a replica",
+        label_names=("replica",),
+    )
+    for replica in replicas.replicas:
+        healthy.set(value=1 if replica.healthy else 0, labels=(replica.name,))
+        sessions.set(value=replica.sessions, labels=(replica.name,))
+    return [healthy, sessions]
+
+
+registry.register_collector(collector=collect_replica_metrics)
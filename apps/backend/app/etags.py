@@ -0,0 +1,65 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Sequence
+
+_VERSION_FORMAT = "%Y%m%d%H%M%S%f"
+
+# Clients may reuse a cached copy but must revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_track_etag(updated_at: datetime) -> str:
+    """Strong ETag for a single track, derived from its updated_at"""
+    return f'"{updated_at.strftime(_VERSION_FORMAT)}"'
+
+
+def parse_track_etag(etag: str) -> Optional[datetime]:
+    """Recover updated_at from a track ETag, or None if it isn't one of ours"""
+    value = etag.strip()
+    if value.startswith("W/"):
+        return None
+    try:
+        return datetime.strptime(value.strip('"'), _VERSION_FORMAT)
+    except ValueError:
+        return None
+
+
+def make_list_etag(
+    last_updated_at: Optional[datetime], count: int, params: Sequence[object]
+) -> str:
+    """
+    Strong ETag for a user's track list.
+
+    Creates and edits move the latest updated_at and deletes change the count;
+    the query params are included since they select what the body contains.
+    """
+    version = last_updated_at.strftime(_VERSION_FORMAT) if last_updated_at else "0"
+    key = "|".join([version, str(count), *(str(param) for param in params)])
+    return f'"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def format_http_date(value: datetime) -> str:
+    """Format a naive UTC datetime for Last-Modified"""
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    """True if ``last_modified`` is no later than an If-Modified-Since date"""
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have second precision
+    modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+    return modified <= since
@@ -0,0 +1,373 @@
+import argparse
+import heapq
+import math
+import mmap
+import struct
+import sys
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+# File layout (little-endian), every section starting on an 8-byte boundary:
+#   header         magic, version, node count, edge count, title bytes
+#   offsets        u64[nodes + 1]  node i links to targets[offsets[i]:offsets[i + 1]]
+#   targets        u32[edges]      sorted, without duplicates or self-links
+#   in_degree      u32[nodes]
+#   title_offsets  u64[nodes + 1]  into the UTF-8 title blob
+#   titles         node ids are assigned in byte order of the titles, so a
+#                  title is found by binary search without loading an index
+MAGIC = b"VLG1"
+VERSION = 1
+HEADER = struct.Struct("<4sIIQQ4x")
+
+# Personalized PageRank: probability of jumping back to the seed articles at
+# each step, and the residual below which a node's mass isn't pushed further
+PAGERANK_ALPHA = 0.15
+PAGERANK_EPSILON = 1e-4
+
+
+def normalize_title(title: str) -> str:
+    """A title as Wikipedia stores it: spaces, not underscores, first letter upper"""
+    title = " ".join(title.replace("_", " ").split())
+    return title[:1].upper() + title[1:]
+
+
+def _padding(length: int) -> bytes:
+    return b"\0" * (-length % 8)
+
+
+@dataclass
+class Suggestion:
+    title: str
+    score: float
+    # Suggested articles placed earlier that this one links to
+    prerequisites: List[str] = field(default_factory=list)
+    # Completed articles this one links to
+    completed_prerequisites: List[str] = field(default_factory=list)
+
+
+class LinkGraph:
+    """
+    A Wikipedia page-link graph in compressed sparse row form, read through
+    a read-only memory map: opening it reads only the header, pages are
+    loaded by the OS as queries touch them, and processes mapping the same
+    file share them.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, nodes, edges, title_bytes = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} link graph")
+        if sys.byteorder != "little":
+            self.close()
+            raise ValueError("Link graphs can only be read on little-endian hosts")
+
+        self.node_count = nodes
+        self.edge_count = edges
+        view = memoryview(self._map)
+        position = HEADER.size
+
+        def section(length: int, item_format: str) -> memoryview:
+            nonlocal position
+            start = position
+            position += length + (-length % 8)
+            return view[start : start + length].cast(item_format)
+
+        self._offsets = section(length=8 * (nodes + 1), item_format="Q")
+        self._targets = section(length=4 * edges, item_format="I")
+        self._in_degree = section(length=4 * nodes, item_format="I")
+        self._title_offsets = section(length=8 * (nodes + 1), item_format="Q")
+        self._titles = view[position : position + title_bytes]
+        self._view = view
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._map)
+
+    def close(self) -> None:
+        # The map can only be closed once no view of it is left
+        for name in (
+            "_offsets",
+            "_targets",
+            "_in_degree",
+            "_title_offsets",
+            "_titles",
+            "_view",
+        ):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+        self._file.close()
+
+    def title(self, node: int) -> str:
+        start, end = self._title_offsets[node], self._title_offsets[node + 1]
+        return bytes(self._titles[start:end]).decode()
+
+    def find(self, title: str) -> Optional[int]:
+        """The node id of an article, or None if the graph doesn't have it"""
+        key = normalize_title(title=title).encode()
+        low, high = 0, self.node_count
+        while low < high:
+            middle = (low + high) // 2
+            start = self._title_offsets[middle]
+            candidate = bytes(self._titles[start : self._title_offsets[middle + 1]])
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def links(self, node: int) -> memoryview:
+        """Ids of the articles ``node`` links to"""
+        return self._targets[self._offsets[node] : self._offsets[node + 1]]
+
+    def personalized_pagerank(
+        self,
+        seeds: Sequence[int],
+        alpha: float = PAGERANK_ALPHA,
+        epsilon: float = PAGERANK_EPSILON,
+        max_edges: int = 200000,
+    ) -> Dict[int, float]:
+        """
+        Approximate PageRank personalized to ``seeds``, following links
+        (Andersen, Chung and Lang's local push). Only the neighbourhood
+        holding most of the mass is visited: at most about
+        1 / (alpha * epsilon) link traversals whatever the size of the
+        graph, and never more than ``max_edges``.
+        """
+        offsets, targets = self._offsets, self._targets
+        residual: Dict[int, float] = dict.fromkeys(seeds, 1.0 / len(seeds))
+        estimate: Dict[int, float] = {}
+        queue = deque(residual)
+        # Seeds are pushed at least once, however many links they have
+        unpushed_seeds = set(residual)
+        visited_edges = 0
+        while queue and visited_edges < max_edges:
+            node = queue.popleft()
+            mass = residual[node]
+            start, end = offsets[node], offsets[node + 1]
+            degree = end - start
+            if mass < epsilon * (degree or 1) and node not in unpushed_seeds:
+                continue
+            unpushed_seeds.discard(node)
+            residual[node] = 0.0
+            estimate[node] = estimate.get(node, 0.0) + alpha * mass
+            if not degree:
+                continue
+            share = (1 - alpha) * mass / degree
+            for target in targets[start:end]:
+                before = residual.get(target, 0.0)
+                after = before + share
+                residual[target] = after
+                threshold = epsilon * (offsets[target + 1] - offsets[target] or 1)
+                if before < threshold <= after:
+                    queue.append(target)
+            visited_edges += degree
+        return estimate
+
+    def suggest(
+        self,
+        titles: Sequence[str],
+        limit: int,
+        exclude: Iterable[str] = (),
+        max_edges: int = 200000,
+    ) -> Tuple[List[Suggestion], List[str]]:
+        """
+        Up to ``limit`` articles related to ``titles``, prerequisites first,
+        leaving out ``titles`` and ``exclude``. Returns the suggestions and
+        the titles the graph doesn't know.
+
+        Relatedness is personalized PageRank from ``titles``, divided by the
+        square root of each article's in-degree so that pages linked from
+        everywhere (countries, years) don't crowd out topical ones.
+        """
+        seeds: List[int] = []
+        unknown: List[str] = []
+        for title in titles:
+            node = self.find(title=title)
+            if node is None:
+                unknown.append(title)
+            elif node not in seeds:
+                seeds.append(node)
+        if not seeds:
+            return [], unknown
+
+        completed = {self.find(title=title) for title in exclude}
+        completed.discard(None)
+        excluded = completed | set(seeds)
+        ranks = self.personalized_pagerank(seeds=seeds, max_edges=max_edges)
+        scores = {
+            node: rank / math.sqrt(1 + self._in_degree[node])
+            for node, rank in ranks.items()
+            if node not in excluded
+        }
+        chosen = heapq.nlargest(limit, scores, key=scores.__getitem__)
+
+        suggestions = []
+        for node, prerequisites in self.prerequisite_order(nodes=chosen, scores=scores):
+            suggestions.append(
+                Suggestion(
+                    title=self.title(node=node),
+                    score=scores[node],
+                    prerequisites=[self.title(node=other) for other in prerequisites],
+                    completed_prerequisites=[
+                        self.title(node=other)
+                        for other in self.links(node=node)
+                        if other in completed
+                    ],
+                )
+            )
+        return suggestions, unknown
+
+    def prerequisite_order(
+        self, nodes: Sequence[int], scores: Dict[int, float]
+    ) -> Iterator[Tuple[int, List[int]]]:
+        """
+        ``nodes`` ordered so that articles come after the ones they link to,
+        with each node's linked predecessors. An article's links are taken as
+        the concepts it builds on. Among articles whose prerequisites are all
+        placed, the most related goes first; a cycle of mutual links is
+        broken at the article with the fewest unplaced prerequisites.
+        """
+        chosen = set(nodes)
+        prerequisites: Dict[int, Set[int]] = {
+            node: {other for other in self.links(node=node) if other in chosen}
+            for node in nodes
+        }
+        dependents: Dict[int, List[int]] = {node: [] for node in nodes}
+        for node, needs in prerequisites.items():
+            for other in needs:
+                dependents[other].append(node)
+        unmet = {node: len(needs) for node, needs in prerequisites.items()}
+        ready = [(-scores[node], node) for node in nodes if not unmet[node]]
+        heapq.heapify(ready)
+        placed: Set[int] = set()
+        while len(placed) < len(nodes):
+            if ready:
+                _, node = heapq.heappop(ready)
+                if node in placed:
+                    continue
+            else:
+                node = min(
+                    (node for node in nodes if node not in placed),
+                    key=lambda node: (unmet[node], -scores[node]),
+                )
+            placed.add(node)
+            yield node, [other for other in prerequisites[node] if other in placed]
+            for dependent in dependents[node]:
+                unmet[dependent] -= 1
+                if not unmet[dependent] and dependent not in placed:
+                    heapq.heappush(ready, (-scores[dependent], dependent))
+
+
+def write_link_graph(
+    path: str, titles: Sequence[str], offsets: array, targets: array
+) -> None:
+    """
+    Write a graph whose node i is ``titles[i]`` and links to
+    ``targets[offsets[i]:offsets[i + 1]]``. ``titles`` must be normalized
+    and in strictly increasing UTF-8 byte order.
+    """
+    encoded = [title.encode() for title in titles]
+    if any(encoded[i] >= encoded[i + 1] for i in range(len(encoded) - 1)):
+        raise ValueError("Titles must be unique and sorted by their UTF-8 bytes")
+    if offsets.typecode != "Q" or targets.typecode != "I":
+        raise ValueError("offsets must be array('Q') and targets array('I')")
+
+    in_degree = array("I", bytes(4 * len(titles)))
+    for target in targets:
+        in_degree[target] += 1
+    title_offsets = array("Q", [0])
+    total = 0
+    for title in encoded:
+        total += len(title)
+        title_offsets.append(total)
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(titles), len(targets), total))
+        for section in (offsets, targets, in_degree, title_offsets):
+            data = section.tobytes()
+            file.write(data + _padding(length=len(data)))
+        for title in encoded:
+            file.write(title)
+
+
+def build_link_graph(edges: Iterable[Tuple[str, str]], path: str) -> Tuple[int, int]:
+    """
+    Write the graph of ``edges`` (source title, target title) to ``path``;
+    returns its node and edge counts. Holds every title in memory, so large
+    dumps need a few GB.
+    """
+    ids: Dict[str, int] = {}
+    sources = array("I")
+    targets = array("I")
+    for source, target in edges:
+        source_id = ids.setdefault(normalize_title(title=source), len(ids))
+        target_id = ids.setdefault(normalize_title(title=target), len(ids))
+        if source_id != target_id:
+            sources.append(source_id)
+            targets.append(target_id)
+
+    titles = sorted(ids, key=str.encode)
+    rank = array("I", bytes(4 * len(titles)))
+    for node, title in enumerate(titles):
+        rank[ids[title]] = node
+    del ids
+
+    # Group the links by source node, then sort and deduplicate each list
+    starts = array("Q", bytes(8 * (len(titles) + 1)))
+    for source in sources:
+        starts[rank[source] + 1] += 1
+    for node in range(len(titles)):
+        starts[node + 1] += starts[node]
+    grouped = array("I", bytes(4 * len(targets)))
+    fill = array("Q", starts)
+    for source, target in zip(sources, targets):
+        node = rank[source]
+        grouped[fill[node]] = rank[target]
+        fill[node] += 1
+    del sources, targets, fill
+
+    offsets = array("Q", [0])
+    links = array("I")
+    for node in range(len(titles)):
+        links.extend(sorted(set(grouped[starts[node] : starts[node + 1]])))
+        offsets.append(len(links))
+    write_link_graph(path=path, titles=titles, offsets=offsets, targets=links)
+    return len(titles), len(links)
+
+
+def read_edges(path: str) -> Iterator[Tuple[str, str]]:
+    """(source, target) title pairs from a tab-separated file, one link per line"""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            source, _, target = line.rstrip("\n").partition("\t")
+            if source and target:
+                yield source, target
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m apps.backend.app.link_graph",
+        description="Build a link graph file from a tab-separated list of links",
+    )
+    parser.add_argument("edges", help="File of 'source<TAB>target' title lines")
+    parser.add_argument("output", help="Link graph file to write")
+    options = parser.parse_args(argv)
+    nodes, edges = build_link_graph(
+        edges=read_edges(path=options.edges), path=options.output
+    )
+    print(f"Wrote {nodes} articles and {edges} links to {options.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
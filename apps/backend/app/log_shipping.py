@@ -0,0 +1,193 @@
+import copy
+import logging
+import queue
+import threading
+import time
+import weakref
+from collections import deque
+from logging.handlers import QueueHandler
+from typing import Any, Dict, List, Optional
+
+import watchtower
+from apps.backend.app.metrics import Counter, registry
+
+# Live QueuedHandler instances, for the dropped-records metric
+_queued_handlers: "weakref.WeakSet[QueuedHandler]" = weakref.WeakSet()
+
+
+class InMemoryLogSink(logging.Handler):
+    """Keeps the most recent formatted records in memory (for tests and local runs)"""
+
+    def __init__(self, capacity: int = 10000):
+        super().__init__()
+        self.records: deque = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(self.format(record))
+
+
+def create_sink(kind: str, options: Optional[Dict[str, Any]] = None) -> logging.Handler:
+    """Build the handler that shipped log records are finally written to"""
+    options = dict(options or {})
+    if kind == "cloudwatch":
+        return watchtower.CloudWatchLogHandler(
+            log_group_name=options["log_group"],
+            log_stream_name=options["stream_name"],
+            boto3_client=options["boto3_client"],
+            send_interval=options.get("send_interval", 5),
+        )
+    if kind == "file":
+        return logging.FileHandler(options.get("path", "project-vista.log"))
+    if kind == "memory":
+        return InMemoryLogSink(capacity=options.get("capacity", 10000))
+    raise ValueError(f"Unknown log sink: {kind}")
+
+
+class BatchingQueueListener:
+    """
+    Drains a log queue on a background thread and hands records to the sink
+    handlers in batches, flushing when a batch is full or the flush interval
+    has elapsed, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        handlers: List[logging.Handler],
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+    ):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._thread: Optional[threading.Thread] = None
+        # Out of band, so a full queue dropping its oldest records can't lose it
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="log-shipping", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Flush everything already queued and stop the thread, waiting at most
+        ``timeout`` seconds for a sink that hangs
+        """
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        batch: List[logging.LogRecord] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            if self._stopping.is_set():
+                while True:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                self._flush(batch=batch)
+                return
+            # Wake up at least every 0.1s to notice a stop
+            timeout = min(max(0.0, deadline - time.monotonic()), 0.1)
+            try:
+                record = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                record = None
+
+            if record is not None:
+                batch.append(record)
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(batch=batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _flush(self, batch: List[logging.LogRecord]) -> None:
+        if not batch:
+            return
+        for handler in self.handlers:
+            for record in batch:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            handler.flush()
+
+
+class QueuedHandler(QueueHandler):
+    """
+    Logging handler that only enqueues records; a background listener ships
+    them to the sink.
+
+    The buffer is bounded: when it is full the oldest queued record is dropped
+    to make room, and ``dropped_records`` counts how many were lost. Records
+    are formatted on the listener thread with the formatter configured for
+    this handler.
+    """
+
+    def __init__(
+        self,
+        sink: str,
+        sink_options: Optional[Dict[str, Any]] = None,
+        queue_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+    ):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.dropped_records = 0
+        self.sink = create_sink(kind=sink, options=sink_options)
+        self.listener = BatchingQueueListener(
+            log_queue=self.queue,
+            handlers=[self.sink],
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+        )
+        self.listener.start()
+        _queued_handlers.add(self)
+
+    def setFormatter(self, fmt: Optional[logging.Formatter]) -> None:
+        # Formatting is deferred to the sink, off the caller's thread
+        self.sink.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolve the message arguments now, since they may be mutable
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped_records += 1
+                except queue.Empty:
+                    pass
+
+    def close(self) -> None:
+        self.listener.stop()
+        self.sink.close()
+        super().close()
+
+
+def collect_log_shipping_metrics() -> List:
+    """Records dropped by full shipping queues, read when /metrics is scraped"""
+    dropped = Counter(
+        name="log_records_dropped_total",
+        documentation="Log records dropped because the shipping queue was full",
+    )
+    dropped.inc(amount=sum(handler.dropped_records for handler in _queued_handlers))
+    return [dropped]
+
+
+registry.register_collector(collector=collect_log_shipping_metrics)
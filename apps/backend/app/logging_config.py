@@ -3,8 +3,6 @@ import logging.config
 import os
 from typing import Any, Dict
 
-import boto3
-
 
 def get_logging_config() -> Dict[str, Any]:
     """Get logging configuration based on environment"""
@@ -50,6 +48,12 @@ def get_logging_config() -> Dict[str, Any]:
             },
             "fastapi": {"level": "INFO", "handlers": ["console"], "propagate": False},
             "uvicorn": {"level": "INFO", "handlers": ["console"], "propagate": False},
+            # LoggingMiddleware already logs every request
+            "uvicorn.access": {
+                "level": "WARNING",
+                "handlers": ["console"],
+                "propagate": False,
+            },
             "sqlalchemy": {
                 "level": "WARNING",
                 "handlers": ["console"],
@@ -59,46 +63,71 @@ def get_logging_config() -> Dict[str, Any]:
         "root": {"level": "INFO", "handlers": ["console"]},
     }
 
-    # Add CloudWatch handler for production/staging
-    if environment in ["prod", "staging"]:
+    # Ship logs to CloudWatch for production/staging. LOG_SINK can override the
+    # destination ("memory" or "file" are handy for tests and local runs).
+    log_sink = os.getenv(
+        "LOG_SINK", "cloudwatch" if environment in ["prod", "staging"] else ""
+    )
+    if log_sink:
         try:
-            # Create CloudWatch handler
-            config["handlers"]["cloudwatch"] = {
-                "class": "watchtower.CloudWatchLogHandler",
+            # Request coroutines only enqueue records; a background thread
+            # batches them into the sink
+            sink_options = {
                 "log_group": log_group_name,
                 "stream_name": f"{environment}-api",
-                "boto3_client": boto3.client('logs', region_name=aws_region),
+                "path": os.getenv("LOG_SINK_FILE", "project-vista.log"),
+            }
+            if log_sink == "cloudwatch":
+                # Imported here: boto3 is slow to import and only needed for
+                # CloudWatch shipping
+                import boto3
+
+                sink_options["boto3_client"] = boto3.client(
+                    'logs', region_name=aws_region
+                )
+
+            config["handlers"]["shipping"] = {
+                "()": "apps.backend.app.log_shipping.QueuedHandler",
+                "sink": log_sink,
+                "sink_options": sink_options,
+                "queue_size": int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+                "batch_size": int(os.getenv("LOG_BATCH_SIZE", "100")),
+                "flush_interval": float(os.getenv("LOG_FLUSH_INTERVAL", "1.0")),
                 "level": "INFO",
                 "formatter": "detailed",
-                "max_batch_size": 10,
-                "max_batch_count": 10000,
             }
 
-            # Add cloudwatch to all loggers
+            # Add the shipping handler to all loggers
             for logger_name in config["loggers"]:
-                config["loggers"][logger_name]["handlers"].append("cloudwatch")
+                config["loggers"][logger_name]["handlers"].append("shipping")
 
-            config["root"]["handlers"].append("cloudwatch")
+            config["root"]["handlers"].append("shipping")
 
         except Exception as e:
-            print(f"Failed to setup CloudWatch logging: {e}")
+            print(f"Failed to setup {log_sink} log shipping: {e}")
             print("Falling back to console logging only")
 
     return config
 
 
+_logging_configured = False
+
+
 def setup_logging():
-    """Initialize logging configuration"""
+    """Initialize logging configuration (once per process)"""
+    global _logging_configured
+    logger = logging.getLogger("project_vista")
+    if _logging_configured:
+        return logger
+
     config = get_logging_config()
     logging.config.dictConfig(config)
+    _logging_configured = True
 
-    # Get the project logger
-    logger = logging.getLogger("project_vista")
     environment = os.getenv("ENVIRONMENT", "dev")
-
     logger.info(f"Logging initialized for environment: {environment}")
     return logger
 
 
-# Create the main logger instance
-logger = setup_logging()
+# The main logger instance; handlers are attached by setup_logging() at startup
+logger = logging.getLogger("project_vista")
@@ -1,19 +1,75 @@
-import logging.config
+from contextlib import asynccontextmanager
 
-import uvicorn
-from apps.backend.app.auth import get_current_user
-from apps.backend.app.database import create_db_and_tables
-from apps.backend.app.logging_config import get_logging_config, logger
+from apps.backend.app.auth import (
+    get_current_user,
+    get_supabase_client,
+    get_token_verifier,
+)
+from apps.backend.app.cache import tracks_cache
+from apps.backend.app.database import (
+    DB_CREATE_TABLES,
+    create_db_and_tables,
+    dispose_engine,
+    get_engine,
+    ping_primary,
+    pool_stats,
+    recent_writers,
+    replicas,
+)
+from apps.backend.app.logging_config import logger, setup_logging
+from apps.backend.app.metrics import MetricsMiddleware, registry
 from apps.backend.app.middleware import LoggingMiddleware
-from apps.backend.app.routes import tracks
+from apps.backend.app.routes import home, tracks
+from apps.backend.app.server import run_server
+from apps.backend.app.services.suggestion_service import suggestion_service
+from apps.backend.app.services.trending_service import trending_refresher
+from apps.backend.app.services.wikipedia_service import wikipedia_service
+from apps.backend.app.tasks import task_runner
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
-# Initialize logging configuration
-logging_config = get_logging_config()
-logging.config.dictConfig(logging_config)
 
-app = FastAPI(title="Project Vista API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create process-wide clients on startup and release them on shutdown.
+
+    Nothing here runs at import time, so importing the app (tests, worker
+    forks, tooling) needs no credentials and opens no connections.
+    """
+    setup_logging()
+    logger.info("Starting Project Vista API...")
+    get_engine()
+    if get_token_verifier().mode == "remote":
+        get_supabase_client()
+    if DB_CREATE_TABLES:
+        await create_db_and_tables()
+        logger.info("Database tables initialized")
+    await replicas.start()
+    trending_refresher.start()
+    task_runner.start()
+    yield
+    # Running jobs still need the clients closed below
+    await task_runner.stop()
+    await trending_refresher.stop()
+    await replicas.stop()
+    await wikipedia_service.close()
+    suggestion_service.close()
+    await tracks_cache.close()
+    await recent_writers.close()
+    await dispose_engine()
+
+
+app = FastAPI(
+    title="Project Vista API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+# Request metrics (inside the logging middleware)
+app.add_middleware(MetricsMiddleware)
 
 # Add logging middleware (should be first)
 app.add_middleware(LoggingMiddleware)
@@ -28,14 +84,6 @@ app.add_middleware(
 )
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database tables on startup"""
-    logger.info("Starting Project Vista API...")
-    await create_db_and_tables()
-    logger.info("Database tables initialized")
-
-
 @app.get("/")
 def read_root():
     logger.info("Root endpoint accessed")
@@ -58,9 +106,35 @@ def health_check():
     return {"status": "healthy", "service": "project-vista-api"}
 
 
+@app.get("/api/health/db")
+async def database_health_check():
+    """
+    Whether the primary answers SELECT 1 (503 if not), with connection pool
+    occupancy, checkout wait times and replica health
+    """
+    content = {"status": "healthy", "pool": pool_stats(), "replicas": replicas.stats()}
+    try:
+        await ping_primary()
+    except Exception as e:
+        logger.warning(f"Database health check failed: {e}")
+        content["status"] = "unhealthy"
+        content["error"] = str(e) or type(e).__name__
+        return ORJSONResponse(status_code=503, content=content)
+    return content
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus metrics in the text exposition format"""
+    return PlainTextResponse(
+        content=registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
 # Include routers
 app.include_router(tracks.router)
+app.include_router(home.router)
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    run_server()
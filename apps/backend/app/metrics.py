@@ -0,0 +1,372 @@
+import hashlib
+import re
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Metrics are plain counters updated without locks: every update happens on
+# the event loop thread (or, for sync code, loses at most a rare increment),
+# and labels are tuples so recording a value allocates nothing per request.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+# Distinct statement fingerprints tracked before new ones are lumped together
+MAX_STATEMENT_FINGERPRINTS = 500
+STATEMENT_LABEL_LENGTH = 160
+OTHER_STATEMENT = "other"
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value=str(value))}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """A counter or gauge: one value per label tuple"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for labels, value in list(self.values.items()):
+            formatted_labels = _format_labels(names=self.label_names, values=labels)
+            lines.append(f"{self.name}{formatted_labels} {_format_value(value=value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+
+    type_name = "counter"
+
+
+class Gauge(_Metric):
+    """A value that goes up and down"""
+
+    type_name = "gauge"
+
+    def dec(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+    def set(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        self.values[labels] = value
+
+
+class _HistogramSeries:
+    __slots__ = ("bucket_counts", "sum", "count")
+
+    def __init__(self, bucket_count: int):
+        # One slot per upper bound plus one for +Inf; made cumulative on render
+        self.bucket_counts = [0] * (bucket_count + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """Latency histogram with fixed buckets, one series per label tuple"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self.series: Dict[Tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series.setdefault(
+                labels, _HistogramSeries(bucket_count=len(self.buckets))
+            )
+        series.bucket_counts[bisect_left(self.buckets, value)] += 1
+        series.sum += value
+        series.count += 1
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        bucket_label_names = self.label_names + ("le",)
+        upper_bounds = [_format_value(value=bound) for bound in self.buckets]
+        upper_bounds.append("+Inf")
+        for labels, series in list(self.series.items()):
+            cumulative = 0
+            for upper_bound, bucket_count in zip(upper_bounds, series.bucket_counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(
+                    names=bucket_label_names, values=labels + (upper_bound,)
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            series_labels = _format_labels(names=self.label_names, values=labels)
+            lines.append(
+                f"{self.name}_sum{series_labels} {_format_value(value=series.sum)}"
+            )
+            lines.append(f"{self.name}_count{series_labels} {series.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds metrics and scrape-time collectors, and renders them in the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self.metrics: List = []
+        self.collectors: List[Callable[[], Iterable]] = []
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        return self._register(
+            metric=Counter(
+                name=name, documentation=documentation, label_names=label_names
+            )
+        )
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        return self._register(
+            metric=Gauge(
+                name=name, documentation=documentation, label_names=label_names
+            )
+        )
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        return self._register(
+            metric=Histogram(
+                name=name,
+                documentation=documentation,
+                label_names=label_names,
+                buckets=buckets,
+            )
+        )
+
+    def register_collector(self, collector: Callable[[], Iterable]) -> None:
+        """Add a callable returning metrics that are computed when scraped"""
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    label_names=("method", "route"),
+)
+http_responses = registry.counter(
+    "http_responses_total",
+    "HTTP responses by route template and status code",
+    label_names=("method", "route", "status"),
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled"
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds",
+    "Database statement latency by statement fingerprint",
+    label_names=("statement",),
+    buckets=DB_LATENCY_BUCKETS,
+)
+db_queries_in_flight = registry.gauge(
+    "db_queries_in_flight", "Database statements currently executing"
+)
+auth_verification_duration = registry.histogram(
+    "auth_verification_duration_seconds",
+    "Access token verification latency by outcome",
+    label_names=("result",),
+    buckets=DB_LATENCY_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request latency, response counts and
+    in-flight requests.
+
+    Requests are labeled by the matched route's path template (e.g.
+    ``/api/tracks/{track_id}``), which the router leaves in the scope, so the
+    label set stays bounded whatever URLs clients send.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            http_request_duration.observe(
+                value=time.perf_counter() - start, labels=(method, route_path)
+            )
+            http_responses.inc(labels=(method, route_path, str(status_code)))
+
+
+_SELECT_LIST = re.compile(r"^SELECT (?:DISTINCT )?.+? FROM ")
+# asyncpg's typed placeholders, e.g. $1::VARCHAR or $2::TIMESTAMP WITHOUT TIME ZONE
+_PLACEHOLDER_CAST = re.compile(
+    r"(\$\d+)::(?:TIMESTAMP WITH(?:OUT)? TIME ZONE|\w+)"
+    r"(?:\(\d+(?:, ?\d+)?\))?(?:\[\])*"
+)
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|\?|(?<![:\w]):\w+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+# Rows of a multi-row VALUES (insertmanyvalues batches), one level of nesting
+_VALUES_ROW = r"\((?:[^()]|\([^()]*\))*\)"
+_VALUES_ROWS = re.compile(rf"VALUES ({_VALUES_ROW})(?:, ?{_VALUES_ROW})+")
+_WHITESPACE = re.compile(r"\s+")
+
+_fingerprints: Dict[str, str] = {}
+_fingerprint_labels: Set[str] = set()
+
+
+def statement_fingerprint(statement: str) -> str:
+    """
+    Normalize a SQL statement into a label: whitespace collapsed, bind
+    placeholders (and their type casts) replaced by ``?``, expanded IN lists
+    folded into ``(...)``, multi-row VALUES folded into their first row and
+    the outer select list elided. Long statements are cut short with a hash of
+    the full text, so distinct statements never share a label.
+    Distinct labels are capped so ad-hoc SQL can't grow the label set without
+    bound; fingerprints are memoized per statement text, up to a multiple of
+    that cap.
+    """
+    fingerprint = _fingerprints.get(statement)
+    if fingerprint is not None:
+        return fingerprint
+
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _PLACEHOLDER_CAST.sub(r"\1", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _VALUES_ROWS.sub(r"VALUES \1", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(...)", normalized)
+    normalized = _SELECT_LIST.sub("SELECT ... FROM ", normalized)
+    fingerprint = normalized
+    if len(normalized) > STATEMENT_LABEL_LENGTH:
+        digest = hashlib.sha1(normalized.encode()).hexdigest()[:8]
+        fingerprint = f"{normalized[:STATEMENT_LABEL_LENGTH]}... #{digest}"
+    if fingerprint not in _fingerprint_labels:
+        if len(_fingerprint_labels) >= MAX_STATEMENT_FINGERPRINTS:
+            fingerprint = OTHER_STATEMENT
+        else:
+            _fingerprint_labels.add(fingerprint)
+    if len(_fingerprints) < MAX_STATEMENT_FINGERPRINTS * 10:
+        _fingerprints[statement] = fingerprint
+    return fingerprint
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_start = time.perf_counter()
+    db_queries_in_flight.inc()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    db_queries_in_flight.dec()
+    db_query_duration.observe(
+        value=time.perf_counter() - context._metrics_start,
+        labels=(statement_fingerprint(statement=statement),),
+    )
+    context._metrics_start = None
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute doesn't fire for failed statements
+    context = exception_context.execution_context
+    if getattr(context, "_metrics_start", None) is not None:
+        context._metrics_start = None
+        db_queries_in_flight.dec()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement executed through ``engine`` (a sync Engine)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
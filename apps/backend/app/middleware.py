@@ -1,97 +1,103 @@
 import logging
+import os
+import random
 import time
 import uuid
-from typing import Callable
+from typing import Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Get the project logger
 logger = logging.getLogger("project_vista")
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all HTTP requests and responses"""
+class LoggingMiddleware:
+    """
+    Pure ASGI middleware to log all HTTP requests and responses.
 
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
+    Unlike BaseHTTPMiddleware it doesn't spawn a task or memory stream per
+    request; it only wraps ``send`` to capture the status code and add the
+    X-Request-ID header. "Request started" logs can be sampled via
+    LOG_REQUEST_START_SAMPLE_RATE (0.0 - 1.0).
+    """
+
+    def __init__(self, app: ASGIApp, start_log_sample_rate: Optional[float] = None):
+        self.app = app
+        if start_log_sample_rate is None:
+            start_log_sample_rate = float(
+                os.getenv("LOG_REQUEST_START_SAMPLE_RATE", "1.0")
+            )
+        self.start_log_sample_rate = start_log_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
         # Generate request ID for tracing
-        request_id = str(uuid.uuid4())[:8]
+        request_id = uuid.uuid4().hex[:8]
 
         # Start timing
-        start_time = time.time()
-
-        # Get request details
-        method = request.method
-        url = str(request.url)
-        client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
-
-        # Log incoming request
-        logger.info(
-            "Request started",
-            extra={
-                "request_id": request_id,
-                "method": method,
-                "url": url,
-                "client_ip": client_ip,
-                "user_agent": user_agent,
-            },
-        )
+        start_ns = time.perf_counter_ns()
 
         # Add request ID to request state for potential use in routes
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        # Shared by every log record of this request
+        client = scope.get("client")
+        extra = {
+            "request_id": request_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "client_ip": client[0] if client else "unknown",
+        }
 
-        try:
-            # Process request
-            response = await call_next(request)
-
-            # Calculate processing time
-            process_time = time.time() - start_time
-
-            # Log successful response
-            logger.info(
-                "Request completed",
-                extra={
-                    "request_id": request_id,
-                    "method": method,
-                    "url": url,
-                    "status_code": response.status_code,
-                    "process_time": round(process_time, 4),
-                    "client_ip": client_ip,
-                },
-            )
+        if self._should_log_start():
+            extra["user_agent"] = _get_header(scope=scope, name=b"user-agent")
+            logger.info("Request started", extra=extra)
 
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
+        status_code = 500
 
-            return response
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_with_request_id)
         except Exception as e:
-            # Calculate processing time for error case
-            process_time = time.time() - start_time
-
-            # Log error
-            logger.error(
-                f"Request failed: {str(e)}",
-                extra={
-                    "request_id": request_id,
-                    "method": method,
-                    "url": url,
-                    "error": str(e),
-                    "error_type": type(e).__name__,
-                    "process_time": round(process_time, 4),
-                    "client_ip": client_ip,
-                },
-                exc_info=True,
-            )
-
-            # Re-raise the exception
+            extra["error"] = str(e)
+            extra["error_type"] = type(e).__name__
+            extra["process_time"] = _elapsed_seconds(start_ns=start_ns)
+            logger.error(f"Request failed: {str(e)}", extra=extra, exc_info=True)
             raise
 
+        extra["status_code"] = status_code
+        extra["process_time"] = _elapsed_seconds(start_ns=start_ns)
+        logger.info("Request completed", extra=extra)
+
+    def _should_log_start(self) -> bool:
+        if not logger.isEnabledFor(logging.INFO) or self.start_log_sample_rate <= 0:
+            return False
+        return (
+            self.start_log_sample_rate >= 1
+            or random.random() < self.start_log_sample_rate
+        )
+
+
+def _get_header(scope: Scope, name: bytes) -> str:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return "unknown"
+
+
+def _elapsed_seconds(start_ns: int) -> float:
+    return round((time.perf_counter_ns() - start_ns) / 1e9, 4)
+
 
 class DatabaseLoggingMixin:
     """Mixin to add database operation logging to repositories/services"""
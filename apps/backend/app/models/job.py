@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import JSON, BigInteger, Column, Index, Integer, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+
+class Job(SQLModel, table=True):
+    """
+    Deferred work for the task runner (see app/tasks.py). Pending jobs are
+    claimed with FOR UPDATE SKIP LOCKED and leased to one process until
+    ``locked_until``; finished jobs are deleted and jobs out of attempts stay
+    as ``failed``.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # The runners' work queue: only jobs waiting to run
+        Index(
+            "ix_jobs_due",
+            "run_at",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+        # Leases of running jobs, to take back those of crashed processes
+        Index(
+            "ix_jobs_lease",
+            "locked_until",
+            postgresql_where=text("status = 'running'"),
+            sqlite_where=text("status = 'running'"),
+        ),
+    )
+
+    # INTEGER on SQLite, where only that is an auto-incrementing rowid alias
+    id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            BigInteger().with_variant(Integer, "sqlite"), primary_key=True
+        ),
+    )
+    kind: str
+    payload: Dict[str, Any] = Field(
+        default_factory=dict,
+        sa_column=Column(JSON().with_variant(JSONB, "postgresql"), nullable=False),
+    )
+    status: str = "pending"  # "pending", "running" or "failed"
+    # Claims so far, including one that is running
+    attempts: int = 0
+    max_attempts: int
+    run_at: datetime = Field(default_factory=datetime.utcnow)
+    locked_until: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
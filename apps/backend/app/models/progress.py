@@ -0,0 +1,77 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from apps.backend.app.models.track import WikipediaArticle
+from sqlalchemy import BigInteger, Column, Index, Integer
+from sqlmodel import Field, SQLModel
+
+# Most tracks GET /api/home returns
+MAX_HOME_TRACKS = 100
+
+
+class CompletionEvent(SQLModel, table=True):
+    """
+    Append-only log of articles a user marked complete. Only transitions are
+    logged: re-completing a completed article, or adding an article that is
+    already complete, isn't a reading event.
+    """
+
+    __tablename__ = "completion_events"
+    __table_args__ = (
+        Index("ix_completion_events_user_id_created_at", "user_id", "created_at"),
+    )
+
+    # INTEGER on SQLite, where only that is an auto-incrementing rowid alias
+    id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            BigInteger().with_variant(Integer, "sqlite"), primary_key=True
+        ),
+    )
+    user_id: str
+    track_id: str = Field(foreign_key="tracks.id", ondelete="CASCADE", index=True)
+    item_id: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ReadingStreak(SQLModel, table=True):
+    """
+    A user's run of consecutive (UTC) days with at least one completion,
+    advanced with each completion event so reading it is a key lookup
+    """
+
+    __tablename__ = "reading_streaks"
+
+    user_id: str = Field(primary_key=True)
+    # Length of the run ending on last_day
+    current_streak: int = 0
+    longest_streak: int = 0
+    last_day: date
+    # Completions on last_day
+    last_day_completions: int = 0
+
+
+class HomeTrack(SQLModel):
+    """An unfinished track and the next article to read in it"""
+
+    id: str
+    title: str
+    completed_count: int
+    article_count: int
+    last_activity_at: datetime
+    next_article: WikipediaArticle
+
+
+class HomeStreak(SQLModel):
+    # Days in a row, up to today, with a completion; still counts yesterday's
+    # run until today ends
+    current: int = 0
+    longest: int = 0
+    completed_today: int = 0
+    last_day: Optional[date] = None
+
+
+class HomeResponse(SQLModel):
+    # Unfinished tracks, most recently active first
+    queue: List[HomeTrack]
+    streak: HomeStreak
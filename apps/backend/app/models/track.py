@@ -1,12 +1,26 @@
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
 from pydantic import BaseModel
-from sqlmodel import JSON, Column, Field, SQLModel
+from pydantic import Field as PydanticField
+from sqlalchemy import Index, text
+from sqlmodel import Field, SQLModel
+
+# Gap left between consecutive item positions, so an item can be inserted or
+# moved between two neighbours by updating just its own row
+POSITION_GAP = 1024
+
+# Bounds of POST /api/tracks/suggest
+MAX_SUGGEST_TITLES = 20
+MAX_SUGGESTIONS = 50
+
+# Public tracks can be joined by other users and appear in the trending feed
+TrackVisibility = Literal["private", "public"]
 
 
 class WikipediaArticle(BaseModel):
+    id: Optional[str] = None  # track item id, set on responses
     title: str
     url: str
     description: Optional[str] = None
@@ -20,22 +34,90 @@ class TrackBase(SQLModel):
 
 class Track(TrackBase, table=True):
     __tablename__ = "tracks"
+    __table_args__ = (
+        # Serves the keyset-paginated track list (newest first)
+        Index("ix_tracks_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        # A public track can be joined once per user
+        Index(
+            "ix_tracks_source_track_id_user_id",
+            "source_track_id",
+            "user_id",
+            unique=True,
+        ),
+        # Serves the home queue: unfinished tracks, most recently active first
+        Index(
+            "ix_tracks_user_id_active",
+            "user_id",
+            "last_activity_at",
+            "id",
+            postgresql_where=text("completed_count < article_count"),
+            sqlite_where=text("completed_count < article_count"),
+        ),
+    )
 
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     user_id: str = Field(index=True)
-    articles: List[WikipediaArticle] = Field(sa_column=Column(JSON))
+    visibility: str = "private"
+    # The public track this one was joined (copied) from
+    source_track_id: Optional[str] = Field(
+        default=None, foreign_key="tracks.id", ondelete="SET NULL"
+    )
+    # Maintained on every item write, so progress needs no scan of the items
+    article_count: int = 0
+    completed_count: int = 0
+    # Creation, or the latest article completion
+    last_activity_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class TrackItem(SQLModel, table=True):
+    """One article of a track, ordered by position within the track"""
+
+    __tablename__ = "track_items"
+    __table_args__ = (
+        Index("ix_track_items_track_id_position", "track_id", "position"),
+        # Finds a track's next unread article without passing the read ones
+        Index(
+            "ix_track_items_unread",
+            "track_id",
+            "position",
+            postgresql_where=text("NOT completed"),
+            sqlite_where=text("NOT completed"),
+        ),
+    )
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    track_id: str = Field(foreign_key="tracks.id", ondelete="CASCADE")
+    position: int
+    title: str
+    url: str
+    description: Optional[str] = None
+    completed: bool = False
+    completed_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    def to_article(self) -> WikipediaArticle:
+        return WikipediaArticle(
+            id=self.id,
+            title=self.title,
+            url=self.url,
+            description=self.description,
+            completed=self.completed,
+        )
+
 
 class TrackCreate(TrackBase):
     articles: List[WikipediaArticle]
+    visibility: TrackVisibility = "private"
 
 
 class TrackUpdate(SQLModel):
     title: Optional[str] = None
     description: Optional[str] = None
     articles: Optional[List[WikipediaArticle]] = None
+    visibility: Optional[TrackVisibility] = None
 
 
 class TrackResponse(TrackBase):
@@ -44,3 +126,163 @@ class TrackResponse(TrackBase):
     articles: List[WikipediaArticle]
     created_at: datetime
     updated_at: datetime
+    visibility: str = "private"
+    source_track_id: Optional[str] = None
+
+
+class TrackItemCreate(SQLModel):
+    title: str
+    url: str
+    description: Optional[str] = None
+    completed: bool = False
+    # Index to insert the item at; appended to the end when omitted
+    index: Optional[int] = Field(default=None, ge=0)
+
+
+class TrackItemUpdate(SQLModel):
+    completed: Optional[bool] = None
+    # New index of the item within the track
+    index: Optional[int] = Field(default=None, ge=0)
+
+
+class TrackItemResponse(SQLModel):
+    id: str
+    track_id: str
+    title: str
+    url: str
+    description: Optional[str] = None
+    completed: bool
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+# Fields that can be requested from the track list via ?fields=
+TRACK_LIST_FIELDS = (
+    "id",
+    "user_id",
+    "title",
+    "description",
+    "articles",
+    "created_at",
+    "updated_at",
+    "visibility",
+)
+
+
+class TrackListItem(SQLModel):
+    """A track in the list response; only the requested fields are set"""
+
+    id: str
+    user_id: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    articles: Optional[List[WikipediaArticle]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    visibility: Optional[str] = None
+
+
+class TrackPage(SQLModel):
+    items: List[TrackListItem]
+    next_cursor: Optional[str] = None
+
+
+class TrackSearchResult(SQLModel):
+    id: str
+    title: str
+    description: Optional[str] = None
+    updated_at: datetime
+    score: float
+    # HTML-escaped excerpt with matches wrapped in <mark>
+    snippet: Optional[str] = None
+
+
+class TrackSearchPage(SQLModel):
+    items: List[TrackSearchResult]
+    next_cursor: Optional[str] = None
+    # Set when nothing matched as typed and these are results for a
+    # spelling-corrected query instead
+    corrected_query: Optional[str] = None
+
+
+class TrackSuggestRequest(SQLModel):
+    """Articles to build on, e.g. the track's title or the articles picked so far"""
+
+    titles: List[str] = Field(min_length=1, max_length=MAX_SUGGEST_TITLES)
+    limit: int = Field(default=10, ge=1, le=MAX_SUGGESTIONS)
+
+
+class ArticleSuggestion(SQLModel):
+    title: str
+    url: str
+    score: float
+    # Suggestions listed earlier that this article builds on
+    prerequisites: List[str] = []
+    # Articles the user has completed that this article builds on
+    completed_prerequisites: List[str] = []
+
+
+class TrackSuggestions(SQLModel):
+    items: List[ArticleSuggestion]
+    # Requested titles that aren't in the link graph
+    unknown_titles: List[str] = []
+
+
+class SetCompletedOperation(SQLModel):
+    """Mark the article at ``index`` (or with ``title``) complete/incomplete"""
+
+    op: Literal["set_completed"]
+    index: Optional[int] = Field(default=None, ge=0)
+    title: Optional[str] = None
+    completed: bool
+
+
+class InsertOperation(SQLModel):
+    """Insert an article at ``index`` (appended when omitted)"""
+
+    op: Literal["insert"]
+    index: Optional[int] = Field(default=None, ge=0)
+    article: WikipediaArticle
+
+
+class MoveOperation(SQLModel):
+    """Move the article at ``index`` (or with ``title``) to ``to_index``"""
+
+    op: Literal["move"]
+    index: Optional[int] = Field(default=None, ge=0)
+    title: Optional[str] = None
+    to_index: int = Field(ge=0)
+
+
+class RemoveOperation(SQLModel):
+    """Remove the article at ``index`` (or with ``title``)"""
+
+    op: Literal["remove"]
+    index: Optional[int] = Field(default=None, ge=0)
+    title: Optional[str] = None
+
+
+TrackOperation = Annotated[
+    Union[SetCompletedOperation, InsertOperation, MoveOperation, RemoveOperation],
+    PydanticField(discriminator="op"),
+]
+
+
+class TrackPatch(SQLModel):
+    """Partial update: optional field changes plus ordered article operations"""
+
+    title: Optional[str] = None
+    description: Optional[str] = None
+    visibility: Optional[TrackVisibility] = None
+    operations: List[TrackOperation] = []
+
+
+class BulkImportError(SQLModel):
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class BulkImportResponse(SQLModel):
+    created: List[str]
+    errors: List[BulkImportError]
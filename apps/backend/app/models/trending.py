@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import BigInteger, Column, Index, Integer, text
+from sqlmodel import Field, SQLModel
+
+
+class TrackActivity(SQLModel, table=True):
+    """
+    Append-only log of popularity signals for public tracks: joins, and
+    article completions on the public track or on copies joined from it.
+    The trending refresh folds unranked rows into trending_tracks.
+    """
+
+    __tablename__ = "track_activity"
+    __table_args__ = (
+        # The refresh's work queue: only rows not yet folded into the ranking
+        Index(
+            "ix_track_activity_unranked",
+            "id",
+            postgresql_where=text("NOT ranked"),
+            sqlite_where=text("NOT ranked"),
+        ),
+    )
+
+    # INTEGER on SQLite, where only that is an auto-incrementing rowid alias
+    id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            BigInteger().with_variant(Integer, "sqlite"), primary_key=True
+        ),
+    )
+    # The public track credited with the activity
+    track_id: str = Field(foreign_key="tracks.id", ondelete="CASCADE", index=True)
+    user_id: str
+    kind: str  # "join" or "complete"
+    weight: float
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    ranked: bool = False
+
+
+class TrendingTrack(SQLModel, table=True):
+    """
+    A public track's time-decayed popularity.
+
+    ``score`` is ln(sum(weight * 2^((t - epoch) / half-life))) over the
+    track's activity: decayed scores of different tracks compare the same at
+    any moment, so the ranking is an index order and new activity is added
+    without recomputing anything else.
+    """
+
+    __tablename__ = "trending_tracks"
+    __table_args__ = (Index("ix_trending_tracks_score_track_id", "score", "track_id"),)
+
+    track_id: str = Field(foreign_key="tracks.id", ondelete="CASCADE", primary_key=True)
+    score: float
+    last_activity_at: datetime = Field(index=True)
+
+
+class TrendingTrackItem(SQLModel):
+    id: str
+    user_id: str
+    title: str
+    description: Optional[str] = None
+    article_count: int
+    updated_at: datetime
+    last_activity_at: datetime
+
+
+class TrendingPage(SQLModel):
+    items: List[TrendingTrackItem]
+    next_cursor: Optional[str] = None
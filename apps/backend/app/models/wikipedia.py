@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class WikipediaPage(SQLModel, table=True):
+    """Cached Wikipedia metadata, keyed by the title that was looked up"""
+
+    __tablename__ = "wikipedia_pages"
+
+    title: str = Field(primary_key=True)
+    # None when Wikipedia has no page for the title (cached as a miss)
+    page_id: Optional[int] = None
+    canonical_title: Optional[str] = None
+    url: Optional[str] = None
+    description: Optional[str] = None
+    fetched_at: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+DEFAULT_SEARCH_PAGE_SIZE = 20
+
+
+def encode_cursor(updated_at: datetime, track_id: str) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor"""
+    payload = json.dumps([updated_at.isoformat(), track_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if invalid"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, track_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(updated_at), str(track_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_search_cursor(
+    score: float, track_id: str, corrected_query: Optional[str]
+) -> str:
+    """
+    Encode a position in ranked search results as an opaque cursor. The
+    corrected query, if the results are for one, is kept so later pages
+    search the same thing.
+    """
+    payload = json.dumps([score, track_id, corrected_query], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, str, Optional[str]]:
+    """Decode a cursor produced by encode_search_cursor, raising ValueError if invalid"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, track_id, corrected_query = json.loads(base64.urlsafe_b64decode(padded))
+        if corrected_query is not None and not isinstance(corrected_query, str):
+            raise ValueError("Invalid corrected query")
+        return float(score), str(track_id), corrected_query
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_score_cursor(score: float, track_id: str) -> str:
+    """Encode a position in a (score, id) ranking as an opaque cursor"""
+    payload = json.dumps([score, track_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_score_cursor(cursor: str) -> Tuple[float, str]:
+    """Decode a cursor produced by encode_score_cursor, raising ValueError if invalid"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, track_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), str(track_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
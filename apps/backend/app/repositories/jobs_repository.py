@@ -0,0 +1,123 @@
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from apps.backend.app.middleware import DatabaseLoggingMixin
+from apps.backend.app.models.job import Job
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+
+class JobsRepository(DatabaseLoggingMixin):
+    """Repository for the task runner's job table. Nothing here commits."""
+
+    def __init__(self):
+        super().__init__()
+
+    async def add(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        run_at: datetime,
+        max_attempts: int,
+        session: AsyncSession,
+    ) -> None:
+        self.log_db_operation("INSERT", "jobs", kind=kind)
+        now = datetime.utcnow()
+        await session.execute(
+            insert(Job).values(
+                kind=kind,
+                payload=payload,
+                status="pending",
+                attempts=0,
+                max_attempts=max_attempts,
+                run_at=run_at,
+                created_at=now,
+            )
+        )
+
+    async def claim(
+        self, limit: int, locked_until: datetime, session: AsyncSession
+    ) -> List[Job]:
+        """
+        Lease up to ``limit`` due jobs, longest due first. Jobs locked by a
+        concurrent claim are skipped, so runners in several processes split
+        the queue instead of waiting on each other.
+        """
+        due = (
+            select(Job.id)
+            .where(Job.status == "pending", Job.run_at <= datetime.utcnow())
+            .order_by(Job.run_at, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.execute(
+            update(Job)
+            .where(Job.id.in_(due))
+            .values(
+                status="running", attempts=Job.attempts + 1, locked_until=locked_until
+            )
+            .returning(Job)
+        )
+        jobs = result.scalars().all()
+        if jobs:
+            self.log_db_operation("CLAIM", "jobs", count=len(jobs))
+        return sorted(jobs, key=lambda job: (job.run_at, job.id))
+
+    async def complete(self, job_id: int, session: AsyncSession) -> None:
+        await session.execute(delete(Job).where(Job.id == job_id))
+
+    async def retry(
+        self, job_id: int, run_at: datetime, error: str, session: AsyncSession
+    ) -> None:
+        """Put a failed job back in the queue, due at ``run_at``"""
+        await session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(
+                status="pending", run_at=run_at, locked_until=None, last_error=error
+            )
+        )
+
+    async def fail(self, job_id: int, error: str, session: AsyncSession) -> None:
+        """Park a job that is out of attempts"""
+        self.log_db_operation("FAIL", "jobs", record_id=job_id)
+        await session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(status="failed", locked_until=None, last_error=error)
+        )
+
+    async def release(self, job_ids: Sequence[int], session: AsyncSession) -> None:
+        """Return claimed jobs that never started, without using up an attempt"""
+        self.log_db_operation("RELEASE", "jobs", count=len(job_ids))
+        await session.execute(
+            update(Job)
+            .where(Job.id.in_(list(job_ids)), Job.status == "running")
+            .values(status="pending", attempts=Job.attempts - 1, locked_until=None)
+        )
+
+    async def requeue_expired(self, session: AsyncSession) -> int:
+        """
+        Return jobs whose lease ran out (their process died or stalled) to the
+        queue; the lost run counts as an attempt
+        """
+        result = await session.execute(
+            update(Job)
+            .where(Job.status == "running", Job.locked_until < datetime.utcnow())
+            .values(status="pending", locked_until=None, last_error="Lease expired")
+            .returning(Job.id)
+        )
+        requeued = len(result.all())
+        if requeued:
+            self.log_db_operation("REQUEUE", "jobs", count=requeued)
+        return requeued
+
+    @staticmethod
+    async def count_due(session: AsyncSession) -> int:
+        result = await session.execute(
+            select(func.count())
+            .select_from(Job)
+            .where(Job.status == "pending", Job.run_at <= datetime.utcnow())
+        )
+        return result.scalar_one()
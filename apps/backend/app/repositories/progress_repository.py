@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+from typing import Any, List, Mapping
+
+from apps.backend.app.database import read_only
+from apps.backend.app.middleware import DatabaseLoggingMixin
+from apps.backend.app.models.progress import CompletionEvent, ReadingStreak
+from apps.backend.app.models.track import Track, TrackItem
+from sqlalchemy import case, insert, literal, not_, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+
+class ProgressRepository(DatabaseLoggingMixin):
+    """Repository for completion events, reading streaks and the home queue"""
+
+    def __init__(self):
+        super().__init__()
+
+    async def record_completion(
+        self,
+        user_id: str,
+        track_id: str,
+        item_id: str,
+        completed_at: datetime,
+        session: AsyncSession,
+    ) -> None:
+        """
+        Log a completion and advance the user's streak in the same
+        transaction, with an upsert rather than a read. Doesn't commit.
+        """
+        self.log_db_operation(
+            "INSERT", "completion_events", user_id=user_id, track_id=track_id
+        )
+        await session.execute(
+            insert(CompletionEvent).values(
+                user_id=user_id,
+                track_id=track_id,
+                item_id=item_id,
+                created_at=completed_at,
+            )
+        )
+
+        today = completed_at.date()
+        insert_ = (
+            postgresql.insert
+            if session.bind.dialect.name == "postgresql"
+            else sqlite.insert
+        )
+        statement = insert_(ReadingStreak).values(
+            user_id=user_id,
+            current_streak=1,
+            longest_streak=1,
+            last_day=today,
+            last_day_completions=1,
+        )
+        current = case(
+            (ReadingStreak.last_day == today, ReadingStreak.current_streak),
+            (
+                ReadingStreak.last_day == today - timedelta(days=1),
+                ReadingStreak.current_streak + 1,
+            ),
+            else_=1,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[ReadingStreak.user_id],
+            set_={
+                "current_streak": current,
+                "longest_streak": case(
+                    (current > ReadingStreak.longest_streak, current),
+                    else_=ReadingStreak.longest_streak,
+                ),
+                "last_day": today,
+                "last_day_completions": case(
+                    (
+                        ReadingStreak.last_day == today,
+                        ReadingStreak.last_day_completions + 1,
+                    ),
+                    else_=1,
+                ),
+            },
+        )
+        await session.execute(statement)
+
+    @read_only
+    async def find_home(
+        self, user_id: str, limit: int, session: AsyncSession
+    ) -> List[Mapping[str, Any]]:
+        """
+        The user's streak and up to ``limit`` unfinished tracks, most recently
+        active first, each with its next unread article, in one statement.
+
+        Unfinished tracks come from a partial index range scan and each next
+        article from one probe of the unread-items partial index, so the cost
+        grows with the tracks returned, not with the user's tracks or items.
+        Every row carries the streak columns; with no unfinished tracks there
+        is a single row whose track columns are NULL.
+        """
+        try:
+            self.log_db_operation("SELECT_HOME", "tracks", user_id=user_id)
+            base = select(literal(user_id).label("user_id")).subquery("base")
+            active = (
+                select(
+                    Track.id,
+                    Track.title,
+                    Track.article_count,
+                    Track.completed_count,
+                    Track.last_activity_at,
+                )
+                .where(
+                    Track.user_id == user_id,
+                    Track.completed_count < Track.article_count,
+                )
+                .order_by(Track.last_activity_at.desc(), Track.id.desc())
+                .limit(limit)
+                .subquery("active")
+            )
+            next_item_id = (
+                select(TrackItem.id)
+                .where(TrackItem.track_id == active.c.id, not_(TrackItem.completed))
+                .order_by(TrackItem.position)
+                .limit(1)
+                .correlate(active)
+                .scalar_subquery()
+            )
+            statement = (
+                select(
+                    ReadingStreak.current_streak,
+                    ReadingStreak.longest_streak,
+                    ReadingStreak.last_day,
+                    ReadingStreak.last_day_completions,
+                    active.c.id,
+                    active.c.title,
+                    active.c.article_count,
+                    active.c.completed_count,
+                    active.c.last_activity_at,
+                    TrackItem.id.label("item_id"),
+                    TrackItem.title.label("item_title"),
+                    TrackItem.url.label("item_url"),
+                    TrackItem.description.label("item_description"),
+                )
+                .select_from(base)
+                .outerjoin(ReadingStreak, ReadingStreak.user_id == base.c.user_id)
+                .outerjoin(active, true())
+                .outerjoin(TrackItem, TrackItem.id == next_item_id)
+                .order_by(active.c.last_activity_at.desc(), active.c.id.desc())
+            )
+            result = await session.execute(statement)
+            return result.mappings().all()
+        except Exception as e:
+            self.log_db_error("SELECT_HOME", "tracks", e, user_id=user_id)
+            raise
@@ -0,0 +1,354 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from apps.backend.app.database import read_only
+from apps.backend.app.middleware import DatabaseLoggingMixin
+from apps.backend.app.models.track import (
+    POSITION_GAP,
+    Track,
+    TrackItem,
+    WikipediaArticle,
+)
+from apps.backend.app.serialization import article_to_dict
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+
+class TrackItemsRepository(DatabaseLoggingMixin):
+    """
+    Repository for TrackItem database operations.
+
+    Methods here don't commit; the service commits once per operation so the
+    item change and the parent track's updated_at bump land together. Item
+    arguments accept either an id or a ``target_item_id`` subquery.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+    async def find_by_track_ids(
+        self, track_ids: Sequence[str], session: AsyncSession
+    ) -> Dict[str, List[TrackItem]]:
+        """Load the items of several tracks in one query, grouped by track"""
+        items_by_track: Dict[str, List[TrackItem]] = defaultdict(list)
+        if not track_ids:
+            return items_by_track
+
+        statement = (
+            select(TrackItem)
+            .where(TrackItem.track_id.in_(track_ids))
+            .order_by(TrackItem.track_id, TrackItem.position)
+        )
+        result = await session.execute(statement)
+        for item in result.scalars():
+            items_by_track[item.track_id].append(item)
+        return items_by_track
+
+    async def find_articles_by_track_ids(
+        self, track_ids: Sequence[str], session: AsyncSession
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Like find_by_track_ids, but selects plain columns and returns
+        article-shaped dicts for the trusted serialization path.
+        """
+        articles_by_track: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        if not track_ids:
+            return articles_by_track
+
+        statement = (
+            select(
+                TrackItem.track_id,
+                TrackItem.id,
+                TrackItem.title,
+                TrackItem.url,
+                TrackItem.description,
+                TrackItem.completed,
+            )
+            .where(TrackItem.track_id.in_(track_ids))
+            .order_by(TrackItem.track_id, TrackItem.position)
+        )
+        result = await session.execute(statement)
+        for row in result.mappings():
+            articles_by_track[row["track_id"]].append(article_to_dict(row=row))
+        return articles_by_track
+
+    @staticmethod
+    def build_items(
+        track_id: str, articles: Sequence[WikipediaArticle]
+    ) -> List[TrackItem]:
+        """Create item rows for a new article list, spaced POSITION_GAP apart"""
+        now = datetime.utcnow()
+        return [
+            TrackItem(
+                track_id=track_id,
+                position=(index + 1) * POSITION_GAP,
+                title=article.title,
+                url=article.url,
+                description=article.description,
+                completed=article.completed,
+                completed_at=now if article.completed else None,
+            )
+            for index, article in enumerate(articles)
+        ]
+
+    @read_only
+    async def find_completed_titles(
+        self, user_id: str, session: AsyncSession
+    ) -> List[str]:
+        """Titles of the articles the user has completed in any of their tracks"""
+        statement = (
+            select(TrackItem.title)
+            .join(Track, Track.id == TrackItem.track_id)
+            .where(Track.user_id == user_id, TrackItem.completed)
+            .distinct()
+        )
+        result = await session.execute(statement)
+        return result.scalars().all()
+
+    async def replace_all(
+        self,
+        track_id: str,
+        articles: Sequence[WikipediaArticle],
+        session: AsyncSession,
+    ) -> List[TrackItem]:
+        """Replace every item of a track (whole-list updates)"""
+        self.log_db_operation("REPLACE", "track_items", record_id=track_id)
+        await session.execute(delete(TrackItem).where(TrackItem.track_id == track_id))
+        items = self.build_items(track_id=track_id, articles=articles)
+        session.add_all(items)
+        return items
+
+    async def add_item(
+        self,
+        track_id: str,
+        values: Dict[str, Any],
+        index: Optional[int],
+        session: AsyncSession,
+    ) -> TrackItem:
+        """Insert a single item at an index, or at the end of the track"""
+        self.log_db_operation("INSERT", "track_items", record_id=track_id)
+        if index is None:
+            # Computed in the INSERT itself, no read round-trip
+            position = (
+                select(func.coalesce(func.max(TrackItem.position), 0) + POSITION_GAP)
+                .where(TrackItem.track_id == track_id)
+                .scalar_subquery()
+            )
+        else:
+            position = await self._position_for_index(
+                track_id=track_id, index=index, session=session
+            )
+
+        now = datetime.utcnow()
+        statement = (
+            insert(TrackItem)
+            .values(
+                id=str(uuid.uuid4()),
+                track_id=track_id,
+                position=position,
+                created_at=now,
+                updated_at=now,
+                **values,
+            )
+            .returning(TrackItem)
+        )
+        result = await session.execute(statement)
+        return result.scalar_one()
+
+    async def update_item(
+        self,
+        track_id: str,
+        item_id: Any,
+        values: Dict[str, Any],
+        session: AsyncSession,
+        conditions: Sequence[Any] = (),
+    ) -> Optional[TrackItem]:
+        """
+        Update a single item row, returning None if it doesn't exist (or
+        doesn't meet the extra ``conditions``)
+        """
+        self.log_db_operation("UPDATE", "track_items", track_id=track_id)
+        statement = (
+            update(TrackItem)
+            .where(TrackItem.id == item_id, TrackItem.track_id == track_id, *conditions)
+            .values(updated_at=datetime.utcnow(), **values)
+            .returning(TrackItem)
+        )
+        result = await session.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def set_completed(
+        self, track_id: str, item_id: Any, completed: bool, session: AsyncSession
+    ) -> Tuple[Optional[TrackItem], bool]:
+        """
+        Mark an item complete/incomplete. Returns the item (None if it doesn't
+        exist) and whether its state changed, which the progress counters and
+        completion events need; an item already in that state keeps its
+        completed_at.
+        """
+        item = await self.update_item(
+            track_id=track_id,
+            item_id=item_id,
+            values={
+                "completed": completed,
+                "completed_at": datetime.utcnow() if completed else None,
+            },
+            session=session,
+            conditions=[TrackItem.completed.is_not(completed)],
+        )
+        if item is not None:
+            return item, True
+        item = await self.update_item(
+            track_id=track_id, item_id=item_id, values={}, session=session
+        )
+        return item, False
+
+    async def update_metadata(
+        self, values: Sequence[Dict[str, Any]], session: AsyncSession
+    ) -> None:
+        """
+        Set the URL and description of several items in one executemany;
+        ``values`` are dicts of id, url and description
+        """
+        self.log_db_operation("UPDATE", "track_items", count=len(values))
+        now = datetime.utcnow()
+        await session.execute(
+            update(TrackItem), [{**row, "updated_at": now} for row in values]
+        )
+
+    async def move_item(
+        self, track_id: str, item_id: Any, index: int, session: AsyncSession
+    ) -> Optional[TrackItem]:
+        """Move an item to a new index by rewriting only its position"""
+        position = await self._position_for_index(
+            track_id=track_id, index=index, session=session, exclude_item_id=item_id
+        )
+        return await self.update_item(
+            track_id=track_id,
+            item_id=item_id,
+            values={"position": position},
+            session=session,
+        )
+
+    async def delete_item(
+        self, track_id: str, item_id: Any, session: AsyncSession
+    ) -> Optional[bool]:
+        """
+        Delete a single item, returning whether it was completed, or None if
+        it doesn't exist
+        """
+        self.log_db_operation("DELETE", "track_items", track_id=track_id)
+        statement = (
+            delete(TrackItem)
+            .where(TrackItem.id == item_id, TrackItem.track_id == track_id)
+            .returning(TrackItem.completed)
+        )
+        result = await session.execute(statement)
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def target_item_id(
+        track_id: str, index: Optional[int] = None, title: Optional[str] = None
+    ):
+        """
+        Scalar subquery selecting the id of the item at ``index`` (or the first
+        item with ``title``), so a write can target it in a single statement.
+        """
+        statement = select(TrackItem.id).where(TrackItem.track_id == track_id)
+        if index is not None:
+            statement = statement.order_by(TrackItem.position).offset(index)
+        else:
+            statement = statement.where(TrackItem.title == title).order_by(
+                TrackItem.position
+            )
+        return statement.limit(1).scalar_subquery()
+
+    async def _position_for_index(
+        self,
+        track_id: str,
+        index: int,
+        session: AsyncSession,
+        exclude_item_id: Any = None,
+    ) -> int:
+        """Find a free position that places an item at ``index``"""
+        neighbours = await self._neighbour_positions(
+            track_id=track_id,
+            index=index,
+            session=session,
+            exclude_item_id=exclude_item_id,
+        )
+        if neighbours is None:
+            # No gap left between the neighbours: spread the track out again
+            await self._renumber(track_id=track_id, session=session)
+            neighbours = await self._neighbour_positions(
+                track_id=track_id,
+                index=index,
+                session=session,
+                exclude_item_id=exclude_item_id,
+            )
+
+        before, after = neighbours
+        if before is None and after is None:
+            return POSITION_GAP
+        if after is None:
+            return before + POSITION_GAP
+        if before is None:
+            return after - POSITION_GAP
+        return (before + after) // 2
+
+    @staticmethod
+    async def _neighbour_positions(
+        track_id: str,
+        index: int,
+        session: AsyncSession,
+        exclude_item_id: Any,
+    ):
+        """Positions of the items around ``index``, or None if they are adjacent"""
+        filters = [TrackItem.track_id == track_id]
+        if exclude_item_id is not None:
+            filters.append(TrackItem.id != exclude_item_id)
+        statement = (
+            select(TrackItem.position).where(*filters).order_by(TrackItem.position)
+        )
+
+        if index == 0:
+            result = await session.execute(statement.limit(1))
+            first = result.scalar_one_or_none()
+            return None, first
+
+        result = await session.execute(statement.offset(index - 1).limit(2))
+        positions = result.scalars().all()
+        if not positions:
+            # Index past the end: append after the current last item
+            result = await session.execute(
+                select(func.max(TrackItem.position)).where(*filters)
+            )
+            return result.scalar_one_or_none(), None
+        if len(positions) == 1:
+            return positions[0], None
+        before, after = positions
+        if after - before <= 1:
+            return None
+        return before, after
+
+    async def _renumber(self, track_id: str, session: AsyncSession) -> None:
+        """Reset a track's positions to multiples of POSITION_GAP"""
+        self.log_db_operation("RENUMBER", "track_items", record_id=track_id)
+        ranked = (
+            select(
+                TrackItem.id,
+                (
+                    func.row_number().over(order_by=TrackItem.position) * POSITION_GAP
+                ).label("new_position"),
+            )
+            .where(TrackItem.track_id == track_id)
+            .subquery()
+        )
+        await session.execute(
+            update(TrackItem)
+            .where(TrackItem.id == ranked.c.id)
+            .values(position=ranked.c.new_position)
+        )
@@ -0,0 +1,227 @@
+import os
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from apps.backend.app.database import read_only
+from apps.backend.app.middleware import DatabaseLoggingMixin
+from apps.backend.app.models.track import Track, TrackItem
+from sqlalchemy import Double, Text, column, exists, func, literal, or_, table, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+SEARCH_CONFIG = "english"
+# Minimum pg_trgm similarity for a vocabulary word to replace a query word
+SEARCH_FUZZY_THRESHOLD = float(os.getenv("SEARCH_FUZZY_THRESHOLD", "0.4"))
+# Query words considered for spelling correction, as in search_words_add()
+CORRECTABLE_WORD = re.compile(r"[^\W\d_]+")
+MAX_CORRECTED_WORDS = 10
+# Snippet matches are delimited with control characters, which can't clash
+# with user text, and turned into markup once the snippet is escaped
+HIGHLIGHT_START = "\x01"
+HIGHLIGHT_STOP = "\x02"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+    'MaxFragments=2, MaxWords=15, MinWords=5, FragmentDelimiter=" … "'
+)
+
+# Maintained by triggers (migration 0004_track_search), not mapped in models
+search_text = column("search_text", Text)
+search_vector = column("search_vector", TSVECTOR)
+search_words = table("search_words", column("user_id", Text), column("word", Text))
+
+
+class TrackSearchRepository(DatabaseLoggingMixin):
+    """Ranked search over a user's tracks and their articles"""
+
+    def __init__(self):
+        super().__init__()
+
+    @read_only
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        limit: int,
+        session: AsyncSession,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[Mapping[str, Any]]:
+        """
+        One page of matching tracks, best first. Returns up to ``limit + 1``
+        rows (id, title, description, updated_at, score, snippet); the extra
+        row tells the caller there is a next page.
+        """
+        try:
+            self.log_db_operation("SEARCH", "tracks", user_id=user_id, limit=limit)
+            if session.bind.dialect.name == "postgresql":
+                return await self._search_postgres(
+                    user_id=user_id,
+                    query=query,
+                    limit=limit,
+                    after=after,
+                    session=session,
+                )
+            return await self._search_fallback(
+                user_id=user_id, query=query, limit=limit, after=after, session=session
+            )
+        except Exception as e:
+            self.log_db_error("SEARCH", "tracks", e, user_id=user_id)
+            raise
+
+    @read_only
+    async def correct_query(
+        self, user_id: str, query: str, session: AsyncSession
+    ) -> Optional[str]:
+        """
+        ``query`` with misspelled words replaced by the most similar words in
+        the user's search vocabulary, or None if nothing was corrected
+        """
+        if session.bind.dialect.name != "postgresql":
+            return None
+
+        words = sorted(
+            {
+                word.lower()
+                for word in CORRECTABLE_WORD.findall(query)
+                if 3 <= len(word) <= 40
+            }
+        )[:MAX_CORRECTED_WORDS]
+        if not words:
+            return None
+
+        try:
+            self.log_db_operation(
+                "SELECT", "search_words", user_id=user_id, words=len(words)
+            )
+            query_words = (
+                func.unnest(literal(words, ARRAY(Text)))
+                .table_valued("word")
+                .render_derived(name="query_words")
+            )
+            similarity = func.similarity(search_words.c.word, query_words.c.word)
+            statement = (
+                select(query_words.c.word, search_words.c.word, similarity)
+                .select_from(query_words)
+                .join(
+                    search_words,
+                    # % narrows candidates through the trigram index
+                    (search_words.c.user_id == user_id)
+                    & search_words.c.word.op("%")(query_words.c.word),
+                )
+                .where(similarity >= SEARCH_FUZZY_THRESHOLD)
+            )
+            result = await session.execute(statement)
+        except Exception as e:
+            self.log_db_error("SELECT", "search_words", e)
+            raise
+
+        best: Dict[str, str] = {}
+        # Highest similarity wins, ties go to the alphabetically first word
+        for word, candidate, _ in sorted(
+            result.all(), key=lambda row: (-row[2], row[1])
+        ):
+            best.setdefault(word, candidate)
+        corrections = {
+            word: candidate for word, candidate in best.items() if candidate != word
+        }
+        if not corrections:
+            return None
+        return CORRECTABLE_WORD.sub(
+            lambda match: corrections.get(match.group().lower(), match.group()),
+            query,
+        )
+
+    @staticmethod
+    async def _search_postgres(
+        user_id: str,
+        query: str,
+        limit: int,
+        after: Optional[Tuple[float, str]],
+        session: AsyncSession,
+    ) -> List[Mapping[str, Any]]:
+        # Served by the (user_id, search_vector) GIN index, so the work grows
+        # with the user's matches rather than their (or everyone's) tracks
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        # Normalization 32 scales the rank into [0, 1)
+        score = func.ts_rank_cd(search_vector, tsquery, 32).cast(Double)
+        matches = (
+            select(
+                Track.id,
+                Track.title,
+                Track.description,
+                Track.updated_at,
+                search_text.label("search_text"),
+                score.label("score"),
+            )
+            .where(Track.user_id == user_id, search_vector.op("@@")(tsquery))
+            .subquery()
+        )
+
+        page = select(matches)
+        if after is not None:
+            page = page.where(tuple_(matches.c.score, matches.c.id) < after)
+        page = (
+            page.order_by(matches.c.score.desc(), matches.c.id.desc())
+            .limit(limit + 1)
+            .subquery()
+        )
+
+        # Snippets are only built for the rows on the page
+        statement = select(
+            page.c.id,
+            page.c.title,
+            page.c.description,
+            page.c.updated_at,
+            page.c.score,
+            func.ts_headline(
+                SEARCH_CONFIG, page.c.search_text, tsquery, HEADLINE_OPTIONS
+            ).label("snippet"),
+        ).order_by(page.c.score.desc(), page.c.id.desc())
+        result = await session.execute(statement)
+        return result.mappings().all()
+
+    @staticmethod
+    async def _search_fallback(
+        user_id: str,
+        query: str,
+        limit: int,
+        after: Optional[Tuple[float, str]],
+        session: AsyncSession,
+    ) -> List[Mapping[str, Any]]:
+        # Substring matching for databases without full-text search (SQLite
+        # in local development): title matches rank above other matches
+        pattern = f"%{query}%"
+        article_matches = exists().where(
+            TrackItem.track_id == Track.id,
+            or_(TrackItem.title.ilike(pattern), TrackItem.description.ilike(pattern)),
+        )
+        score = (
+            func.coalesce(Track.title.ilike(pattern), False).cast(Double) + 0.5
+        ).label("score")
+        matches = (
+            select(
+                Track.id,
+                Track.title,
+                Track.description,
+                Track.updated_at,
+                score,
+                literal(None).label("snippet"),
+            )
+            .where(
+                Track.user_id == user_id,
+                or_(
+                    Track.title.ilike(pattern),
+                    Track.description.ilike(pattern),
+                    article_matches,
+                ),
+            )
+            .subquery()
+        )
+        statement = select(matches)
+        if after is not None:
+            statement = statement.where(tuple_(matches.c.score, matches.c.id) < after)
+        statement = statement.order_by(
+            matches.c.score.desc(), matches.c.id.desc()
+        ).limit(limit + 1)
+        result = await session.execute(statement)
+        return result.mappings().all()
@@ -1,7 +1,10 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
 
+from apps.backend.app.database import read_only
 from apps.backend.app.middleware import DatabaseLoggingMixin
-from apps.backend.app.models.track import Track
+from apps.backend.app.models.track import Track, TrackItem
+from sqlalchemy import delete, func, insert, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -12,21 +15,131 @@ class TracksRepository(DatabaseLoggingMixin):
     def __init__(self):
         super().__init__()
 
-    async def find_by_user_id(self, user_id: str, session: AsyncSession) -> List[Track]:
-        """Find all tracks for a specific user"""
+    @read_only
+    async def find_page_by_user_id(
+        self,
+        user_id: str,
+        session: AsyncSession,
+        limit: int,
+        fields: Sequence[str],
+        after: Optional[Tuple[datetime, str]] = None,
+    ) -> List[Mapping[str, Any]]:
+        """
+        Find one page of a user's tracks, newest first.
+
+        Uses keyset pagination on (updated_at, id) so every page is an index
+        range scan, and only selects the requested columns. Returns up to
+        ``limit + 1`` rows; the extra row tells the caller there is a next page.
+        """
         try:
-            self.log_db_operation("SELECT", "tracks", user_id=user_id)
-            statement = select(Track).where(Track.user_id == user_id)
+            self.log_db_operation("SELECT_PAGE", "tracks", user_id=user_id, limit=limit)
+            # The keyset columns are always needed to build the next cursor
+            columns = [getattr(Track, field) for field in fields]
+            columns += [
+                column
+                for column in (Track.updated_at, Track.id)
+                if column.key not in fields
+            ]
+            statement = select(*columns).where(Track.user_id == user_id)
+            if after is not None:
+                statement = statement.where(tuple_(Track.updated_at, Track.id) < after)
+            statement = statement.order_by(
+                Track.updated_at.desc(), Track.id.desc()
+            ).limit(limit + 1)
             result = await session.execute(statement)
-            tracks = result.scalars().all()
-            self.log_db_operation(
-                "SELECT_RESULT", "tracks", user_id=user_id, count=len(tracks)
-            )
-            return tracks
+            return result.mappings().all()
         except Exception as e:
-            self.log_db_error("SELECT", "tracks", e, user_id=user_id)
+            self.log_db_error("SELECT_PAGE", "tracks", e, user_id=user_id)
             raise
 
+    @staticmethod
+    @read_only
+    async def find_list_version(
+        user_id: str, session: AsyncSession
+    ) -> Tuple[Optional[datetime], int]:
+        """Latest updated_at and track count for a user, from the index alone"""
+        statement = select(func.max(Track.updated_at), func.count(Track.id)).where(
+            Track.user_id == user_id
+        )
+        result = await session.execute(statement)
+        last_updated_at, count = result.one()
+        return last_updated_at, count
+
+    @staticmethod
+    @read_only
+    async def find_updated_at(
+        track_id: str, user_id: str, session: AsyncSession
+    ) -> Optional[datetime]:
+        """A track's updated_at without loading the row, or None if not found"""
+        statement = select(Track.updated_at).where(
+            Track.id == track_id, Track.user_id == user_id
+        )
+        result = await session.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def bulk_create(
+        self,
+        tracks: Sequence[Dict[str, Any]],
+        items: Sequence[Dict[str, Any]],
+        session: AsyncSession,
+    ) -> None:
+        """Insert many tracks and their items in one transaction"""
+        try:
+            self.log_db_operation("BULK_INSERT", "tracks", count=len(tracks))
+            # Core inserts, so every row goes in one executemany per table; an
+            # ORM bulk insert leaves out None values and splits the rows into
+            # a statement per distinct set of keys
+            if tracks:
+                await session.execute(insert(Track.__table__), tracks)
+            if items:
+                await session.execute(insert(TrackItem.__table__), items)
+            await session.commit()
+        except Exception as e:
+            self.log_db_error("BULK_INSERT", "tracks", e, count=len(tracks))
+            raise
+
+    async def stream_with_items(
+        self, user_id: str, session: AsyncSession, yield_per: int = 500
+    ) -> AsyncIterator[Tuple[Mapping[str, Any], List[Mapping[str, Any]]]]:
+        """
+        Stream a user's tracks with their items from a server-side cursor.
+
+        Tracks and items come from a single ordered join and are regrouped on
+        the fly, so memory use doesn't grow with the number of tracks. Plain
+        column rows are selected to keep them out of the identity map.
+        """
+        self.log_db_operation("STREAM", "tracks", user_id=user_id)
+        tracks_table = Track.__table__
+        items_table = TrackItem.__table__
+        statement = (
+            select(
+                *tracks_table.c,
+                *[column.label(f"item_{column.name}") for column in items_table.c],
+            )
+            .select_from(
+                tracks_table.outerjoin(
+                    items_table, items_table.c.track_id == tracks_table.c.id
+                )
+            )
+            .where(tracks_table.c.user_id == user_id)
+            .order_by(tracks_table.c.id, items_table.c.position)
+            .execution_options(yield_per=yield_per)
+        )
+
+        result = await session.stream(statement)
+        current_track = None
+        current_items: List[Mapping[str, Any]] = []
+        async for row in result.mappings():
+            if current_track is None or row["id"] != current_track["id"]:
+                if current_track is not None:
+                    yield current_track, current_items
+                current_track = row
+                current_items = []
+            if row["item_id"] is not None:
+                current_items.append(row)
+        if current_track is not None:
+            yield current_track, current_items
+
     @staticmethod
     async def find_by_id_and_user_id(
         track_id: str, user_id: str, session: AsyncSession
@@ -36,13 +149,49 @@ class TracksRepository(DatabaseLoggingMixin):
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def create(self, track: Track, session: AsyncSession) -> Track:
-        """Create a new track in the database"""
+    @staticmethod
+    async def find_public_row(
+        track_id: str, session: AsyncSession
+    ) -> Optional[Mapping[str, Any]]:
+        """A public track as a plain row mapping, whoever owns it"""
+        statement = select(*Track.__table__.c).where(
+            Track.id == track_id, Track.visibility == "public"
+        )
+        result = await session.execute(statement)
+        return result.mappings().one_or_none()
+
+    @staticmethod
+    async def find_joined_copy_id(
+        source_track_id: str, user_id: str, session: AsyncSession
+    ) -> Optional[str]:
+        """Id of the user's copy of a public track, if they joined it"""
+        statement = select(Track.id).where(
+            Track.source_track_id == source_track_id, Track.user_id == user_id
+        )
+        result = await session.execute(statement)
+        return result.scalars().first()
+
+    @staticmethod
+    async def find_row_by_id_and_user_id(
+        track_id: str, user_id: str, session: AsyncSession
+    ) -> Optional[Mapping[str, Any]]:
+        """Like find_by_id_and_user_id, but returns a plain row mapping"""
+        statement = select(*Track.__table__.c).where(
+            Track.id == track_id, Track.user_id == user_id
+        )
+        result = await session.execute(statement)
+        return result.mappings().one_or_none()
+
+    async def create(
+        self, track: Track, session: AsyncSession, items: Sequence[TrackItem] = ()
+    ) -> Track:
+        """Create a new track and its items in the database"""
         try:
             self.log_db_operation(
                 "INSERT", "tracks", user_id=track.user_id, title=track.title
             )
             session.add(track)
+            session.add_all(items)
             await session.commit()
             await session.refresh(track)
             self.log_db_operation(
@@ -63,8 +212,66 @@ class TracksRepository(DatabaseLoggingMixin):
         await session.refresh(track)
         return track
 
+    @staticmethod
+    async def touch(
+        track_id: str,
+        user_id: str,
+        session: AsyncSession,
+        values: Optional[Dict[str, Any]] = None,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[datetime]:
+        """
+        Bump a track's updated_at (and set ``values``) without loading it.
+
+        Also acts as the ownership check for item-level writes, and as the
+        optimistic concurrency check when ``expected_updated_at`` is given:
+        returns None when no row matched. Doesn't commit.
+        """
+        statement = update(Track).where(Track.id == track_id, Track.user_id == user_id)
+        if expected_updated_at is not None:
+            statement = statement.where(Track.updated_at == expected_updated_at)
+        statement = statement.values(
+            updated_at=datetime.utcnow(), **(values or {})
+        ).returning(Track.updated_at)
+        result = await session.execute(statement)
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def add_progress(
+        track_id: str,
+        session: AsyncSession,
+        articles: int = 0,
+        completed: int = 0,
+        active_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Apply item-write deltas to a track's progress counters, and move its
+        last activity to ``active_at`` when given. Doesn't commit.
+        """
+        values: Dict[str, Any] = {}
+        if articles:
+            values["article_count"] = Track.article_count + articles
+        if completed:
+            values["completed_count"] = Track.completed_count + completed
+        if active_at is not None:
+            values["last_activity_at"] = active_at
+        if values:
+            await session.execute(
+                update(Track).where(Track.id == track_id).values(**values)
+            )
+
+    @staticmethod
+    async def exists(track_id: str, user_id: str, session: AsyncSession) -> bool:
+        """Check whether a track exists for a user, without loading it"""
+        statement = select(Track.id).where(
+            Track.id == track_id, Track.user_id == user_id
+        )
+        result = await session.execute(statement)
+        return result.scalar_one_or_none() is not None
+
     @staticmethod
     async def delete(track: Track, session: AsyncSession) -> None:
-        """Delete a track from the database"""
+        """Delete a track and its items from the database"""
+        await session.execute(delete(TrackItem).where(TrackItem.track_id == track.id))
         await session.delete(track)
         await session.commit()
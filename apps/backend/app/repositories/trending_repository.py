@@ -0,0 +1,230 @@
+from datetime import datetime
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+from apps.backend.app.database import read_only
+from apps.backend.app.middleware import DatabaseLoggingMixin
+from apps.backend.app.models.track import Track, TrackItem
+from apps.backend.app.models.trending import TrackActivity, TrendingTrack
+from sqlalchemy import case, delete, func, insert, literal, or_, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+
+class TrendingRepository(DatabaseLoggingMixin):
+    """Repository for track activity and the trending ranking"""
+
+    def __init__(self):
+        super().__init__()
+
+    async def record(
+        self,
+        track_id: str,
+        user_id: str,
+        kind: str,
+        weight: float,
+        session: AsyncSession,
+    ) -> None:
+        """Log activity credited to a public track. Doesn't commit."""
+        self.log_db_operation("INSERT", "track_activity", track_id=track_id, kind=kind)
+        await session.execute(
+            insert(TrackActivity).values(
+                track_id=track_id,
+                user_id=user_id,
+                kind=kind,
+                weight=weight,
+                created_at=datetime.utcnow(),
+                ranked=False,
+            )
+        )
+
+    async def record_for_track(
+        self,
+        track_id: str,
+        user_id: str,
+        kind: str,
+        weight: float,
+        session: AsyncSession,
+    ) -> None:
+        """
+        Log activity on ``track_id``, credited to the public track it was
+        joined from, or to itself if it's public. Activity on other tracks
+        isn't logged. A single INSERT ... SELECT; doesn't commit.
+        """
+        self.log_db_operation("INSERT", "track_activity", track_id=track_id, kind=kind)
+        credited = select(
+            func.coalesce(Track.source_track_id, Track.id),
+            literal(user_id),
+            literal(kind),
+            literal(weight),
+            literal(datetime.utcnow()),
+            literal(False),
+        ).where(
+            Track.id == track_id,
+            or_(Track.source_track_id.is_not(None), Track.visibility == "public"),
+        )
+        await session.execute(
+            insert(TrackActivity).from_select(
+                [
+                    TrackActivity.track_id,
+                    TrackActivity.user_id,
+                    TrackActivity.kind,
+                    TrackActivity.weight,
+                    TrackActivity.created_at,
+                    TrackActivity.ranked,
+                ],
+                credited,
+            )
+        )
+
+    async def claim_unranked(
+        self, limit: int, session: AsyncSession
+    ) -> List[Mapping[str, Any]]:
+        """
+        Lock up to ``limit`` activity rows that aren't in the ranking yet,
+        oldest first. Rows locked by a concurrent refresh are skipped, so
+        refreshes in several workers split the backlog instead of waiting.
+        """
+        self.log_db_operation("CLAIM", "track_activity", limit=limit)
+        statement = (
+            select(
+                TrackActivity.id,
+                TrackActivity.track_id,
+                TrackActivity.weight,
+                TrackActivity.created_at,
+            )
+            .where(TrackActivity.ranked.is_(False))
+            .order_by(TrackActivity.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.execute(statement)
+        return result.mappings().all()
+
+    async def add_scores(
+        self,
+        scores: Mapping[str, Tuple[float, datetime]],
+        activity_ids: Sequence[int],
+        session: AsyncSession,
+    ) -> int:
+        """
+        Add log-domain ``scores`` (track id -> (score, last activity)) to the
+        ranking of the tracks that are still public, and mark the activity
+        they came from as ranked. Returns the number of tracks updated.
+        Doesn't commit.
+        """
+        self.log_db_operation("UPSERT", "trending_tracks", count=len(scores))
+        public = await session.execute(
+            select(Track.id).where(
+                Track.id.in_(list(scores)), Track.visibility == "public"
+            )
+        )
+        rows = [
+            {
+                "track_id": track_id,
+                "score": scores[track_id][0],
+                "last_activity_at": scores[track_id][1],
+            }
+            for track_id in public.scalars().all()
+        ]
+        if rows:
+            insert_ = (
+                postgresql.insert
+                if session.bind.dialect.name == "postgresql"
+                else sqlite.insert
+            )
+            statement = insert_(TrendingTrack).values(rows)
+            excluded = statement.excluded
+            current = TrendingTrack.score
+            statement = statement.on_conflict_do_update(
+                index_elements=[TrendingTrack.track_id],
+                set_={
+                    # ln(e^a + e^b), computed without overflowing
+                    "score": case(
+                        (
+                            current > excluded.score,
+                            current + func.ln(1 + func.exp(excluded.score - current)),
+                        ),
+                        else_=excluded.score
+                        + func.ln(1 + func.exp(current - excluded.score)),
+                    ),
+                    "last_activity_at": case(
+                        (
+                            excluded.last_activity_at > TrendingTrack.last_activity_at,
+                            excluded.last_activity_at,
+                        ),
+                        else_=TrendingTrack.last_activity_at,
+                    ),
+                },
+            )
+            await session.execute(statement)
+        await session.execute(
+            update(TrackActivity)
+            .where(TrackActivity.id.in_(list(activity_ids)))
+            .values(ranked=True)
+        )
+        return len(rows)
+
+    async def prune(self, inactive_since: datetime, session: AsyncSession) -> int:
+        """Drop tracks with no activity since ``inactive_since``. Doesn't commit."""
+        self.log_db_operation("DELETE", "trending_tracks")
+        result = await session.execute(
+            delete(TrendingTrack)
+            .where(TrendingTrack.last_activity_at < inactive_since)
+            .returning(TrendingTrack.track_id)
+        )
+        return len(result.all())
+
+    async def remove(self, track_id: str, session: AsyncSession) -> None:
+        """Take a track out of the ranking. Doesn't commit."""
+        self.log_db_operation("DELETE", "trending_tracks", track_id=track_id)
+        await session.execute(
+            delete(TrendingTrack).where(TrendingTrack.track_id == track_id)
+        )
+
+    @read_only
+    async def find_page(
+        self,
+        limit: int,
+        session: AsyncSession,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[Mapping[str, Any]]:
+        """
+        One page of the ranking, highest score first. An index range scan on
+        (score, track_id) plus a primary-key lookup per row, so the cost is
+        the same whatever the number of public tracks. Returns up to
+        ``limit + 1`` rows; the extra row tells the caller there is a next page.
+        """
+        try:
+            self.log_db_operation("SELECT_PAGE", "trending_tracks", limit=limit)
+            article_count = (
+                select(func.count(TrackItem.id))
+                .where(TrackItem.track_id == Track.id)
+                .scalar_subquery()
+            )
+            statement = (
+                select(
+                    Track.id,
+                    Track.user_id,
+                    Track.title,
+                    Track.description,
+                    article_count.label("article_count"),
+                    Track.updated_at,
+                    TrendingTrack.last_activity_at,
+                    TrendingTrack.score,
+                )
+                .join(Track, Track.id == TrendingTrack.track_id)
+                .where(Track.visibility == "public")
+            )
+            if after is not None:
+                statement = statement.where(
+                    tuple_(TrendingTrack.score, TrendingTrack.track_id) < after
+                )
+            statement = statement.order_by(
+                TrendingTrack.score.desc(), TrendingTrack.track_id.desc()
+            ).limit(limit + 1)
+            result = await session.execute(statement)
+            return result.mappings().all()
+        except Exception as e:
+            self.log_db_error("SELECT_PAGE", "trending_tracks", e)
+            raise
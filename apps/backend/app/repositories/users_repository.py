@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from apps.backend.app.middleware import DatabaseLoggingMixin
+from apps.backend.app.models.user import User
+from apps.backend.app.token_verifier import AuthIdentity
+from sqlalchemy import or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+
+class UsersRepository(DatabaseLoggingMixin):
+    """Repository for User database operations"""
+
+    def __init__(self):
+        super().__init__()
+
+    async def upsert(self, identity: AuthIdentity, session: AsyncSession) -> User:
+        """
+        Insert the user, or update their profile fields if they changed.
+
+        Runs as INSERT ... ON CONFLICT DO UPDATE ... WHERE <changed>, so an
+        unchanged user is never rewritten. That statement returns nothing for
+        an unchanged user, who is then read by primary key: two statements,
+        no row write.
+        """
+        try:
+            self.log_db_operation("UPSERT", "users", record_id=identity.user_id)
+            now = datetime.utcnow()
+            insert = (
+                postgresql.insert
+                if session.bind.dialect.name == "postgresql"
+                else sqlite.insert
+            )
+            statement = insert(User).values(
+                id=identity.user_id,
+                email=identity.email,
+                name=identity.name,
+                avatar_url=identity.avatar_url,
+                created_at=now,
+                updated_at=now,
+            )
+            excluded = statement.excluded
+            statement = statement.on_conflict_do_update(
+                index_elements=[User.id],
+                set_={
+                    "email": excluded.email,
+                    "name": excluded.name,
+                    "avatar_url": excluded.avatar_url,
+                    "updated_at": excluded.updated_at,
+                },
+                where=or_(
+                    User.email.is_distinct_from(excluded.email),
+                    User.name.is_distinct_from(excluded.name),
+                    User.avatar_url.is_distinct_from(excluded.avatar_url),
+                ),
+            ).returning(User)
+
+            result = await session.execute(statement)
+            user = result.scalar_one_or_none()
+            if user is None:
+                # The row exists and nothing changed, so RETURNING was empty
+                result = await session.execute(
+                    select(User).where(User.id == identity.user_id)
+                )
+                user = result.scalar_one()
+
+            # Detach before committing so the loaded attributes aren't expired
+            session.expunge(user)
+            await session.commit()
+            return user
+        except Exception as e:
+            self.log_db_error("UPSERT", "users", e, record_id=identity.user_id)
+            raise
@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Dict, Sequence
+
+from apps.backend.app.middleware import DatabaseLoggingMixin
+from apps.backend.app.models.wikipedia import WikipediaPage
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+
+class WikipediaPagesRepository(DatabaseLoggingMixin):
+    """Repository for the Wikipedia metadata cache"""
+
+    def __init__(self):
+        super().__init__()
+
+    async def find_fresh(
+        self, titles: Sequence[str], fetched_after: datetime, session: AsyncSession
+    ) -> Dict[str, WikipediaPage]:
+        """Cached pages for ``titles`` that were fetched after ``fetched_after``"""
+        if not titles:
+            return {}
+        self.log_db_operation("SELECT", "wikipedia_pages", count=len(titles))
+        statement = select(WikipediaPage).where(
+            WikipediaPage.title.in_(titles),
+            WikipediaPage.fetched_at > fetched_after,
+        )
+        result = await session.execute(statement)
+        return {page.title: page for page in result.scalars()}
+
+    async def upsert_many(
+        self, pages: Sequence[WikipediaPage], session: AsyncSession
+    ) -> None:
+        """Insert or refresh cache rows in one statement. Doesn't commit."""
+        if not pages:
+            return
+        try:
+            self.log_db_operation("UPSERT", "wikipedia_pages", count=len(pages))
+            insert = (
+                postgresql.insert
+                if session.bind.dialect.name == "postgresql"
+                else sqlite.insert
+            )
+            statement = insert(WikipediaPage).values(
+                [page.model_dump() for page in pages]
+            )
+            excluded = statement.excluded
+            statement = statement.on_conflict_do_update(
+                index_elements=[WikipediaPage.title],
+                set_={
+                    "page_id": excluded.page_id,
+                    "canonical_title": excluded.canonical_title,
+                    "url": excluded.url,
+                    "description": excluded.description,
+                    "fetched_at": excluded.fetched_at,
+                },
+            )
+            await session.execute(statement)
+        except Exception as e:
+            self.log_db_error("UPSERT", "wikipedia_pages", e, count=len(pages))
+            raise
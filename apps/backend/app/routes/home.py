@@ -0,0 +1,27 @@
+from apps.backend.app.auth import get_current_user
+from apps.backend.app.database import get_session
+from apps.backend.app.models.progress import MAX_HOME_TRACKS, HomeResponse
+from apps.backend.app.models.user import User
+from apps.backend.app.services.home_service import home_service
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter(prefix="/api/home", tags=["home"])
+
+
+@router.get("", response_model=HomeResponse)
+async def get_home(
+    limit: int = Query(default=20, ge=1, le=MAX_HOME_TRACKS),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    The reading queue (the next unread article of each unfinished track,
+    most recently active track first) and the user's reading streak.
+
+    Read in one query from the tracks' progress counters and the stored
+    streak, so the cost grows with ``limit``, not with the number of tracks.
+    """
+    return await home_service.get_home(
+        user_id=current_user.id, limit=limit, session=session
+    )
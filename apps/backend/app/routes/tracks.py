@@ -1,31 +1,201 @@
-from typing import List
+from datetime import datetime
+from typing import Any, List, Optional
 
 from apps.backend.app.auth import get_current_user
-from apps.backend.app.database import get_session
+from apps.backend.app.database import get_session, new_session, set_session_user
+from apps.backend.app.etags import (
+    CACHE_CONTROL,
+    etag_matches,
+    format_http_date,
+    make_list_etag,
+    make_track_etag,
+    not_modified_since,
+    parse_track_etag,
+)
 from apps.backend.app.logging_config import logger
-from apps.backend.app.models.track import TrackCreate, TrackResponse, TrackUpdate
+from apps.backend.app.models.track import (
+    TRACK_LIST_FIELDS,
+    BulkImportResponse,
+    TrackCreate,
+    TrackItemCreate,
+    TrackItemResponse,
+    TrackItemUpdate,
+    TrackPage,
+    TrackPatch,
+    TrackResponse,
+    TrackSearchPage,
+    TrackSuggestions,
+    TrackSuggestRequest,
+    TrackUpdate,
+)
+from apps.backend.app.models.trending import TrendingPage
 from apps.backend.app.models.user import User
+from apps.backend.app.pagination import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_SEARCH_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+)
 from apps.backend.app.repositories.tracks_repository import TracksRepository
-from apps.backend.app.services.tracks_service import TracksService
-from fastapi import APIRouter, Depends, HTTPException, status
+from apps.backend.app.serialization import RenderedResponse
+from apps.backend.app.services.suggestion_service import (
+    SuggestionService,
+    get_suggestion_service,
+)
+from apps.backend.app.services.tracks_service import tracks_service
+from apps.backend.app.services.trending_service import (
+    TRENDING_REFRESH_SECONDS,
+    trending_service,
+)
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/api/tracks", tags=["tracks"])
 
 # Create service instances
 tracks_repository = TracksRepository()
-tracks_service = TracksService()
 
 
-@router.get("/", response_model=List[TrackResponse])
+def _set_cache_headers(
+    response: Response, etag: str, last_modified: Optional[datetime]
+) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_http_date(value=last_modified)
+
+
+def _is_not_modified(
+    etag: str,
+    last_modified: Optional[datetime],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    """Evaluate conditional GET headers (If-None-Match takes precedence)"""
+    if if_none_match is not None:
+        return etag_matches(if_none_match=if_none_match, etag=etag)
+    if if_modified_since is not None and last_modified is not None:
+        return not_modified_since(
+            if_modified_since=if_modified_since, last_modified=last_modified
+        )
+    return False
+
+
+def _not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    _set_cache_headers(response=response, etag=etag, last_modified=last_modified)
+    return response
+
+
+def _rendered_response(
+    rendered: RenderedResponse,
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> Response:
+    """Send a rendered body, or 304 if the client's copy is current"""
+    if _is_not_modified(
+        etag=rendered.etag,
+        last_modified=rendered.last_modified,
+        if_none_match=if_none_match,
+        if_modified_since=if_modified_since,
+    ):
+        return _not_modified_response(
+            etag=rendered.etag, last_modified=rendered.last_modified
+        )
+    response = rendered.to_response()
+    _set_cache_headers(
+        response=response, etag=rendered.etag, last_modified=rendered.last_modified
+    )
+    return response
+
+
+@router.get("/", response_model=TrackPage, response_model_exclude_unset=True)
 async def get_tracks(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated track fields to return (id is always included)",
+    ),
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    """Get all tracks for the authenticated user"""
+    """
+    Get a page of tracks for the authenticated user, newest first.
+
+    Pages are served from the tracks cache, so a repeated or conditional
+    request needs no queries. Conditional requests for a page that isn't
+    cached (or with the cache off) are answered with 304 from an aggregate
+    over the user's tracks before any page rows are loaded.
+    """
     logger.info(f"Fetching tracks for user: {current_user.id}")
-    return await tracks_repository.find_by_user_id(
-        user_id=current_user.id, session=session
+
+    selected_fields = list(TRACK_LIST_FIELDS)
+    if fields:
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested - set(TRACK_LIST_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        requested.add("id")
+        selected_fields = [field for field in TRACK_LIST_FIELDS if field in requested]
+
+    conditional = if_none_match is not None or if_modified_since is not None
+    rendered = None
+    if conditional:
+        rendered = await tracks_service.find_cached_track_page(
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            fields=selected_fields,
+        )
+    list_version = None
+    if rendered is None and (conditional or not tracks_service.tracks_cache.enabled):
+        # Answer conditional requests from the version aggregate before any
+        # page rows are loaded
+        list_version = await tracks_service.get_list_version(
+            user_id=current_user.id, session=session
+        )
+        last_updated_at, count = list_version
+        etag = make_list_etag(
+            last_updated_at=last_updated_at,
+            count=count,
+            params=[limit, cursor, ",".join(selected_fields)],
+        )
+        if _is_not_modified(
+            etag=etag,
+            last_modified=last_updated_at,
+            if_none_match=if_none_match,
+            if_modified_since=if_modified_since,
+        ):
+            return _not_modified_response(etag=etag, last_modified=last_updated_at)
+
+    if rendered is None:
+        rendered = await tracks_service.get_track_page(
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            fields=selected_fields,
+            session=session,
+            list_version=list_version,
+        )
+    return _rendered_response(
+        rendered=rendered,
+        if_none_match=if_none_match,
+        if_modified_since=if_modified_since,
     )
 
 
@@ -44,23 +214,155 @@ async def create_track(
     )
 
 
+@router.post(
+    "/bulk", response_model=BulkImportResponse, status_code=status.HTTP_201_CREATED
+)
+async def import_tracks(
+    tracks: List[Any] = Body(...),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Create many tracks at once; invalid entries are reported by index"""
+    logger.info(f"Importing {len(tracks)} tracks for user: {current_user.id}")
+    return await tracks_service.import_tracks(
+        raw_tracks=tracks, user_id=current_user.id, session=session
+    )
+
+
+@router.post("/suggest", response_model=TrackSuggestions)
+async def suggest_articles(
+    request: TrackSuggestRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    suggestion_service: SuggestionService = Depends(get_suggestion_service),
+):
+    """
+    Suggest Wikipedia articles related to ``titles``, ordered so that each
+    comes after the suggestions it builds on, leaving out articles the user
+    has already completed
+    """
+    logger.info(f"Suggesting articles for user: {current_user.id}")
+    return await suggestion_service.suggest(
+        titles=request.titles,
+        limit=request.limit,
+        user_id=current_user.id,
+        session=session,
+    )
+
+
+@router.get("/export")
+async def export_tracks(current_user: User = Depends(get_current_user)):
+    """Stream all of the user's tracks as NDJSON (one track per line)"""
+    logger.info(f"Exporting tracks for user: {current_user.id}")
+    user_id = current_user.id
+
+    async def generate():
+        # The request's session is closed before the body is streamed, so the
+        # export holds its own for as long as the stream runs
+        async with new_session(read_replica=True) as session:
+            await set_session_user(session=session, user_id=user_id)
+            async for line in tracks_service.export_tracks(
+                user_id=user_id, session=session
+            ):
+                yield line
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="tracks.ndjson"'},
+    )
+
+
+@router.get("/search", response_model=TrackSearchPage)
+async def search_tracks(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(default=DEFAULT_SEARCH_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Search the authenticated user's tracks and their articles, best match
+    first. Supports quoted phrases, OR and -exclusions, and tolerates typos.
+    """
+    logger.info(f"Searching tracks for user: {current_user.id}")
+    return await tracks_service.search_tracks(
+        user_id=current_user.id,
+        query=q,
+        limit=limit,
+        cursor=cursor,
+        session=session,
+    )
+
+
+@router.get("/trending", response_model=TrendingPage)
+async def get_trending_tracks(
+    response: Response,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Get a page of trending public tracks, most popular first.
+
+    Served from the precomputed ranking, which the background refresh
+    updates every TRENDING_REFRESH_SECONDS, so shared caches may keep a page
+    for that long.
+    """
+    if TRENDING_REFRESH_SECONDS > 0:
+        response.headers["Cache-Control"] = (
+            f"public, max-age={int(TRENDING_REFRESH_SECONDS)}"
+        )
+    return await trending_service.get_page(limit=limit, cursor=cursor, session=session)
+
+
 @router.get("/{track_id}", response_model=TrackResponse)
 async def get_track(
     track_id: str,
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    """Get a specific track (must belong to the authenticated user)"""
-    track = await TracksRepository.find_by_id_and_user_id(
-        track_id=track_id, user_id=current_user.id, session=session
-    )
+    """
+    Get a specific track (must belong to the authenticated user).
 
-    if not track:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Track not found"
+    Served from the tracks cache when possible. Conditional requests for a
+    track that isn't cached (or with the cache off) only read its
+    updated_at; the track and its articles are loaded when it has changed.
+    """
+    conditional = if_none_match is not None or if_modified_since is not None
+    rendered = None
+    if conditional:
+        rendered = await tracks_service.find_cached_track_response(
+            track_id=track_id, user_id=current_user.id
         )
+    if rendered is None and conditional:
+        updated_at = await TracksRepository.find_updated_at(
+            track_id=track_id, user_id=current_user.id, session=session
+        )
+        if updated_at is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Track not found"
+            )
+        etag = make_track_etag(updated_at=updated_at)
+        if _is_not_modified(
+            etag=etag,
+            last_modified=updated_at,
+            if_none_match=if_none_match,
+            if_modified_since=if_modified_since,
+        ):
+            return _not_modified_response(etag=etag, last_modified=updated_at)
 
-    return track
+    if rendered is None:
+        rendered = await tracks_service.get_track_response(
+            track_id=track_id, user_id=current_user.id, session=session
+        )
+    return _rendered_response(
+        rendered=rendered,
+        if_none_match=if_none_match,
+        if_modified_since=if_modified_since,
+    )
 
 
 @router.put("/{track_id}", response_model=TrackResponse)
@@ -80,6 +382,42 @@ async def update_track(
     )
 
 
+@router.patch("/{track_id}", response_model=TrackResponse)
+async def patch_track(
+    track_id: str,
+    patch: TrackPatch,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Partially update a track with targeted article operations.
+
+    Send the track's ETag in If-Match to fail with 412 instead of overwriting
+    changes made since it was read.
+    """
+    logger.info(f"Patching track {track_id} for user: {current_user.id}")
+    expected_updated_at = None
+    if if_match and if_match.strip() != "*":
+        expected_updated_at = parse_track_etag(etag=if_match)
+        if expected_updated_at is None:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="If-Match doesn't match the current track version",
+            )
+
+    track = await tracks_service.patch_track(
+        track_id=track_id,
+        patch=patch,
+        user_id=current_user.id,
+        session=session,
+        expected_updated_at=expected_updated_at,
+    )
+    response.headers["ETag"] = make_track_etag(updated_at=track.updated_at)
+    return track
+
+
 @router.delete("/{track_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_track(
     track_id: str,
@@ -92,3 +430,75 @@ async def delete_track(
         track_id=track_id, user_id=current_user.id, session=session
     )
     return None
+
+
+@router.post(
+    "/{track_id}/join",
+    response_model=TrackResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def join_track(
+    track_id: str,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Copy another user's public track into the authenticated user's tracks"""
+    logger.info(f"Joining track {track_id} for user: {current_user.id}")
+    return await tracks_service.join_track(
+        track_id=track_id, user_id=current_user.id, session=session
+    )
+
+
+@router.post(
+    "/{track_id}/items",
+    response_model=TrackItemResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_track_item(
+    track_id: str,
+    item_data: TrackItemCreate,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Add an article to a track, at the end or at a given index"""
+    logger.info(f"Adding item to track {track_id} for user: {current_user.id}")
+    return await tracks_service.add_item(
+        track_id=track_id,
+        item_data=item_data,
+        user_id=current_user.id,
+        session=session,
+    )
+
+
+@router.patch("/{track_id}/items/{item_id}", response_model=TrackItemResponse)
+async def update_track_item(
+    track_id: str,
+    item_id: str,
+    item_data: TrackItemUpdate,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Mark an article complete/incomplete or move it to another index"""
+    logger.info(f"Updating item {item_id} of track {track_id}")
+    return await tracks_service.update_item(
+        track_id=track_id,
+        item_id=item_id,
+        item_data=item_data,
+        user_id=current_user.id,
+        session=session,
+    )
+
+
+@router.delete("/{track_id}/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_track_item(
+    track_id: str,
+    item_id: str,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Remove an article from a track"""
+    logger.info(f"Deleting item {item_id} of track {track_id}")
+    await tracks_service.delete_item(
+        track_id=track_id, item_id=item_id, user_id=current_user.id, session=session
+    )
+    return None
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import orjson
+from fastapi.responses import Response
+
+# Trusted-output serialization: rows read straight from the database are shaped
+# into plain dicts matching the response models and encoded with orjson,
+# skipping response_model validation. Keys follow the models' field order so
+# the JSON is byte-for-byte what the validated path produces.
+
+
+def article_to_dict(row: Mapping[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """A track item row as a WikipediaArticle-shaped dict"""
+    return {
+        "id": row[f"{prefix}id"],
+        "title": row[f"{prefix}title"],
+        "url": row[f"{prefix}url"],
+        "description": row[f"{prefix}description"],
+        "completed": row[f"{prefix}completed"],
+    }
+
+
+def track_to_dict(
+    track: Mapping[str, Any], articles: Sequence[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """A track row plus its articles as a TrackResponse-shaped dict"""
+    return {
+        "title": track["title"],
+        "description": track["description"],
+        "id": track["id"],
+        "user_id": track["user_id"],
+        "articles": articles,
+        "created_at": track["created_at"],
+        "updated_at": track["updated_at"],
+        "visibility": track["visibility"],
+        "source_track_id": track["source_track_id"],
+    }
+
+
+def dumps_line(content: Any) -> bytes:
+    """Encode content as one NDJSON line"""
+    return orjson.dumps(content, option=orjson.OPT_APPEND_NEWLINE)
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    """An encoded response body with its validators, as stored in the cache"""
+
+    etag: str
+    last_modified: Optional[datetime]
+    body: bytes
+
+    @classmethod
+    def render(
+        cls, content: Any, etag: str, last_modified: Optional[datetime]
+    ) -> "RenderedResponse":
+        return cls(etag=etag, last_modified=last_modified, body=orjson.dumps(content))
+
+    def encode(self) -> bytes:
+        header = orjson.dumps([self.etag, self.last_modified])
+        return header + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, data: bytes) -> "RenderedResponse":
+        header, body = data.split(b"\n", 1)
+        etag, last_modified = orjson.loads(header)
+        return cls(
+            etag=etag,
+            last_modified=(
+                datetime.fromisoformat(last_modified) if last_modified else None
+            ),
+            body=body,
+        )
+
+    def to_response(self) -> Response:
+        """The body as a JSON response (validators are set by the caller)"""
+        return Response(content=self.body, media_type="application/json")
@@ -0,0 +1,88 @@
+import math
+import os
+
+import uvicorn
+from apps.backend.app.cache import TRACKS_CACHE_BACKEND
+from apps.backend.app.database import DATABASE_REPLICA_URLS
+from apps.backend.app.logging_config import logger
+from apps.backend.app.utils import load_env
+
+load_env()
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# Worker processes; 0 means one per available CPU
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+# How long in-flight requests get to finish after SIGTERM/SIGINT
+GRACEFUL_SHUTDOWN_SECONDS = float(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", "25"))
+KEEPALIVE_SECONDS = int(os.getenv("KEEPALIVE_SECONDS", "5"))
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+APP = "apps.backend.app.main:app"
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+
+def available_cpus() -> int:
+    """
+    CPUs this process may run on: its affinity mask, capped by a cgroup v2
+    CPU quota such as a container's CPU limit
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    try:
+        with open(CGROUP_CPU_MAX) as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def run_server(workers: int = WEB_CONCURRENCY, port: int = PORT) -> None:
+    """
+    Serve the app with ``workers`` processes (one per CPU by default).
+
+    The app is passed by import string, so each worker imports it in a fresh
+    interpreter and opens its own database pool and clients in the lifespan
+    hook; nothing holding sockets is inherited. uvloop and httptools are
+    used when installed. On SIGTERM or SIGINT each worker stops accepting
+    connections, gives in-flight requests up to GRACEFUL_SHUTDOWN_SECONDS,
+    then runs the lifespan shutdown, which disposes its pool.
+    """
+    workers = workers or available_cpus()
+    if workers > 1 and TRACKS_CACHE_BACKEND == "memory":
+        # A per-process cache would keep serving a page another worker's
+        # write invalidated; workers inherit this environment
+        logger.warning(
+            "TRACKS_CACHE_BACKEND=memory can't be shared between workers; "
+            "the tracks cache is off. Use redis to cache with several workers."
+        )
+        os.environ["TRACKS_CACHE_BACKEND"] = "none"
+    if workers > 1 and DATABASE_REPLICA_URLS and TRACKS_CACHE_BACKEND != "redis":
+        # Read-your-writes marks would stay in the worker that took the write,
+        # so another worker could read the user's stale data from a replica
+        logger.warning(
+            "DATABASE_REPLICA_URLS needs TRACKS_CACHE_BACKEND=redis with several "
+            "workers, to share read-your-writes marks; replica routing is off."
+        )
+        os.environ["DATABASE_REPLICA_URLS"] = ""
+    uvicorn.run(
+        APP,
+        host=HOST,
+        port=port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        lifespan="on",
+        timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_SECONDS,
+        timeout_keep_alive=KEEPALIVE_SECONDS,
+        proxy_headers=True,
+        forwarded_allow_ips=FORWARDED_ALLOW_IPS,
+    )
+
+
+if __name__ == "__main__":
+    run_server()
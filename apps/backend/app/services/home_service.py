@@ -0,0 +1,58 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Mapping
+
+from apps.backend.app.models.progress import HomeResponse, HomeStreak, HomeTrack
+from apps.backend.app.models.track import WikipediaArticle
+from apps.backend.app.repositories.progress_repository import ProgressRepository
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def build_streak(row: Mapping[str, Any], today: date) -> HomeStreak:
+    """The stored streak as of ``today``: a run that ended before yesterday is over"""
+    last_day = row["last_day"]
+    if last_day is None:
+        return HomeStreak()
+    return HomeStreak(
+        current=row["current_streak"] if last_day >= today - timedelta(days=1) else 0,
+        longest=row["longest_streak"],
+        completed_today=row["last_day_completions"] if last_day == today else 0,
+        last_day=last_day,
+    )
+
+
+class HomeService:
+    """Service for the home screen: the reading queue and streaks"""
+
+    def __init__(self):
+        self.progress_repository = ProgressRepository()
+
+    async def get_home(
+        self, user_id: str, limit: int, session: AsyncSession
+    ) -> HomeResponse:
+        """The next article of each unfinished track, and the reading streak"""
+        rows = await self.progress_repository.find_home(
+            user_id=user_id, limit=limit, session=session
+        )
+        return HomeResponse(
+            queue=[
+                HomeTrack(
+                    id=row["id"],
+                    title=row["title"],
+                    completed_count=row["completed_count"],
+                    article_count=row["article_count"],
+                    last_activity_at=row["last_activity_at"],
+                    next_article=WikipediaArticle(
+                        id=row["item_id"],
+                        title=row["item_title"],
+                        url=row["item_url"],
+                        description=row["item_description"],
+                    ),
+                )
+                for row in rows
+                if row["item_id"] is not None
+            ],
+            streak=build_streak(row=rows[0], today=datetime.utcnow().date()),
+        )
+
+
+home_service = HomeService()
@@ -0,0 +1,103 @@
+import asyncio
+import os
+import time
+from typing import List, Optional
+from urllib.parse import quote
+
+from apps.backend.app.link_graph import LinkGraph
+from apps.backend.app.logging_config import logger
+from apps.backend.app.metrics import registry
+from apps.backend.app.models.track import ArticleSuggestion, TrackSuggestions
+from apps.backend.app.repositories.track_items_repository import TrackItemsRepository
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Link graph file built with `python -m apps.backend.app.link_graph`; unset
+# disables suggestions
+LINK_GRAPH_PATH = os.getenv("LINK_GRAPH_PATH", "")
+# Most links one suggestion may traverse, which bounds its latency
+SUGGEST_MAX_EDGES = int(os.getenv("SUGGEST_MAX_EDGES", "200000"))
+WIKIPEDIA_ARTICLE_URL = os.getenv(
+    "WIKIPEDIA_ARTICLE_URL", "https://en.wikipedia.org/wiki/"
+)
+
+suggest_duration = registry.histogram(
+    "suggest_duration_seconds", "Time to rank and order article suggestions"
+)
+
+
+def article_url(title: str) -> str:
+    return WIKIPEDIA_ARTICLE_URL + quote(title.replace(" ", "_"))
+
+
+class SuggestionService:
+    """Article suggestions for track building, from the Wikipedia link graph"""
+
+    def __init__(self, graph_path: str = LINK_GRAPH_PATH):
+        self.graph_path = graph_path
+        self.track_items_repository = TrackItemsRepository()
+        self._graph: Optional[LinkGraph] = None
+
+    @property
+    def graph(self) -> LinkGraph:
+        """The link graph, mapped on first use"""
+        if self._graph is None:
+            if not self.graph_path:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Article suggestions are not available",
+                )
+            self._graph = LinkGraph(path=self.graph_path)
+            logger.info(
+                f"Link graph mapped: {self._graph.node_count} articles, "
+                f"{self._graph.edge_count} links"
+            )
+        return self._graph
+
+    async def suggest(
+        self, titles: List[str], limit: int, user_id: str, session: AsyncSession
+    ) -> TrackSuggestions:
+        """
+        Articles related to ``titles``, prerequisites first, leaving out the
+        ones the user has completed
+        """
+        graph = self.graph
+        completed = await self.track_items_repository.find_completed_titles(
+            user_id=user_id, session=session
+        )
+        start = time.perf_counter()
+        # CPU-bound; in a thread so a slow query doesn't stall the event loop
+        suggestions, unknown = await asyncio.to_thread(
+            graph.suggest,
+            titles=titles,
+            limit=limit,
+            exclude=completed,
+            max_edges=SUGGEST_MAX_EDGES,
+        )
+        suggest_duration.observe(value=time.perf_counter() - start)
+        return TrackSuggestions(
+            items=[
+                ArticleSuggestion(
+                    title=suggestion.title,
+                    url=article_url(title=suggestion.title),
+                    score=suggestion.score,
+                    prerequisites=suggestion.prerequisites,
+                    completed_prerequisites=suggestion.completed_prerequisites,
+                )
+                for suggestion in suggestions
+            ],
+            unknown_titles=unknown,
+        )
+
+    def close(self) -> None:
+        if self._graph is not None:
+            self._graph.close()
+            self._graph = None
+
+
+suggestion_service = SuggestionService()
+
+
+def get_suggestion_service() -> SuggestionService:
+    """The suggestion service routes use; overridable like any dependency"""
+    return suggestion_service
@@ -1,28 +1,658 @@
+import html
+import os
+import uuid
 from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
-from apps.backend.app.models.track import Track, TrackCreate, TrackUpdate
+from apps.backend.app.cache import tracks_cache
+from apps.backend.app.database import new_session
+from apps.backend.app.etags import make_list_etag, make_track_etag
+from apps.backend.app.models.track import (
+    POSITION_GAP,
+    BulkImportError,
+    BulkImportResponse,
+    InsertOperation,
+    MoveOperation,
+    RemoveOperation,
+    SetCompletedOperation,
+    Track,
+    TrackCreate,
+    TrackItem,
+    TrackItemCreate,
+    TrackItemResponse,
+    TrackItemUpdate,
+    TrackOperation,
+    TrackPatch,
+    TrackResponse,
+    TrackSearchPage,
+    TrackSearchResult,
+    TrackUpdate,
+    WikipediaArticle,
+)
+from apps.backend.app.pagination import (
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+from apps.backend.app.repositories.progress_repository import ProgressRepository
+from apps.backend.app.repositories.track_items_repository import TrackItemsRepository
+from apps.backend.app.repositories.track_search_repository import (
+    HIGHLIGHT_START,
+    HIGHLIGHT_STOP,
+    TrackSearchRepository,
+)
 from apps.backend.app.repositories.tracks_repository import TracksRepository
+from apps.backend.app.repositories.trending_repository import TrendingRepository
+from apps.backend.app.serialization import (
+    RenderedResponse,
+    article_to_dict,
+    dumps_line,
+    track_to_dict,
+)
+from apps.backend.app.services.trending_service import COMPLETION_WEIGHT, JOIN_WEIGHT
+from apps.backend.app.services.wikipedia_service import wikipedia_service
+from apps.backend.app.single_flight import tracks_flight
+from apps.backend.app.tasks import enqueue, task_runner
 from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+BULK_IMPORT_MAX_TRACKS = int(os.getenv("BULK_IMPORT_MAX_TRACKS", "10000"))
+# Resolve new tracks' articles on Wikipedia in a background job ("background")
+# or before responding ("inline")
+TRACK_ENRICHMENT = os.getenv("TRACK_ENRICHMENT", "background")
+
 
 class TracksService:
     """Service for Track business logic"""
 
     def __init__(self):
         self.tracks_repository = TracksRepository()
+        self.track_items_repository = TrackItemsRepository()
+        self.track_search_repository = TrackSearchRepository()
+        self.trending_repository = TrendingRepository()
+        self.progress_repository = ProgressRepository()
+        self.wikipedia_service = wikipedia_service
+        self.tracks_cache = tracks_cache
+        self.tracks_flight = tracks_flight
+
+    async def build_responses(
+        self, tracks: Sequence[Track], session: AsyncSession
+    ) -> List[TrackResponse]:
+        """Attach articles to tracks, loading all items in one batched query"""
+        items_by_track = await self.track_items_repository.find_by_track_ids(
+            track_ids=[track.id for track in tracks], session=session
+        )
+        return [
+            TrackResponse(
+                id=track.id,
+                user_id=track.user_id,
+                title=track.title,
+                description=track.description,
+                articles=[item.to_article() for item in items_by_track[track.id]],
+                created_at=track.created_at,
+                updated_at=track.updated_at,
+                visibility=track.visibility,
+                source_track_id=track.source_track_id,
+            )
+            for track in tracks
+        ]
+
+    async def get_track(
+        self, track_id: str, user_id: str, session: AsyncSession
+    ) -> TrackResponse:
+        """Get a track with its articles"""
+        track = await TracksRepository.find_by_id_and_user_id(
+            track_id=track_id, user_id=user_id, session=session
+        )
+
+        if not track:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Track not found"
+            )
+
+        responses = await self.build_responses(tracks=[track], session=session)
+        return responses[0]
+
+    async def get_track_page(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str],
+        fields: Sequence[str],
+        session: AsyncSession,
+        list_version: Optional[Tuple[Optional[datetime], int]] = None,
+    ) -> RenderedResponse:
+        """
+        One rendered page of a user's tracks, newest first, read through the
+        tracks cache. ``list_version`` skips the version query when the caller
+        already ran it. Concurrent identical requests share one read.
+        """
+
+        async def load() -> bytes:
+            rendered = await self._render_track_page(
+                user_id=user_id,
+                limit=limit,
+                cursor=cursor,
+                fields=fields,
+                session=session,
+                list_version=list_version,
+            )
+            return rendered.encode()
+
+        data = await self.tracks_flight.do(
+            key=(user_id, "list", limit, cursor, tuple(fields)),
+            fn=lambda: self.tracks_cache.get_or_load(
+                owner_id=user_id,
+                key=self._page_cache_key(limit=limit, cursor=cursor, fields=fields),
+                loader=load,
+            ),
+        )
+        return RenderedResponse.decode(data=data)
+
+    async def find_cached_track_page(
+        self, user_id: str, limit: int, cursor: Optional[str], fields: Sequence[str]
+    ) -> Optional[RenderedResponse]:
+        """A page already in the tracks cache, or None (nothing is loaded)"""
+        data = await self.tracks_cache.get(
+            owner_id=user_id,
+            key=self._page_cache_key(limit=limit, cursor=cursor, fields=fields),
+        )
+        return RenderedResponse.decode(data=data) if data is not None else None
+
+    @staticmethod
+    def _page_cache_key(
+        limit: int, cursor: Optional[str], fields: Sequence[str]
+    ) -> str:
+        return f"list:{limit}:{cursor or ''}:{','.join(fields)}"
+
+    async def get_list_version(
+        self, user_id: str, session: AsyncSession
+    ) -> Tuple[Optional[datetime], int]:
+        """
+        The latest updated_at and count of a user's tracks, for validating
+        conditional list requests. Concurrent requests share one query.
+        """
+        return await self.tracks_flight.do(
+            key=(user_id, "list_version"),
+            fn=lambda: TracksRepository.find_list_version(
+                user_id=user_id, session=session
+            ),
+        )
+
+    async def _render_track_page(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str],
+        fields: Sequence[str],
+        session: AsyncSession,
+        list_version: Optional[Tuple[Optional[datetime], int]],
+    ) -> RenderedResponse:
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor=cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+                )
+
+        if list_version is None:
+            list_version = await TracksRepository.find_list_version(
+                user_id=user_id, session=session
+            )
+        last_updated_at, count = list_version
+
+        row_fields = [field for field in fields if field != "articles"]
+        rows = await self.tracks_repository.find_page_by_user_id(
+            user_id=user_id,
+            session=session,
+            limit=limit,
+            fields=row_fields,
+            after=after,
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(
+                updated_at=rows[-1]["updated_at"], track_id=rows[-1]["id"]
+            )
+
+        items = [{field: row[field] for field in row_fields} for row in rows]
+        if "articles" in fields:
+            articles_by_track = (
+                await self.track_items_repository.find_articles_by_track_ids(
+                    track_ids=[item["id"] for item in items], session=session
+                )
+            )
+            for item in items:
+                item["articles"] = articles_by_track[item["id"]]
+            # Keep the response model's field order
+            items = [{field: item[field] for field in fields} for item in items]
+
+        return RenderedResponse.render(
+            content={"items": items, "next_cursor": next_cursor},
+            etag=make_list_etag(
+                last_updated_at=last_updated_at,
+                count=count,
+                params=[limit, cursor, ",".join(fields)],
+            ),
+            last_modified=last_updated_at,
+        )
+
+    async def search_tracks(
+        self,
+        user_id: str,
+        query: str,
+        limit: int,
+        cursor: Optional[str],
+        session: AsyncSession,
+    ) -> TrackSearchPage:
+        """
+        One page of a user's tracks matching ``query``, best match first. If
+        nothing matches as typed, the query is spelling-corrected against the
+        user's search vocabulary and the corrected query is searched instead;
+        it is only reported when it matched.
+        """
+        after = None
+        corrected_query = None
+        if cursor:
+            try:
+                score, track_id, corrected_query = decode_search_cursor(cursor=cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+                )
+            after = (score, track_id)
+
+        rows = await self.track_search_repository.search(
+            user_id=user_id,
+            query=corrected_query or query,
+            limit=limit,
+            after=after,
+            session=session,
+        )
+        if not rows and after is None:
+            corrected_query = await self.track_search_repository.correct_query(
+                user_id=user_id, query=query, session=session
+            )
+            if corrected_query:
+                rows = await self.track_search_repository.search(
+                    user_id=user_id,
+                    query=corrected_query,
+                    limit=limit,
+                    session=session,
+                )
+                if not rows:
+                    corrected_query = None
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_search_cursor(
+                score=rows[-1]["score"],
+                track_id=rows[-1]["id"],
+                corrected_query=corrected_query,
+            )
+
+        return TrackSearchPage(
+            items=[
+                TrackSearchResult(
+                    id=row["id"],
+                    title=row["title"],
+                    description=row["description"],
+                    updated_at=row["updated_at"],
+                    score=row["score"],
+                    snippet=self._highlight(snippet=row["snippet"]),
+                )
+                for row in rows
+            ],
+            next_cursor=next_cursor,
+            corrected_query=corrected_query,
+        )
+
+    @staticmethod
+    def _highlight(snippet: Optional[str]) -> Optional[str]:
+        # Escape the text first so only our own markup reaches the client
+        if not snippet:
+            return None
+        return (
+            html.escape(snippet)
+            .replace(HIGHLIGHT_START, "<mark>")
+            .replace(HIGHLIGHT_STOP, "</mark>")
+        )
+
+    async def get_track_response(
+        self, track_id: str, user_id: str, session: AsyncSession
+    ) -> RenderedResponse:
+        """
+        A rendered track with its articles, read through the tracks cache.
+        Concurrent requests for the same track share one read.
+        """
+
+        async def load() -> bytes:
+            track = await self.get_track_content(
+                track_id=track_id, user_id=user_id, session=session
+            )
+            rendered = RenderedResponse.render(
+                content=track,
+                etag=make_track_etag(updated_at=track["updated_at"]),
+                last_modified=track["updated_at"],
+            )
+            return rendered.encode()
+
+        data = await self.tracks_flight.do(
+            key=(user_id, "track", track_id),
+            fn=lambda: self.tracks_cache.get_or_load(
+                owner_id=user_id, key=f"track:{track_id}", loader=load
+            ),
+        )
+        return RenderedResponse.decode(data=data)
+
+    async def find_cached_track_response(
+        self, track_id: str, user_id: str
+    ) -> Optional[RenderedResponse]:
+        """A rendered track already in the tracks cache, or None (nothing is loaded)"""
+        data = await self.tracks_cache.get(owner_id=user_id, key=f"track:{track_id}")
+        return RenderedResponse.decode(data=data) if data is not None else None
+
+    async def get_track_content(
+        self, track_id: str, user_id: str, session: AsyncSession
+    ) -> Dict[str, Any]:
+        """Get a track with its articles as a trusted TrackResponse-shaped dict"""
+        track = await TracksRepository.find_row_by_id_and_user_id(
+            track_id=track_id, user_id=user_id, session=session
+        )
+
+        if not track:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Track not found"
+            )
+
+        articles = await self.track_items_repository.find_articles_by_track_ids(
+            track_ids=[track_id], session=session
+        )
+        return track_to_dict(track=track, articles=articles[track_id])
 
     async def create_track(
         self, track_data: TrackCreate, user_id: str, session: AsyncSession
-    ) -> Track:
-        """Create a new track with business logic"""
+    ) -> TrackResponse:
+        """
+        Create a new track, with article metadata resolved from Wikipedia:
+        before responding, or by an ``enrich_track`` job committed with the
+        track, which updates the articles when Wikipedia has answered
+        """
         track = Track(
             title=track_data.title,
             description=track_data.description,
             user_id=user_id,
-            articles=[article.model_dump() for article in track_data.articles],
+            visibility=track_data.visibility,
+        )
+        if TRACK_ENRICHMENT == "inline":
+            articles = await self.enrich_articles(
+                articles=track_data.articles, session=session
+            )
+        else:
+            articles = track_data.articles
+            await enqueue(
+                kind="enrich_track",
+                payload={"track_id": track.id, "user_id": user_id},
+                session=session,
+            )
+        items = TrackItemsRepository.build_items(track_id=track.id, articles=articles)
+        track.article_count = len(items)
+        track.completed_count = sum(item.completed for item in items)
+        # Captured before the commit expires the item objects
+        articles = [item.to_article() for item in items]
+
+        track = await self.tracks_repository.create(
+            track=track, items=items, session=session
+        )
+        await self._invalidate_reads(user_id=user_id)
+        return TrackResponse(
+            id=track.id,
+            user_id=track.user_id,
+            title=track.title,
+            description=track.description,
+            articles=articles,
+            created_at=track.created_at,
+            updated_at=track.updated_at,
+            visibility=track.visibility,
+        )
+
+    async def join_track(
+        self, track_id: str, user_id: str, session: AsyncSession
+    ) -> TrackResponse:
+        """
+        Copy another user's public track, articles unread, into the user's
+        tracks, and count the join towards the source track's popularity
+        """
+        source = await TracksRepository.find_public_row(
+            track_id=track_id, session=session
+        )
+        if not source or source["user_id"] == user_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Track not found"
+            )
+        if await TracksRepository.find_joined_copy_id(
+            source_track_id=track_id, user_id=user_id, session=session
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="Track already joined"
+            )
+
+        articles = await self.track_items_repository.find_articles_by_track_ids(
+            track_ids=[track_id], session=session
+        )
+        track = Track(
+            title=source["title"],
+            description=source["description"],
+            user_id=user_id,
+            source_track_id=track_id,
         )
-        return await self.tracks_repository.create(track=track, session=session)
+        items = TrackItemsRepository.build_items(
+            track_id=track.id,
+            articles=[
+                WikipediaArticle.model_validate(
+                    {**article, "id": None, "completed": False}
+                )
+                for article in articles[track_id]
+            ],
+        )
+        track.article_count = len(items)
+        articles = [item.to_article() for item in items]
+
+        await self.trending_repository.record(
+            track_id=track_id,
+            user_id=user_id,
+            kind="join",
+            weight=JOIN_WEIGHT,
+            session=session,
+        )
+        try:
+            track = await self.tracks_repository.create(
+                track=track, items=items, session=session
+            )
+        except IntegrityError:
+            # A concurrent join of the same track won the unique index
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="Track already joined"
+            )
+        await self._invalidate_reads(user_id=user_id)
+        return TrackResponse(
+            id=track.id,
+            user_id=track.user_id,
+            title=track.title,
+            description=track.description,
+            articles=articles,
+            created_at=track.created_at,
+            updated_at=track.updated_at,
+            visibility=track.visibility,
+            source_track_id=track.source_track_id,
+        )
+
+    async def import_tracks(
+        self, raw_tracks: Sequence[Any], user_id: str, session: AsyncSession
+    ) -> BulkImportResponse:
+        """
+        Create many tracks at once.
+
+        Every entry is validated on its own; invalid ones are reported by index
+        and skipped, and all valid tracks and their items are written in one
+        transaction with multi-row inserts instead of one round-trip per row.
+        """
+        if len(raw_tracks) > BULK_IMPORT_MAX_TRACKS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {BULK_IMPORT_MAX_TRACKS} tracks per import",
+            )
+
+        now = datetime.utcnow()
+        track_rows = []
+        item_rows = []
+        errors = []
+        for index, raw_track in enumerate(raw_tracks):
+            try:
+                track_data = TrackCreate.model_validate(raw_track)
+            except ValidationError as e:
+                errors.append(
+                    BulkImportError(
+                        index=index,
+                        errors=e.errors(include_url=False, include_context=False),
+                    )
+                )
+                continue
+
+            track_id = str(uuid.uuid4())
+            track_rows.append(
+                {
+                    "id": track_id,
+                    "user_id": user_id,
+                    "title": track_data.title,
+                    "description": track_data.description,
+                    "visibility": track_data.visibility,
+                    "article_count": len(track_data.articles),
+                    "completed_count": sum(
+                        article.completed for article in track_data.articles
+                    ),
+                    "last_activity_at": now,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            for position, article in enumerate(track_data.articles, start=1):
+                item_rows.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "track_id": track_id,
+                        "position": position * POSITION_GAP,
+                        "title": article.title,
+                        "url": article.url,
+                        "description": article.description,
+                        "completed": article.completed,
+                        "completed_at": now if article.completed else None,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+
+        await self.tracks_repository.bulk_create(
+            tracks=track_rows, items=item_rows, session=session
+        )
+        await self._invalidate_reads(user_id=user_id)
+        return BulkImportResponse(
+            created=[row["id"] for row in track_rows], errors=errors
+        )
+
+    async def export_tracks(
+        self, user_id: str, session: AsyncSession
+    ) -> AsyncIterator[bytes]:
+        """Yield a user's tracks as NDJSON lines, one track per line"""
+        async for track, items in self.tracks_repository.stream_with_items(
+            user_id=user_id, session=session
+        ):
+            yield dumps_line(
+                content=track_to_dict(
+                    track=track,
+                    articles=[
+                        article_to_dict(row=item, prefix="item_") for item in items
+                    ],
+                )
+            )
+
+    async def enrich_articles(
+        self, articles: Sequence[WikipediaArticle], session: AsyncSession
+    ) -> List[WikipediaArticle]:
+        """
+        Replace client-supplied URLs and descriptions with Wikipedia's canonical
+        ones. Articles that can't be resolved are kept as sent.
+        """
+        pages = await self.wikipedia_service.resolve(
+            titles=[article.title for article in articles], session=session
+        )
+        enriched = []
+        for article in articles:
+            page = pages.get(article.title)
+            if page is not None:
+                article = article.model_copy(
+                    update={
+                        "url": page.url,
+                        "description": page.description or article.description,
+                    }
+                )
+            enriched.append(article)
+        return enriched
+
+    async def enrich_track(self, payload: Dict[str, Any]) -> None:
+        """
+        The ``enrich_track`` job: replace a track's article URLs and
+        descriptions with Wikipedia's. Idempotent; raises (and is retried)
+        while titles can't be looked up.
+        """
+        track_id = payload["track_id"]
+        user_id = payload["user_id"]
+        async with new_session() as session:
+            items = await self.track_items_repository.find_by_track_ids(
+                track_ids=[track_id], session=session
+            )
+            if not items[track_id]:
+                return
+            pages = await self.wikipedia_service.resolve(
+                titles=[item.title for item in items[track_id]],
+                session=session,
+                require_all=True,
+            )
+            changes = []
+            for item in items[track_id]:
+                page = pages.get(item.title)
+                if page is None:
+                    continue
+                description = page.description or item.description
+                if page.url != item.url or description != item.description:
+                    changes.append(
+                        {"id": item.id, "url": page.url, "description": description}
+                    )
+            if not changes:
+                return
+
+            # The track may have been deleted meanwhile
+            if (
+                await TracksRepository.touch(
+                    track_id=track_id, user_id=user_id, session=session
+                )
+                is None
+            ):
+                return
+            await self.track_items_repository.update_metadata(
+                values=changes, session=session
+            )
+            await session.commit()
+        await self._invalidate_reads(user_id=user_id)
 
     async def update_track(
         self,
@@ -30,7 +660,7 @@ class TracksService:
         track_data: TrackUpdate,
         user_id: str,
         session: AsyncSession,
-    ) -> Track:
+    ) -> TrackResponse:
         """Update a track with business logic and validation"""
         track = await TracksRepository.find_by_id_and_user_id(
             track_id=track_id, user_id=user_id, session=session
@@ -46,12 +676,173 @@ class TracksService:
             track.title = track_data.title
         if track_data.description is not None:
             track.description = track_data.description
+        if track_data.visibility is not None:
+            track.visibility = track_data.visibility
+            if track_data.visibility == "private":
+                await self.trending_repository.remove(
+                    track_id=track.id, session=session
+                )
+        newly_completed: List[TrackItem] = []
         if track_data.articles is not None:
-            track.articles = [article.model_dump() for article in track_data.articles]
+            previous = await self.track_items_repository.find_by_track_ids(
+                track_ids=[track.id], session=session
+            )
+            # Articles are matched to the items they replace by id, or by
+            # title when the client sent none
+            was_completed = {item.id: item.completed for item in previous[track.id]}
+            was_completed_by_title = {
+                item.title: item.completed for item in previous[track.id]
+            }
+            items = await self.track_items_repository.replace_all(
+                track_id=track.id, articles=track_data.articles, session=session
+            )
+            for article, item in zip(track_data.articles, items):
+                if not article.completed:
+                    continue
+                if article.id in was_completed:
+                    completed_before = was_completed[article.id]
+                else:
+                    # New articles added already completed don't count
+                    completed_before = was_completed_by_title.get(article.title, True)
+                if not completed_before:
+                    newly_completed.append(item)
+            track.article_count = len(track_data.articles)
+            track.completed_count = sum(
+                article.completed for article in track_data.articles
+            )
 
         track.updated_at = datetime.utcnow()
+        if track_data.articles is not None:
+            track.last_activity_at = track.updated_at
+        for item in newly_completed:
+            await self._record_completion(item=item, user_id=user_id, session=session)
+
+        track = await TracksRepository.update(track=track, session=session)
+        await self._invalidate_reads(user_id=user_id)
+        responses = await self.build_responses(tracks=[track], session=session)
+        return responses[0]
+
+    async def patch_track(
+        self,
+        track_id: str,
+        patch: TrackPatch,
+        user_id: str,
+        session: AsyncSession,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> TrackResponse:
+        """
+        Apply a partial update in one transaction.
 
-        return await TracksRepository.update(track=track, session=session)
+        The track row is updated first, conditionally on ``expected_updated_at``
+        when the client sent a precondition, so a concurrent edit makes the
+        whole patch fail with 412 instead of being silently overwritten. Each
+        article operation is then a targeted write on a single item row.
+        """
+        values = patch.model_dump(
+            include={"title", "description", "visibility"}, exclude_none=True
+        )
+        updated_at = await TracksRepository.touch(
+            track_id=track_id,
+            user_id=user_id,
+            session=session,
+            values=values,
+            expected_updated_at=expected_updated_at,
+        )
+        if updated_at is None:
+            await session.rollback()
+            if expected_updated_at is not None and await TracksRepository.exists(
+                track_id=track_id, user_id=user_id, session=session
+            ):
+                raise HTTPException(
+                    status_code=status.HTTP_412_PRECONDITION_FAILED,
+                    detail="Track was modified by another request",
+                )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Track not found"
+            )
+
+        if patch.visibility == "private":
+            await self.trending_repository.remove(track_id=track_id, session=session)
+
+        for position, operation in enumerate(patch.operations):
+            applied = await self._apply_operation(
+                track_id=track_id,
+                operation=operation,
+                user_id=user_id,
+                session=session,
+            )
+            if not applied:
+                await session.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Operation {position} ({operation.op}) matched no article",
+                )
+
+        await session.commit()
+        await self._invalidate_reads(user_id=user_id)
+        return await self.get_track(track_id=track_id, user_id=user_id, session=session)
+
+    async def _apply_operation(
+        self,
+        track_id: str,
+        operation: TrackOperation,
+        user_id: str,
+        session: AsyncSession,
+    ) -> bool:
+        """Apply one article operation, returning False if it matched no item"""
+        if isinstance(operation, InsertOperation):
+            article = operation.article
+            await self.track_items_repository.add_item(
+                track_id=track_id,
+                values={
+                    "title": article.title,
+                    "url": article.url,
+                    "description": article.description,
+                    "completed": article.completed,
+                    "completed_at": datetime.utcnow() if article.completed else None,
+                },
+                index=operation.index,
+                session=session,
+            )
+            await TracksRepository.add_progress(
+                track_id=track_id,
+                articles=1,
+                completed=int(article.completed),
+                session=session,
+            )
+            return True
+
+        if operation.index is None and operation.title is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{operation.op} needs an index or a title",
+            )
+        item_id = TrackItemsRepository.target_item_id(
+            track_id=track_id, index=operation.index, title=operation.title
+        )
+
+        if isinstance(operation, SetCompletedOperation):
+            item = await self._set_completed(
+                track_id=track_id,
+                item_id=item_id,
+                completed=operation.completed,
+                user_id=user_id,
+                session=session,
+            )
+            return item is not None
+        if isinstance(operation, MoveOperation):
+            item = await self.track_items_repository.move_item(
+                track_id=track_id,
+                item_id=item_id,
+                index=operation.to_index,
+                session=session,
+            )
+            return item is not None
+        if isinstance(operation, RemoveOperation):
+            return await self._remove_item(
+                track_id=track_id, item_id=item_id, session=session
+            )
+        raise ValueError(f"Unsupported operation: {operation.op}")
 
     async def delete_track(
         self, track_id: str, user_id: str, session: AsyncSession
@@ -67,3 +858,188 @@ class TracksService:
             )
 
         await TracksRepository.delete(track=track, session=session)
+        await self._invalidate_reads(user_id=user_id)
+
+    async def add_item(
+        self,
+        track_id: str,
+        item_data: TrackItemCreate,
+        user_id: str,
+        session: AsyncSession,
+    ) -> TrackItemResponse:
+        """Add one article to a track"""
+        await self._touch_track(track_id=track_id, user_id=user_id, session=session)
+        item = await self.track_items_repository.add_item(
+            track_id=track_id,
+            values={
+                "title": item_data.title,
+                "url": item_data.url,
+                "description": item_data.description,
+                "completed": item_data.completed,
+                "completed_at": datetime.utcnow() if item_data.completed else None,
+            },
+            index=item_data.index,
+            session=session,
+        )
+        await TracksRepository.add_progress(
+            track_id=track_id,
+            articles=1,
+            completed=int(item_data.completed),
+            session=session,
+        )
+        response = TrackItemResponse.model_validate(item, from_attributes=True)
+        await session.commit()
+        await self._invalidate_reads(user_id=user_id)
+        return response
+
+    async def update_item(
+        self,
+        track_id: str,
+        item_id: str,
+        item_data: TrackItemUpdate,
+        user_id: str,
+        session: AsyncSession,
+    ) -> TrackItemResponse:
+        """Mark one article complete/incomplete and/or move it"""
+        await self._touch_track(track_id=track_id, user_id=user_id, session=session)
+
+        item = None
+        if item_data.index is not None:
+            item = await self.track_items_repository.move_item(
+                track_id=track_id,
+                item_id=item_id,
+                index=item_data.index,
+                session=session,
+            )
+            self._ensure_item_found(item=item)
+        if item_data.completed is not None:
+            item = await self._set_completed(
+                track_id=track_id,
+                item_id=item_id,
+                completed=item_data.completed,
+                user_id=user_id,
+                session=session,
+            )
+            self._ensure_item_found(item=item)
+        if item is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Nothing to update"
+            )
+
+        response = TrackItemResponse.model_validate(item, from_attributes=True)
+        await session.commit()
+        await self._invalidate_reads(user_id=user_id)
+        return response
+
+    async def delete_item(
+        self, track_id: str, item_id: str, user_id: str, session: AsyncSession
+    ) -> None:
+        """Remove one article from a track"""
+        await self._touch_track(track_id=track_id, user_id=user_id, session=session)
+        deleted = await self._remove_item(
+            track_id=track_id, item_id=item_id, session=session
+        )
+        if not deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Track item not found"
+            )
+        await session.commit()
+        await self._invalidate_reads(user_id=user_id)
+
+    async def _invalidate_reads(self, user_id: str) -> None:
+        """
+        Make reads after a write see it: bump the user's cache version, then
+        detach reads still in flight, which may have started before the write
+        """
+        await self.tracks_cache.invalidate(owner_id=user_id)
+        self.tracks_flight.forget(owner_id=user_id)
+
+    async def _touch_track(
+        self, track_id: str, user_id: str, session: AsyncSession
+    ) -> None:
+        """Bump the track's updated_at, 404ing if the user doesn't own it"""
+        updated_at = await TracksRepository.touch(
+            track_id=track_id, user_id=user_id, session=session
+        )
+        if updated_at is None:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Track not found"
+            )
+
+    async def _set_completed(
+        self,
+        track_id: str,
+        item_id: Any,
+        completed: bool,
+        user_id: str,
+        session: AsyncSession,
+    ) -> Optional[TrackItem]:
+        """
+        Mark an item complete/incomplete and, if that changed it, update the
+        track's progress and record the completion
+        """
+        item, changed = await self.track_items_repository.set_completed(
+            track_id=track_id, item_id=item_id, completed=completed, session=session
+        )
+        if not changed:
+            return item
+        await TracksRepository.add_progress(
+            track_id=track_id,
+            completed=1 if completed else -1,
+            active_at=item.completed_at,
+            session=session,
+        )
+        if completed:
+            await self._record_completion(item=item, user_id=user_id, session=session)
+        return item
+
+    async def _remove_item(
+        self, track_id: str, item_id: Any, session: AsyncSession
+    ) -> bool:
+        """Delete an item and take it out of the track's progress"""
+        was_completed = await self.track_items_repository.delete_item(
+            track_id=track_id, item_id=item_id, session=session
+        )
+        if was_completed is None:
+            return False
+        await TracksRepository.add_progress(
+            track_id=track_id,
+            articles=-1,
+            completed=-int(was_completed),
+            session=session,
+        )
+        return True
+
+    async def _record_completion(
+        self, item: TrackItem, user_id: str, session: AsyncSession
+    ) -> None:
+        """
+        Log a completed article for the user's streak, and count it towards
+        its public track's popularity
+        """
+        await self.progress_repository.record_completion(
+            user_id=user_id,
+            track_id=item.track_id,
+            item_id=item.id,
+            completed_at=item.completed_at,
+            session=session,
+        )
+        await self.trending_repository.record_for_track(
+            track_id=item.track_id,
+            user_id=user_id,
+            kind="complete",
+            weight=COMPLETION_WEIGHT,
+            session=session,
+        )
+
+    @staticmethod
+    def _ensure_item_found(item) -> None:
+        if item is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Track item not found"
+            )
+
+
+tracks_service = TracksService()
+task_runner.register(kind="enrich_track", handler=tracks_service.enrich_track)
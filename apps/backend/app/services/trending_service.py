@@ -0,0 +1,185 @@
+import asyncio
+import math
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from apps.backend.app.database import get_engine
+from apps.backend.app.logging_config import logger
+from apps.backend.app.metrics import registry
+from apps.backend.app.models.trending import TrendingPage, TrendingTrackItem
+from apps.backend.app.pagination import decode_score_cursor, encode_score_cursor
+from apps.backend.app.repositories.trending_repository import TrendingRepository
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Activity loses half its weight every TRENDING_HALF_LIFE_HOURS, and tracks
+# without activity for TRENDING_WINDOW_DAYS drop out of the ranking
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "72"))
+TRENDING_WINDOW_DAYS = float(os.getenv("TRENDING_WINDOW_DAYS", "14"))
+# 0 disables the background refresh (e.g. when another process runs it)
+TRENDING_REFRESH_SECONDS = float(os.getenv("TRENDING_REFRESH_SECONDS", "60"))
+TRENDING_REFRESH_BATCH_SIZE = int(os.getenv("TRENDING_REFRESH_BATCH_SIZE", "5000"))
+JOIN_WEIGHT = 3.0
+COMPLETION_WEIGHT = 1.0
+# Scores are relative to this instant; any fixed point works
+SCORE_EPOCH = datetime(2025, 1, 1)
+
+trending_refresh_duration = registry.histogram(
+    "trending_refresh_duration_seconds", "Duration of trending ranking refreshes"
+)
+trending_activity_ranked = registry.counter(
+    "trending_activity_ranked_total",
+    "Track activity rows folded into the trending ranking",
+)
+
+
+def activity_score(weight: float, at: datetime) -> float:
+    """ln(weight * 2^((at - epoch) / half-life)), one activity's log-domain score"""
+    half_lives = (at - SCORE_EPOCH).total_seconds() / (TRENDING_HALF_LIFE_HOURS * 3600)
+    return math.log(weight) + half_lives * math.log(2)
+
+
+def add_scores(a: float, b: float) -> float:
+    """Sum of two log-domain scores, ln(e^a + e^b)"""
+    return max(a, b) + math.log1p(math.exp(-abs(a - b)))
+
+
+@dataclass
+class RefreshResult:
+    activity: int
+    tracks: int
+    pruned: int
+    seconds: float
+
+
+class TrendingService:
+    """Service for the trending feed and its precomputed ranking"""
+
+    def __init__(self):
+        self.trending_repository = TrendingRepository()
+
+    async def get_page(
+        self, limit: int, cursor: Optional[str], session: AsyncSession
+    ) -> TrendingPage:
+        """One page of trending public tracks, most popular first"""
+        after = None
+        if cursor:
+            try:
+                after = decode_score_cursor(cursor=cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+                )
+
+        rows = await self.trending_repository.find_page(
+            limit=limit, after=after, session=session
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_score_cursor(
+                score=rows[-1]["score"], track_id=rows[-1]["id"]
+            )
+        return TrendingPage(
+            items=[TrendingTrackItem.model_validate(dict(row)) for row in rows],
+            next_cursor=next_cursor,
+        )
+
+    async def refresh(self, session: AsyncSession) -> RefreshResult:
+        """
+        Fold all unranked activity into the ranking, one batch per
+        transaction, then drop tracks that have gone quiet. Only new activity
+        is read: a track's score grows by its new activity's scores, and
+        decay needs no rewrite because all scores share one epoch.
+        """
+        start = time.perf_counter()
+        activity = 0
+        tracks = 0
+        while True:
+            rows = await self.trending_repository.claim_unranked(
+                limit=TRENDING_REFRESH_BATCH_SIZE, session=session
+            )
+            if not rows:
+                break
+
+            scores: Dict[str, Tuple[float, datetime]] = {}
+            for row in rows:
+                score = activity_score(weight=row["weight"], at=row["created_at"])
+                last_activity_at = row["created_at"]
+                if row["track_id"] in scores:
+                    previous, previous_at = scores[row["track_id"]]
+                    score = add_scores(a=previous, b=score)
+                    last_activity_at = max(previous_at, last_activity_at)
+                scores[row["track_id"]] = (score, last_activity_at)
+
+            tracks += await self.trending_repository.add_scores(
+                scores=scores,
+                activity_ids=[row["id"] for row in rows],
+                session=session,
+            )
+            await session.commit()
+            activity += len(rows)
+            if len(rows) < TRENDING_REFRESH_BATCH_SIZE:
+                break
+
+        pruned = await self.trending_repository.prune(
+            inactive_since=datetime.utcnow() - timedelta(days=TRENDING_WINDOW_DAYS),
+            session=session,
+        )
+        await session.commit()
+
+        seconds = time.perf_counter() - start
+        trending_refresh_duration.observe(seconds)
+        trending_activity_ranked.inc(amount=activity)
+        return RefreshResult(
+            activity=activity, tracks=tracks, pruned=pruned, seconds=seconds
+        )
+
+
+class TrendingRefresher:
+    """Runs TrendingService.refresh every ``interval`` seconds in the background"""
+
+    def __init__(self, service: TrendingService, interval: float):
+        self.service = service
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="trending-refresh")
+
+    async def stop(self) -> None:
+        """Cancel the loop; a refresh in progress rolls back its current batch"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                async with AsyncSession(get_engine()) as session:
+                    result = await self.service.refresh(session=session)
+                if result.activity or result.pruned:
+                    logger.info(
+                        f"Trending refresh: {result.activity} activity rows, "
+                        f"{result.tracks} tracks updated, {result.pruned} pruned "
+                        f"in {result.seconds:.3f}s"
+                    )
+            except Exception as e:
+                logger.error(f"Trending refresh failed: {e}", exc_info=True)
+
+
+trending_service = TrendingService()
+trending_refresher = TrendingRefresher(
+    service=trending_service, interval=TRENDING_REFRESH_SECONDS
+)
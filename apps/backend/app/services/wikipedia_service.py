@@ -0,0 +1,260 @@
+import asyncio
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import httpx
+from apps.backend.app.database import get_engine
+from apps.backend.app.logging_config import logger
+from apps.backend.app.models.wikipedia import WikipediaPage
+from apps.backend.app.repositories.wikipedia_pages_repository import (
+    WikipediaPagesRepository,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+WIKIPEDIA_API_URL = os.getenv("WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+WIKIPEDIA_CACHE_TTL_SECONDS = int(os.getenv("WIKIPEDIA_CACHE_TTL_SECONDS", "604800"))
+WIKIPEDIA_TIMEOUT_SECONDS = float(os.getenv("WIKIPEDIA_TIMEOUT_SECONDS", "5"))
+WIKIPEDIA_MAX_CONNECTIONS = int(os.getenv("WIKIPEDIA_MAX_CONNECTIONS", "10"))
+
+# The MediaWiki API accepts at most 50 titles per query
+MAX_TITLES_PER_REQUEST = 50
+# Result of a shared lookup whose fetch failed, unlike None (no such page)
+FETCH_FAILED = object()
+
+USER_AGENT = "ProjectVista/1.0 (https://github.com/project-vista-org/project-vista)"
+
+
+@dataclass(frozen=True)
+class PageMetadata:
+    page_id: int
+    title: str
+    url: str
+    description: Optional[str] = None
+
+
+class WikipediaUnavailableError(Exception):
+    """Some titles couldn't be looked up (as opposed to not having a page)"""
+
+
+def normalize_title(title: str) -> str:
+    """Apply MediaWiki's title normalization, so equivalent titles share a key"""
+    title = " ".join(title.replace("_", " ").split())
+    return title[:1].upper() + title[1:]
+
+
+class WikipediaService:
+    """
+    Resolves article titles to canonical Wikipedia metadata.
+
+    Lookups go through a database cache (misses included) with a TTL, then
+    through one pooled HTTP client in batches of up to 50 titles. Concurrent
+    lookups of the same title share a single in-flight request.
+    """
+
+    def __init__(
+        self,
+        api_url: str = WIKIPEDIA_API_URL,
+        cache_ttl_seconds: int = WIKIPEDIA_CACHE_TTL_SECONDS,
+        timeout_seconds: float = WIKIPEDIA_TIMEOUT_SECONDS,
+        max_connections: int = WIKIPEDIA_MAX_CONNECTIONS,
+    ):
+        self.api_url = api_url
+        self.cache_ttl = timedelta(seconds=cache_ttl_seconds)
+        self.timeout_seconds = timeout_seconds
+        self.max_connections = max_connections
+        self.pages_repository = WikipediaPagesRepository()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                headers={"User-Agent": USER_AGENT},
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def resolve(
+        self, titles: Iterable[str], session: AsyncSession, require_all: bool = False
+    ) -> Dict[str, PageMetadata]:
+        """
+        Metadata for each title that has a Wikipedia page, keyed by the title
+        as given. Titles without a page, or that couldn't be fetched, are left
+        out so callers can fall back to what they already have; with
+        ``require_all``, titles that couldn't be fetched raise
+        WikipediaUnavailableError instead (after the others are cached).
+        """
+        keys = {title: normalize_title(title) for title in titles}
+        unique_keys = sorted(set(keys.values()))
+
+        fetched_after = datetime.utcnow() - self.cache_ttl
+        cached = await self.pages_repository.find_fresh(
+            titles=unique_keys, fetched_after=fetched_after, session=session
+        )
+        resolved: Dict[str, Optional[PageMetadata]] = {
+            key: self._to_metadata(page=page) for key, page in cached.items()
+        }
+
+        missing = [key for key in unique_keys if key not in cached]
+        if missing:
+            resolved.update(await self._fetch_shared(keys=missing))
+            failed = [key for key in missing if key not in resolved]
+            if require_all and failed:
+                raise WikipediaUnavailableError(
+                    f"{len(failed)} of {len(unique_keys)} titles couldn't be fetched"
+                )
+
+        return {
+            title: resolved[key]
+            for title, key in keys.items()
+            if resolved.get(key) is not None
+        }
+
+    async def _fetch_shared(
+        self, keys: Sequence[str]
+    ) -> Dict[str, Optional[PageMetadata]]:
+        """
+        Fetch titles, joining lookups already in flight for any of them.
+        Titles that couldn't be fetched are left out.
+        """
+        loop = asyncio.get_running_loop()
+        waiting = {key: self._in_flight[key] for key in keys if key in self._in_flight}
+        owned = {key: loop.create_future() for key in keys if key not in waiting}
+        self._in_flight.update(owned)
+
+        results: Dict[str, Optional[PageMetadata]] = {}
+        try:
+            if owned:
+                results.update(await self._fetch(titles=list(owned)))
+        finally:
+            for key, future in owned.items():
+                if not future.done():
+                    future.set_result(results.get(key, FETCH_FAILED))
+                self._in_flight.pop(key, None)
+
+        if owned:
+            await self._store(fetched=results)
+        for key, future in waiting.items():
+            # Shielded: a cancelled waiter mustn't cancel the owner's lookup
+            result = await asyncio.shield(future)
+            if result is not FETCH_FAILED:
+                results[key] = result
+        return results
+
+    async def _fetch(self, titles: List[str]) -> Dict[str, Optional[PageMetadata]]:
+        """
+        Query the MediaWiki API in batches. Titles Wikipedia reports as missing
+        map to None; titles from a failed batch are left out entirely.
+        """
+        batches = [
+            titles[start : start + MAX_TITLES_PER_REQUEST]
+            for start in range(0, len(titles), MAX_TITLES_PER_REQUEST)
+        ]
+        responses = await asyncio.gather(
+            *[self._fetch_batch(titles=batch) for batch in batches],
+            return_exceptions=True,
+        )
+
+        results: Dict[str, Optional[PageMetadata]] = {}
+        for batch, response in zip(batches, responses):
+            if isinstance(response, Exception):
+                logger.warning(
+                    f"Wikipedia batch of {len(batch)} titles failed: {response}"
+                )
+                continue
+            results.update(response)
+        return results
+
+    async def _fetch_batch(
+        self, titles: List[str]
+    ) -> Dict[str, Optional[PageMetadata]]:
+        response = await self.client.get(
+            self.api_url,
+            params={
+                "action": "query",
+                "format": "json",
+                "formatversion": "2",
+                "redirects": "1",
+                "prop": "info|description",
+                "inprop": "url",
+                "titles": "|".join(titles),
+            },
+        )
+        response.raise_for_status()
+        query = response.json().get("query", {})
+
+        # Follow the API's normalization and redirects back to what we asked for
+        renames = {
+            entry["from"]: entry["to"]
+            for entry in query.get("normalized", []) + query.get("redirects", [])
+        }
+        pages = {page["title"]: page for page in query.get("pages", [])}
+
+        results: Dict[str, Optional[PageMetadata]] = {}
+        for title in titles:
+            target = title
+            for _ in range(len(renames) + 1):
+                if target not in renames:
+                    break
+                target = renames[target]
+            page = pages.get(target)
+            if page is None or page.get("missing") or page.get("invalid"):
+                results[title] = None
+                continue
+            results[title] = PageMetadata(
+                page_id=page["pageid"],
+                title=page["title"],
+                url=page.get("canonicalurl") or page.get("fullurl"),
+                description=page.get("description"),
+            )
+        return results
+
+    async def _store(self, fetched: Dict[str, Optional[PageMetadata]]) -> None:
+        """
+        Write fetched pages (and misses) to the cache; failures are only logged.
+        Uses its own session, so the caller's transaction is left alone.
+        """
+        now = datetime.utcnow()
+        pages = []
+        for key, metadata in sorted(fetched.items()):
+            page = WikipediaPage(title=key, fetched_at=now)
+            if metadata is not None:
+                page.page_id = metadata.page_id
+                page.canonical_title = metadata.title
+                page.url = metadata.url
+                page.description = metadata.description
+            pages.append(page)
+        if not pages:
+            return
+        try:
+            async with AsyncSession(get_engine()) as session:
+                await self.pages_repository.upsert_many(pages=pages, session=session)
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to cache Wikipedia pages: {e}")
+
+    @staticmethod
+    def _to_metadata(page: WikipediaPage) -> Optional[PageMetadata]:
+        if page.page_id is None:
+            return None
+        return PageMetadata(
+            page_id=page.page_id,
+            title=page.canonical_title,
+            url=page.url,
+            description=page.description,
+        )
+
+
+wikipedia_service = WikipediaService()
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from apps.backend.app.metrics import registry
+
+T = TypeVar("T")
+
+single_flight_calls = registry.counter(
+    "single_flight_calls_total",
+    "Calls through a single-flight group, by whether they ran the computation "
+    "(leader) or shared a concurrent one (coalesced)",
+    label_names=("flight", "result"),
+)
+
+
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one in-flight computation.
+
+    The first caller for a key (the leader) runs the computation; callers
+    arriving while it runs await the same result or exception instead of
+    repeating the work. Nothing is kept once the computation finishes, so
+    this only merges bursts of identical calls; caching is left to callers.
+
+    Keys are tuples that start with the owner's id. ``forget`` detaches an
+    owner's in-flight computations, so calls made after a write start afresh
+    instead of joining a read that began before it. Results are handed to
+    every caller as is, so computations should return immutable values.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[Tuple[Hashable, ...], asyncio.Future] = {}
+
+    async def do(self, key: Tuple[Hashable, ...], fn: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                break
+            try:
+                result = await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                # The leader was cancelled (e.g. its client went away); take
+                # over unless this call is the one being cancelled
+                if flight.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+            single_flight_calls.inc(labels=(self.name, "coalesced"))
+            return result
+
+        single_flight_calls.inc(labels=(self.name, "leader"))
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        try:
+            result = await fn()
+            flight.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            # Nobody else may be waiting; don't warn about an unread exception
+            flight.exception()
+            raise
+        finally:
+            # forget() may have detached this flight and a newer one taken its key
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def forget(self, owner_id: Any) -> None:
+        """Detach the in-flight computations of ``owner_id``"""
+        for key in [key for key in self._flights if key[0] == owner_id]:
+            del self._flights[key]
+
+
+# Reads of a user's tracks; TracksService forgets a user's flights on writes
+tracks_flight = SingleFlight(name="tracks")
@@ -0,0 +1,342 @@
+"""
+Background task runner for work the client doesn't wait on.
+
+Jobs are rows in the ``jobs`` table, so they survive restarts and can be
+enqueued in the same transaction as the write that needs them. Each process
+runs a dispatcher that leases due jobs with FOR UPDATE SKIP LOCKED into a
+bounded in-process queue, and a pool of workers that run them. Failed jobs
+are retried with exponential backoff until they run out of attempts.
+"""
+
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from apps.backend.app.database import get_engine
+from apps.backend.app.logging_config import logger
+from apps.backend.app.metrics import Gauge, registry
+from apps.backend.app.models.job import Job
+from apps.backend.app.repositories.jobs_repository import JobsRepository
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Jobs run concurrently by this process; 0 only enqueues (another process
+# runs them)
+TASK_WORKERS = int(os.getenv("TASK_WORKERS", "4"))
+# Leased jobs waiting for a free worker in this process
+TASK_QUEUE_SIZE = int(os.getenv("TASK_QUEUE_SIZE", "100"))
+TASK_POLL_SECONDS = float(os.getenv("TASK_POLL_SECONDS", "1"))
+TASK_MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS", "5"))
+# Backoff before retry n is about base * 2^(n - 1), up to the maximum
+TASK_RETRY_BASE_SECONDS = float(os.getenv("TASK_RETRY_BASE_SECONDS", "2"))
+TASK_RETRY_MAX_SECONDS = float(os.getenv("TASK_RETRY_MAX_SECONDS", "300"))
+# How long a job may run before it's cancelled and another process may take it
+TASK_LEASE_SECONDS = float(os.getenv("TASK_LEASE_SECONDS", "300"))
+# How long shutdown waits for running jobs
+TASK_DRAIN_SECONDS = float(os.getenv("TASK_DRAIN_SECONDS", "20"))
+
+TaskHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+tasks_enqueued = registry.counter(
+    "tasks_enqueued_total", "Jobs added to the job table", label_names=("kind",)
+)
+tasks_finished = registry.counter(
+    "tasks_total",
+    "Job runs by outcome (done, retried or failed)",
+    label_names=("kind", "outcome"),
+)
+task_duration = registry.histogram(
+    "task_duration_seconds", "Time to run a job", label_names=("kind",)
+)
+task_queue_latency = registry.histogram(
+    "task_queue_latency_seconds",
+    "Time from a job being due to a worker starting it",
+    label_names=("kind",),
+)
+task_backlog = registry.gauge(
+    "task_backlog", "Due jobs in the job table not yet leased, as last seen"
+)
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter, so failing jobs don't retry in lockstep"""
+    delay = min(TASK_RETRY_BASE_SECONDS * 2 ** (attempts - 1), TASK_RETRY_MAX_SECONDS)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class TaskRunner:
+    """Leases jobs from the job table and runs them on a pool of workers"""
+
+    def __init__(
+        self,
+        workers: int = TASK_WORKERS,
+        queue_size: int = TASK_QUEUE_SIZE,
+        poll_interval: float = TASK_POLL_SECONDS,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.jobs_repository = JobsRepository()
+        self.handlers: Dict[str, TaskHandler] = {}
+        self.busy = 0
+        self._saturated = False
+        self._queue: Optional[asyncio.Queue] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._worker_tasks: List[asyncio.Task] = []
+
+    def register(self, kind: str, handler: TaskHandler) -> None:
+        """Run ``handler(payload)`` for jobs of ``kind``; it must be idempotent"""
+        self.handlers[kind] = handler
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        session: Optional[AsyncSession] = None,
+        delay_seconds: float = 0,
+        max_attempts: int = TASK_MAX_ATTEMPTS,
+    ) -> None:
+        """
+        Add a job. With ``session`` the job is written in the caller's
+        transaction and only exists once the caller commits; without it, it is
+        committed right away.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for task {kind!r}")
+        run_at = datetime.utcnow() + timedelta(seconds=delay_seconds)
+        if session is None:
+            async with AsyncSession(get_engine()) as own_session:
+                await self.jobs_repository.add(
+                    kind=kind,
+                    payload=payload,
+                    run_at=run_at,
+                    max_attempts=max_attempts,
+                    session=own_session,
+                )
+                await own_session.commit()
+            self._notify()
+        else:
+            await self.jobs_repository.add(
+                kind=kind,
+                payload=payload,
+                run_at=run_at,
+                max_attempts=max_attempts,
+                session=session,
+            )
+            if delay_seconds <= 0:
+                event.listen(
+                    session.sync_session,
+                    "after_commit",
+                    lambda _: self._notify(),
+                    once=True,
+                )
+        tasks_enqueued.inc(labels=(kind,))
+
+    def start(self) -> None:
+        if self.workers <= 0 or self._dispatcher is not None:
+            return
+        # Room for a shutdown sentinel per worker; the dispatcher fills it up
+        # to queue_size only
+        self._queue = asyncio.Queue(maxsize=max(self.queue_size, self.workers))
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._worker_tasks = [
+            asyncio.create_task(self._work(), name=f"task-worker-{index}")
+            for index in range(self.workers)
+        ]
+        self._dispatcher = asyncio.create_task(self._dispatch(), name="task-dispatcher")
+
+    async def stop(self, timeout: float = TASK_DRAIN_SECONDS) -> None:
+        """
+        Drain: stop leasing, hand queued jobs back to the table, and give
+        running jobs ``timeout`` seconds to finish. Jobs still running after
+        that are cancelled and retried once their lease runs out.
+        """
+        if self._dispatcher is None:
+            return
+        # Not cancelled: wait_for can swallow a cancellation that races with a
+        # wake-up, and a claim is left to finish so its jobs are released below
+        self._stopping = True
+        self._notify()
+        await self._dispatcher
+        self._dispatcher = None
+
+        unstarted = []
+        while not self._queue.empty():
+            unstarted.append(self._queue.get_nowait().id)
+        for _ in self._worker_tasks:
+            self._queue.put_nowait(None)
+        if unstarted:
+            try:
+                async with AsyncSession(get_engine()) as session:
+                    await self.jobs_repository.release(
+                        job_ids=unstarted, session=session
+                    )
+                    await session.commit()
+            except Exception as e:
+                logger.error(f"Failed to release queued jobs: {e}", exc_info=True)
+
+        _, pending = await asyncio.wait(self._worker_tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(
+                f"Task runner stopped with {len(pending)} jobs still running"
+            )
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+
+    def _notify(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _dispatch(self) -> None:
+        next_lease_check = 0.0
+        next_backlog_count = 0.0
+        while not self._stopping:
+            self._wake.clear()
+            free = self.queue_size - self._queue.qsize()
+            claimed = 0
+            try:
+                # Claimed jobs are read by the workers after the commit
+                async with AsyncSession(
+                    get_engine(), expire_on_commit=False
+                ) as session:
+                    if time.monotonic() >= next_lease_check:
+                        await self.jobs_repository.requeue_expired(session=session)
+                        await session.commit()
+                        next_lease_check = time.monotonic() + TASK_LEASE_SECONDS / 2
+                    if free > 0:
+                        jobs = await self.jobs_repository.claim(
+                            limit=free,
+                            locked_until=datetime.utcnow()
+                            + timedelta(seconds=TASK_LEASE_SECONDS),
+                            session=session,
+                        )
+                        await session.commit()
+                        claimed = len(jobs)
+                        for job in jobs:
+                            self._queue.put_nowait(job)
+                    # With a full queue, due jobs may be left behind
+                    self._saturated = claimed == free
+                    if not self._saturated:
+                        task_backlog.set(value=0)
+                    elif time.monotonic() >= next_backlog_count:
+                        task_backlog.set(
+                            value=await JobsRepository.count_due(session=session)
+                        )
+                        next_backlog_count = time.monotonic() + self.poll_interval
+            except Exception as e:
+                logger.error(f"Claiming jobs failed: {e}", exc_info=True)
+
+            # Woken by a local enqueue, a worker freeing a slot, or stop()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            if self._saturated:
+                # A slot is free again: let the dispatcher lease more
+                self._saturated = False
+                self._notify()
+            try:
+                if job is None:
+                    return
+                self.busy += 1
+                try:
+                    await self._run(job=job)
+                finally:
+                    self.busy -= 1
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        handler = self.handlers.get(job.kind)
+        task_queue_latency.observe(
+            value=max((datetime.utcnow() - job.run_at).total_seconds(), 0),
+            labels=(job.kind,),
+        )
+        error = None
+        start = time.perf_counter()
+        if handler is None:
+            error = f"No handler registered for task {job.kind!r}"
+        elif job.attempts > job.max_attempts:
+            # Lost its last lease: don't run it again
+            error = job.last_error or "Out of attempts"
+        else:
+            try:
+                await asyncio.wait_for(handler(job.payload), timeout=TASK_LEASE_SECONDS)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                logger.warning(
+                    f"Job {job.id} ({job.kind}) failed on attempt {job.attempts}: "
+                    f"{error}"
+                )
+        task_duration.observe(value=time.perf_counter() - start, labels=(job.kind,))
+
+        try:
+            async with AsyncSession(get_engine()) as session:
+                if error is None:
+                    outcome = "done"
+                    await self.jobs_repository.complete(job_id=job.id, session=session)
+                elif job.attempts < job.max_attempts and handler is not None:
+                    outcome = "retried"
+                    await self.jobs_repository.retry(
+                        job_id=job.id,
+                        run_at=datetime.utcnow()
+                        + timedelta(seconds=retry_delay(attempts=job.attempts)),
+                        error=error,
+                        session=session,
+                    )
+                else:
+                    outcome = "failed"
+                    await self.jobs_repository.fail(
+                        job_id=job.id, error=error, session=session
+                    )
+                await session.commit()
+            tasks_finished.inc(labels=(job.kind, outcome))
+        except Exception as e:
+            # The lease runs out and the job is retried
+            logger.error(f"Failed to record job {job.id} result: {e}", exc_info=True)
+
+
+task_runner = TaskRunner()
+
+
+async def enqueue(
+    kind: str,
+    payload: Dict[str, Any],
+    session: Optional[AsyncSession] = None,
+    delay_seconds: float = 0,
+) -> None:
+    """Add a job for ``task_runner``; see TaskRunner.enqueue"""
+    await task_runner.enqueue(
+        kind=kind, payload=payload, session=session, delay_seconds=delay_seconds
+    )
+
+
+def collect_task_metrics() -> List:
+    """In-process queue depth and busy workers, read when /metrics is scraped"""
+    queued = Gauge(
+        name="task_queue_depth", documentation="Leased jobs waiting for a worker"
+    )
+    busy = Gauge(name="task_workers_busy", documentation="Workers running a job")
+    queued.set(value=task_runner.queued)
+    busy.set(value=task_runner.busy)
+    return [queued, busy]
+
+
+registry.register_collector(collector=collect_task_metrics)
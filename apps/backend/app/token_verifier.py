@@ -0,0 +1,294 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from apps.backend.app.circuit_breaker import CircuitBreaker, CircuitOpenError
+from jose import JWTError, jwt
+from supabase import AuthApiError, Client
+
+logger = logging.getLogger("project_vista.auth")
+
+# Algorithms we accept for locally verified tokens. Anything else (including
+# "none") is rejected before the signature is even looked at.
+HMAC_ALGORITHMS = {"HS256"}
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+
+VERIFICATION_MODES = {"local", "remote"}
+
+
+class TokenVerificationError(Exception):
+    """Raised when a bearer token is rejected"""
+
+
+class AuthProviderUnavailableError(Exception):
+    """Raised when a token can't be verified because Supabase is unreachable"""
+
+
+@dataclass(frozen=True)
+class AuthIdentity:
+    """Identity extracted from a verified access token"""
+
+    user_id: str
+    email: Optional[str]
+    name: Optional[str]
+    avatar_url: Optional[str]
+
+    @classmethod
+    def from_claims(cls, claims: Dict[str, Any]) -> "AuthIdentity":
+        metadata = claims.get("user_metadata") or {}
+        return cls(
+            user_id=claims["sub"],
+            email=claims.get("email"),
+            name=metadata.get("full_name"),
+            avatar_url=metadata.get("avatar_url"),
+        )
+
+    @classmethod
+    def from_supabase_user(cls, auth_user: Any) -> "AuthIdentity":
+        metadata = auth_user.user_metadata or {}
+        return cls(
+            user_id=auth_user.id,
+            email=auth_user.email,
+            name=metadata.get("full_name"),
+            avatar_url=metadata.get("avatar_url"),
+        )
+
+
+class JWKSCache:
+    """Caches the auth provider's public signing keys by key id"""
+
+    def __init__(self, jwks_url: str, ttl_seconds: float, min_refresh_interval: float):
+        self.jwks_url = jwks_url
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def get_key(self, kid: str) -> Optional[Dict[str, Any]]:
+        """Return the JWK for a key id, refreshing once if it is unknown"""
+        now = time.monotonic()
+        if self._fetched_at is None or now - self._fetched_at > self.ttl_seconds:
+            await self.refresh()
+        elif kid not in self._keys and (
+            now - self._fetched_at >= self.min_refresh_interval
+        ):
+            # Unknown key id usually means the provider rotated its keys
+            await self.refresh()
+        return self._keys.get(kid)
+
+    async def refresh(self) -> None:
+        """Fetch the key set, coalescing concurrent refreshes into one request"""
+        requested_at = time.monotonic()
+        async with self._lock:
+            if self._fetched_at is not None and self._fetched_at >= requested_at:
+                return
+            try:
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    response = await client.get(self.jwks_url)
+                    response.raise_for_status()
+                keys = response.json().get("keys", [])
+            except (httpx.HTTPError, ValueError) as e:
+                # Keep serving the previous key set; unknown kids fall back to
+                # remote verification until the next successful refresh.
+                logger.warning(
+                    f"Failed to refresh JWKS: {str(e)}",
+                    extra={"jwks_url": self.jwks_url},
+                )
+                self._fetched_at = time.monotonic()
+                return
+
+            self._keys = {key["kid"]: key for key in keys if "kid" in key}
+            self._fetched_at = time.monotonic()
+            logger.info(
+                "JWKS refreshed",
+                extra={"jwks_url": self.jwks_url, "key_count": len(self._keys)},
+            )
+
+
+class RejectedTokenCache:
+    """
+    In-process LRU+TTL cache of recently rejected tokens, so a client
+    retrying with an expired or revoked token is turned away without
+    verifying it again. Tokens are kept as SHA-256 digests.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 30):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        # token digest -> (expires_at, rejection reason)
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, token: str) -> Optional[str]:
+        """The reason the token was rejected, or None if it wasn't recently"""
+        digest = self._digest(token=token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        expires_at, reason = entry
+        if expires_at <= time.monotonic():
+            del self._entries[digest]
+            return None
+        self.hits += 1
+        return reason
+
+    def put(self, token: str, reason: str) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        digest = self._digest(token=token)
+        self._entries[digest] = (time.monotonic() + self.ttl_seconds, reason)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "size": len(self._entries)}
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+
+class TokenVerifier:
+    """
+    Verifies Supabase access tokens.
+
+    In "local" mode the signature and standard claims are checked in-process,
+    using the shared JWT secret for HS256 tokens and the cached JWKS for
+    asymmetric ones. Only tokens signed with a key id we cannot resolve are
+    sent to Supabase. "remote" mode always asks Supabase.
+
+    Rejected tokens are remembered for ``rejected_token_ttl_seconds``. Calls
+    to Supabase time out after ``remote_timeout_seconds`` and go through a
+    circuit breaker: while Supabase keeps failing, tokens that need it raise
+    AuthProviderUnavailableError at once instead of waiting on it.
+    """
+
+    def __init__(
+        self,
+        supabase_client_factory: Callable[[], Client],
+        supabase_url: str,
+        jwt_secret: Optional[str] = None,
+        mode: str = "local",
+        audience: str = "authenticated",
+        jwks_ttl_seconds: float = 3600,
+        jwks_min_refresh_interval: float = 30,
+        rejected_token_ttl_seconds: float = 30,
+        rejected_token_cache_size: int = 10000,
+        remote_timeout_seconds: float = 5,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_seconds: float = 30,
+    ):
+        if mode not in VERIFICATION_MODES:
+            raise ValueError(f"Unknown auth verification mode: {mode}")
+
+        self.supabase_client_factory = supabase_client_factory
+        self.jwt_secret = jwt_secret
+        self.mode = mode
+        self.audience = audience
+        self.issuer = f"{supabase_url.rstrip('/')}/auth/v1"
+        self.jwks = JWKSCache(
+            jwks_url=f"{self.issuer}/.well-known/jwks.json",
+            ttl_seconds=jwks_ttl_seconds,
+            min_refresh_interval=jwks_min_refresh_interval,
+        )
+        self.rejected_tokens = RejectedTokenCache(
+            max_size=rejected_token_cache_size, ttl_seconds=rejected_token_ttl_seconds
+        )
+        self.remote_timeout_seconds = remote_timeout_seconds
+        # A rejected token means Supabase answered, so it isn't a failure
+        self.breaker = CircuitBreaker(
+            name="supabase_auth",
+            failure_threshold=breaker_failure_threshold,
+            reset_timeout=breaker_reset_seconds,
+            ignored=(TokenVerificationError,),
+        )
+
+    async def verify(self, token: str) -> AuthIdentity:
+        """Verify a token and return the identity it carries"""
+        reason = self.rejected_tokens.get(token=token)
+        if reason is not None:
+            raise TokenVerificationError(reason)
+        try:
+            if self.mode == "local":
+                identity = await self._verify_locally(token=token)
+                if identity is not None:
+                    return identity
+            return await self._verify_remotely(token=token)
+        except TokenVerificationError as e:
+            self.rejected_tokens.put(token=token, reason=str(e))
+            raise
+
+    async def _verify_locally(self, token: str) -> Optional[AuthIdentity]:
+        """Return the identity, or None when the token needs remote verification"""
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise TokenVerificationError(f"Malformed token: {str(e)}") from e
+
+        algorithm = header.get("alg")
+        if algorithm in HMAC_ALGORITHMS:
+            if not self.jwt_secret:
+                return None
+            key = self.jwt_secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            kid = header.get("kid")
+            key = await self.jwks.get_key(kid=kid) if kid else None
+            if key is None:
+                return None
+        else:
+            raise TokenVerificationError(f"Unsupported token algorithm: {algorithm}")
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                issuer=self.issuer,
+            )
+        except JWTError as e:
+            raise TokenVerificationError(str(e)) from e
+
+        if not claims.get("sub"):
+            raise TokenVerificationError("Token has no subject")
+        return AuthIdentity.from_claims(claims=claims)
+
+    async def _verify_remotely(self, token: str) -> AuthIdentity:
+        """Ask Supabase to verify the token, unless its circuit is open"""
+        try:
+            supabase_user = await self.breaker.call(
+                fn=lambda: self._get_supabase_user(token=token)
+            )
+        except CircuitOpenError as e:
+            raise AuthProviderUnavailableError(str(e)) from e
+
+        if not supabase_user or not supabase_user.user:
+            raise TokenVerificationError("Invalid authentication credentials")
+        return AuthIdentity.from_supabase_user(auth_user=supabase_user.user)
+
+    async def _get_supabase_user(self, token: str) -> Any:
+        """
+        Supabase's get_user, without blocking the event loop. Client errors
+        are rejections; server errors, timeouts and network errors mean
+        Supabase is unavailable.
+        """
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(self.supabase_client_factory().auth.get_user, token),
+                timeout=self.remote_timeout_seconds,
+            )
+        except AuthApiError as e:
+            if e.status < 500 and e.status != 429:
+                raise TokenVerificationError(str(e)) from e
+            raise AuthProviderUnavailableError(str(e)) from e
+        except asyncio.TimeoutError as e:
+            raise AuthProviderUnavailableError("Supabase auth timed out") from e
+        except Exception as e:
+            raise AuthProviderUnavailableError(str(e)) from e
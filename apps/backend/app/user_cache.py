@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from apps.backend.app.models.user import User
+from apps.backend.app.token_verifier import AuthIdentity
+
+
+class UserIdentityCache:
+    """
+    In-process LRU+TTL cache of users whose database row is known to match
+    their token claims.
+
+    A hit means the users table already holds exactly this identity, so the
+    request can skip the upsert entirely. An entry is only reused while the
+    claims it was stored with are unchanged; a new email, name or avatar in the
+    token counts as a miss and triggers a fresh upsert.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        # user_id -> (expires_at, identity, user snapshot)
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, identity: AuthIdentity) -> Optional[User]:
+        """Return a detached copy of the cached user, or None on a miss"""
+        entry = self._entries.get(identity.user_id)
+        if entry is not None:
+            expires_at, cached_identity, snapshot = entry
+            if expires_at > time.monotonic() and cached_identity == identity:
+                self._entries.move_to_end(identity.user_id)
+                self.hits += 1
+                return User(**snapshot)
+            del self._entries[identity.user_id]
+
+        self.misses += 1
+        return None
+
+    def put(self, identity: AuthIdentity, user: User) -> None:
+        """Remember that the users row for this identity is up to date"""
+        self._entries[identity.user_id] = (
+            time.monotonic() + self.ttl_seconds,
+            identity,
+            user.model_dump(),
+        )
+        self._entries.move_to_end(identity.user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user so the next request re-syncs their row"""
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
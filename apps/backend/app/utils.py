@@ -4,8 +4,15 @@ from dotenv import find_dotenv, load_dotenv
 
 default_file = ".env"
 
+_env_loaded = False
+
 
 def load_env():
+    """Load the .env file once per process; later calls are no-ops"""
+    global _env_loaded
+    if _env_loaded:
+        return
     env = os.environ.get("ENV", default_file)
     env_file = default_file if env == default_file else f".env.{env.lower()}"
     load_dotenv(find_dotenv(env_file))
+    _env_loaded = True
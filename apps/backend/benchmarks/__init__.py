@@ -0,0 +1,7 @@
+"""
+Reproducible benchmarks for the backend API.
+
+Run from the repository root, e.g.
+``python -m apps.backend.benchmarks run --output results.json``.
+See the "Benchmarks" section of apps/backend/README.md.
+"""
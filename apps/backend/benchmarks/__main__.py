@@ -0,0 +1,257 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from apps.backend.benchmarks.environment import WikipediaStub, configure_environment
+from apps.backend.benchmarks.stats import compare
+
+SCENARIO_NAMES = [
+    "mixed",
+    "auth",
+    "middleware",
+    "logging",
+    "bulk",
+    "list_cpu",
+    "startup",
+    "wikipedia",
+    "search",
+    "trending",
+    "coalescing",
+    "auth_outage",
+    "scaling",
+    "suggest",
+    "home",
+]
+DEFAULT_MIX = "list=50,get=30,create=5,update_complete=12,delete=3"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m apps.backend.benchmarks",
+        description="Benchmark the backend API in-process",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run benchmark scenarios")
+    run.add_argument(
+        "--scenario",
+        action="append",
+        choices=SCENARIO_NAMES,
+        help="Scenario to run (repeatable; default: all)",
+    )
+    run.add_argument(
+        "--database-url",
+        default=os.getenv("BENCH_DATABASE_URL"),
+        help="Scratch database to run against (default: a temporary SQLite file)",
+    )
+    run.add_argument(
+        "--cache-backend", default="memory", choices=["memory", "redis", "none"]
+    )
+    run.add_argument("--users", type=int, default=20)
+    run.add_argument("--tracks", type=int, default=50, help="Tracks per user")
+    run.add_argument("--articles", type=int, default=10, help="Articles per track")
+    run.add_argument("--requests", type=int, default=2000)
+    run.add_argument("--concurrency", type=int, default=50)
+    run.add_argument(
+        "--mix", default=DEFAULT_MIX, help="Operation weights for the mixed scenario"
+    )
+    run.add_argument("--bulk-tracks", type=int, default=10000)
+    run.add_argument(
+        "--max-workers",
+        type=int,
+        default=0,
+        help="Most server workers in the scaling scenario (default: CPU count)",
+    )
+    run.add_argument(
+        "--load-processes",
+        type=int,
+        default=0,
+        help="Load-generating processes in the scaling scenario (default: --max-workers)",
+    )
+    run.add_argument("--scaling-seconds", type=float, default=10)
+    run.add_argument(
+        "--graph-nodes",
+        type=int,
+        default=500000,
+        help="Articles in the suggest scenario's synthetic link graph",
+    )
+    run.add_argument(
+        "--graph-edges",
+        type=int,
+        default=5000000,
+        help="Approximate links in the suggest scenario's synthetic link graph",
+    )
+    run.add_argument("--wikipedia-latency-ms", type=float, default=20)
+    run.add_argument("--supabase-latency-ms", type=float, default=50)
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--output", help="Write results as JSON to this file")
+    run.add_argument("--baseline", help="Earlier results to check for regressions")
+    run.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed relative regression against --baseline (0.1 = 10%%)",
+    )
+
+    compare_command = commands.add_parser(
+        "compare", help="Check saved results against a baseline"
+    )
+    compare_command.add_argument("baseline")
+    compare_command.add_argument("current")
+    compare_command.add_argument("--threshold", type=float, default=0.1)
+    return parser
+
+
+async def git_revision() -> Optional[str]:
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "git",
+            "rev-parse",
+            "HEAD",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+    stdout, _ = await process.communicate()
+    return stdout.decode().strip() or None
+
+
+def setup_quiet_logging() -> None:
+    """
+    Configure the app's logging with its console handlers bound to
+    /dev/null: records are still formatted and shipped as usual, but
+    per-request lines don't flood the terminal or the JSON on stdout.
+    """
+    from apps.backend.app.logging_config import setup_logging
+
+    devnull = open(os.devnull, "w")
+    # The console handlers resolve sys.stdout when logging is configured
+    with contextlib.redirect_stdout(devnull):
+        setup_logging()
+
+
+async def run_benchmarks(options: argparse.Namespace) -> Dict[str, Any]:
+    wikipedia_stub = WikipediaStub(latency_seconds=options.wikipedia_latency_ms / 1000)
+    await wikipedia_stub.start()
+    database_url = configure_environment(
+        database_url=options.database_url,
+        wikipedia_api_url=wikipedia_stub.url,
+        cache_backend=options.cache_backend,
+    )
+    if not database_url.startswith("sqlite"):
+        await migrate()
+
+    # Imported only now: the app reads its settings at import time
+    import httpx
+    from apps.backend.app.database import get_engine
+    from apps.backend.app.main import app
+    from apps.backend.benchmarks.scenarios import SCENARIOS, BenchmarkContext
+    from apps.backend.benchmarks.stats import count_queries
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "git_revision": await git_revision(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": database_url.split("://", 1)[0],
+            "options": {
+                key: value
+                for key, value in vars(options).items()
+                if key not in ("command", "database_url", "output", "baseline")
+            },
+        },
+        "scenarios": {},
+    }
+
+    # Before the lifespan hook, which then finds logging already set up
+    setup_quiet_logging()
+    try:
+        async with app.router.lifespan_context(app):
+            count_queries(engine=get_engine().sync_engine)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://benchmark", timeout=None
+            ) as client:
+                context = BenchmarkContext(
+                    app=app,
+                    client=client,
+                    options=options,
+                    wikipedia_stub=wikipedia_stub,
+                )
+                for name in options.scenario or SCENARIO_NAMES:
+                    print(f"Running {name}...", file=sys.stderr)
+                    results["scenarios"][name] = await SCENARIOS[name](context)
+    finally:
+        await wikipedia_stub.close()
+    return results
+
+
+async def migrate() -> None:
+    """Bring a Postgres scratch database up to the current schema"""
+    from apps.backend.benchmarks.scenarios import REPO_ROOT
+
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "alembic",
+        "-c",
+        "apps/backend/alembic.ini",
+        "upgrade",
+        "head",
+        cwd=str(REPO_ROOT),
+    )
+    if await process.wait() != 0:
+        raise SystemExit("Migrating the benchmark database failed")
+
+
+def report_regressions(regressions: List[str], threshold: float) -> int:
+    if not regressions:
+        print(f"No regressions beyond {threshold:.0%}", file=sys.stderr)
+        return 0
+    print(f"Regressions beyond {threshold:.0%}:", file=sys.stderr)
+    for regression in regressions:
+        print(f"  {regression}", file=sys.stderr)
+    return 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    options = build_parser().parse_args(argv)
+
+    if options.command == "compare":
+        with open(options.baseline) as baseline, open(options.current) as current:
+            regressions = compare(
+                baseline=json.load(baseline),
+                current=json.load(current),
+                threshold=options.threshold,
+            )
+        return report_regressions(regressions=regressions, threshold=options.threshold)
+
+    results = asyncio.run(run_benchmarks(options=options))
+    output = json.dumps(results, indent=2, default=str)
+    if options.output:
+        with open(options.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if options.baseline:
+        with open(options.baseline) as baseline:
+            regressions = compare(
+                baseline=json.load(baseline),
+                current=results,
+                threshold=options.threshold,
+            )
+        return report_regressions(regressions=regressions, threshold=options.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
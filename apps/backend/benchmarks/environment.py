@@ -0,0 +1,196 @@
+import asyncio
+import os
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import orjson
+from jose import jwt
+from supabase import AuthApiError, AuthRetryableError
+
+BENCH_SUPABASE_URL = "http://supabase.benchmark.invalid"
+BENCH_JWT_SECRET = "benchmark-jwt-secret"
+BENCH_USER_PREFIX = "bench-"
+SQLITE_PATH = os.path.join(tempfile.gettempdir(), "project-vista-benchmark.db")
+
+
+def configure_environment(
+    database_url: Optional[str], wikipedia_api_url: str, cache_backend: str
+) -> str:
+    """
+    Point the app at the benchmark database and stubs. Must run before the
+    app is imported, since settings are read at import time. Returns the
+    database URL in use.
+    """
+    if not database_url:
+        if os.path.exists(SQLITE_PATH):
+            os.remove(SQLITE_PATH)
+        database_url = f"sqlite+aiosqlite:///{SQLITE_PATH}"
+    os.environ.update(
+        DATABASE_URL=database_url,
+        DB_CREATE_TABLES="true" if database_url.startswith("sqlite") else "false",
+        SUPABASE_URL=BENCH_SUPABASE_URL,
+        SUPABASE_SERVICE_ROLE_KEY="benchmark",
+        SUPABASE_JWT_SECRET=BENCH_JWT_SECRET,
+        AUTH_VERIFICATION_MODE="local",
+        WIKIPEDIA_API_URL=wikipedia_api_url,
+        TRACKS_CACHE_BACKEND=cache_backend,
+        ENVIRONMENT="benchmark",
+        # Keep the queued shipping handler in the path, without a network sink
+        LOG_SINK="memory",
+    )
+    return database_url
+
+
+def make_token(user_id: str, expires_in: int = 24 * 3600) -> str:
+    """An access token the app verifies locally, as Supabase would issue it"""
+    now = int(time.time())
+    claims = {
+        "sub": user_id,
+        "email": f"{user_id}@benchmark.invalid",
+        "aud": "authenticated",
+        "iss": f"{BENCH_SUPABASE_URL}/auth/v1",
+        "iat": now,
+        "exp": now + expires_in,
+        "user_metadata": {"full_name": f"Benchmark {user_id}"},
+    }
+    return jwt.encode(claims, BENCH_JWT_SECRET, algorithm="HS256")
+
+
+class StubSupabaseAuth:
+    """
+    Answers get_user like Supabase Auth, after a simulated round-trip. Every
+    ``spike_every``-th call takes ``spike_seconds`` longer, and while
+    ``outage`` is set calls fail the way an unreachable Supabase does.
+    """
+
+    def __init__(
+        self, latency_seconds: float, spike_seconds: float = 0, spike_every: int = 0
+    ):
+        self.latency_seconds = latency_seconds
+        self.spike_seconds = spike_seconds
+        self.spike_every = spike_every
+        self.outage = False
+        self.calls = 0
+
+    def get_user(self, token: str) -> Any:
+        # Called from a worker thread, like the real (blocking) client
+        self.calls += 1
+        latency = self.latency_seconds
+        if self.spike_every and self.calls % self.spike_every == 0:
+            latency += self.spike_seconds
+        time.sleep(latency)
+        if self.outage:
+            raise AuthRetryableError("Service Unavailable", 503)
+        claims = jwt.get_unverified_claims(token)
+        if claims.get("exp", 0) < time.time():
+            raise AuthApiError("invalid JWT: token is expired", 403, "bad_jwt")
+        return SimpleNamespace(
+            user=SimpleNamespace(
+                id=claims["sub"],
+                email=claims.get("email"),
+                user_metadata=claims.get("user_metadata") or {},
+            )
+        )
+
+
+class StubSupabaseClient:
+    """Stands in for supabase.Client; only the auth API is used by the app"""
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.05,
+        spike_seconds: float = 0,
+        spike_every: int = 0,
+    ):
+        self.auth = StubSupabaseAuth(
+            latency_seconds=latency_seconds,
+            spike_seconds=spike_seconds,
+            spike_every=spike_every,
+        )
+
+
+@dataclass
+class WikipediaStubStats:
+    requests: int = 0
+    titles: int = 0
+
+
+class WikipediaStub:
+    """
+    Minimal MediaWiki query API over HTTP/1.1 keep-alive on localhost, so
+    article resolution is measured with real connection pooling and
+    batching but without depending on Wikipedia.
+    """
+
+    def __init__(self, latency_seconds: float = 0.02):
+        self.latency_seconds = latency_seconds
+        self.stats = WikipediaStubStats()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/w/api.php"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle_connection, host="127.0.0.1", port=0
+        )
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                # Headers are read and ignored; requests have no body
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                target = request_line.split()[1].decode()
+                body = orjson.dumps(await self._query(target=target))
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (ConnectionError, IndexError):
+            pass
+        finally:
+            writer.close()
+
+    async def _query(self, target: str) -> Dict[str, Any]:
+        params = parse_qs(urlsplit(target).query)
+        titles = params.get("titles", [""])[0].split("|")
+        self.stats.requests += 1
+        self.stats.titles += len(titles)
+        await asyncio.sleep(self.latency_seconds)
+
+        pages: List[Dict[str, Any]] = []
+        for title in titles:
+            if title.endswith("(missing)"):
+                pages.append({"title": title, "missing": True})
+                continue
+            slug = title.replace(" ", "_")
+            pages.append(
+                {
+                    # Within the 32-bit page_id column, like real page ids
+                    "pageid": zlib.crc32(title.encode()) & 0x7FFFFFFF,
+                    "title": title,
+                    "canonicalurl": f"https://en.wikipedia.org/wiki/{slug}",
+                    "description": f"Stub description of {title}",
+                }
+            )
+        return {"batchcomplete": True, "query": {"pages": pages}}
@@ -0,0 +1,66 @@
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+# Runs in separate load-generating processes, so it must not import the app
+
+
+def run_load(
+    base_url: str,
+    path: str,
+    tokens: List[str],
+    concurrency: int,
+    seconds: float,
+) -> Dict[str, Any]:
+    """
+    GET ``path`` from ``concurrency`` keep-alive connections for ``seconds``,
+    cycling through ``tokens``. Returns the latencies and the error count.
+    """
+    return asyncio.run(
+        _load(
+            base_url=base_url,
+            path=path,
+            tokens=tokens,
+            concurrency=concurrency,
+            seconds=seconds,
+        )
+    )
+
+
+async def _load(
+    base_url: str, path: str, tokens: List[str], concurrency: int, seconds: float
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    first_error = None
+    deadline = time.perf_counter() + seconds
+
+    async def connection(index: int, client: httpx.AsyncClient) -> None:
+        nonlocal errors, first_error
+        headers = {"Authorization": f"Bearer {tokens[index % len(tokens)]}"}
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+                failed = response.status_code != 200
+                detail = f"{response.status_code} {response.text[:200]}"
+            except httpx.HTTPError as e:
+                failed = True
+                detail = repr(e)
+            latencies.append(time.perf_counter() - start)
+            if failed:
+                errors += 1
+                first_error = first_error or detail
+
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=30
+    ) as client:
+        await asyncio.gather(
+            *[connection(index=index, client=client) for index in range(concurrency)]
+        )
+    return {"latencies": latencies, "errors": errors, "first_error": first_error}
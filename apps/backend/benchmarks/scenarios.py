@@ -0,0 +1,1524 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import resource
+import signal
+import socket
+import sys
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from apps.backend.app import auth
+from apps.backend.app.cache import cache_requests, tracks_cache
+from apps.backend.app.database import get_engine, pool_stats
+from apps.backend.app.link_graph import (
+    LinkGraph,
+    build_link_graph,
+    read_edges,
+    write_link_graph,
+)
+from apps.backend.app.logging_config import logger
+from apps.backend.app.models.job import Job
+from apps.backend.app.models.track import Track, TrackItem
+from apps.backend.app.models.trending import TrackActivity
+from apps.backend.app.pagination import MAX_PAGE_SIZE
+from apps.backend.app.server import available_cpus
+from apps.backend.app.services import tracks_service as tracks_service_module
+from apps.backend.app.services.suggestion_service import (
+    SuggestionService,
+    get_suggestion_service,
+)
+from apps.backend.app.services.trending_service import (
+    COMPLETION_WEIGHT,
+    JOIN_WEIGHT,
+    trending_service,
+)
+from apps.backend.app.single_flight import single_flight_calls
+from apps.backend.app.token_verifier import TokenVerifier
+from apps.backend.benchmarks.environment import (
+    BENCH_SUPABASE_URL,
+    BENCH_USER_PREFIX,
+    StubSupabaseClient,
+    WikipediaStub,
+    make_token,
+)
+from apps.backend.benchmarks.load import run_load
+from apps.backend.benchmarks.seed import (
+    SEED_BATCH_SIZE,
+    Dataset,
+    article_title,
+    reset_benchmark_data,
+    seed,
+)
+from apps.backend.benchmarks.stats import Recorder, summarize
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Scenarios import the app, so this module may only be imported once
+# configure_environment() has run
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+RSS_SAMPLE_INTERVAL_SECONDS = 0.01
+STARTUP_RUNS = 5
+
+STARTUP_PROBE = """
+import asyncio, json, time
+start = time.perf_counter()
+from apps.backend.app.main import app
+imported = time.perf_counter()
+import httpx
+
+async def probe():
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+            response = await c.get("/api/health")
+            return response.status_code, time.perf_counter()
+
+status, answered = asyncio.run(probe())
+print(json.dumps({
+    "status": status,
+    "import_seconds": imported - start,
+    "first_response_seconds": answered - start,
+}))
+"""
+
+
+@dataclass
+class BenchmarkContext:
+    """What every scenario gets: the app, a client for it and the options"""
+
+    app: Any
+    client: httpx.AsyncClient
+    options: argparse.Namespace
+    wikipedia_stub: WikipediaStub
+    _tokens: Dict[str, str] = field(default_factory=dict)
+
+    def auth_headers(self, user_id: str) -> Dict[str, str]:
+        token = self._tokens.get(user_id)
+        if token is None:
+            token = self._tokens[user_id] = make_token(user_id=user_id)
+        return {"Authorization": f"Bearer {token}"}
+
+    async def request(
+        self,
+        recorder: Recorder,
+        operation: str,
+        method: str,
+        url: str,
+        user_id: str,
+        expected_status: int = 200,
+        **kwargs,
+    ) -> Optional[httpx.Response]:
+        """Send one timed request as ``user_id``; None if it failed"""
+        with recorder.measure(operation=operation) as measurement:
+            try:
+                response = await self.client.request(
+                    method, url, headers=self.auth_headers(user_id=user_id), **kwargs
+                )
+            except Exception as e:
+                measurement.fail(detail=repr(e))
+                return None
+            if response.status_code != expected_status:
+                measurement.fail(
+                    detail=f"{method} {url}: {response.status_code} {response.text[:200]}"
+                )
+                return None
+            return response
+
+
+async def run_concurrently(
+    total: int, concurrency: int, task: Callable[[int, int], Awaitable[None]]
+) -> None:
+    """Run ``task(worker_index, index)`` ``total`` times on ``concurrency`` workers"""
+    next_index = 0
+
+    async def worker(worker_index: int) -> None:
+        nonlocal next_index
+        while next_index < total:
+            index = next_index
+            next_index += 1
+            await task(worker_index, index)
+
+    await asyncio.gather(
+        *[worker(worker_index=i) for i in range(min(concurrency, total))]
+    )
+
+
+async def seed_dataset(
+    rng: random.Random, users: int, tracks_per_user: int, articles_per_track: int
+) -> Dataset:
+    async with AsyncSession(get_engine()) as session:
+        await reset_benchmark_data(session=session)
+        return await seed(
+            session=session,
+            rng=rng,
+            users=users,
+            tracks_per_user=tracks_per_user,
+            articles_per_track=articles_per_track,
+        )
+
+
+def cache_counts() -> Dict[str, float]:
+    return {
+        result: cache_requests.values.get(("tracks", result), 0)
+        for result in ("hit", "miss")
+    }
+
+
+def single_flight_counts() -> Dict[str, float]:
+    return {
+        f"{flight}_{result}": single_flight_calls.values.get((flight, result), 0)
+        for flight in ("auth", "tracks")
+        for result in ("leader", "coalesced")
+    }
+
+
+def current_rss_bytes() -> int:
+    """Resident set size now (Linux), or the peak so far elsewhere"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def rss_breakdown() -> Dict[str, int]:
+    """
+    Resident bytes that are private to the process (heap) and that map
+    files (shared with other processes and reclaimable), on Linux
+    """
+    breakdown = {"anon": 0, "file": 0}
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(("RssAnon:", "RssFile:")):
+                    name, kilobytes, _ = line.split()
+                    breakdown[name[3:-1].lower()] = int(kilobytes) * 1024
+    except OSError:
+        breakdown["anon"] = current_rss_bytes()
+    return breakdown
+
+
+class RssSampler:
+    """Tracks the peak resident set size while the block runs"""
+
+    def __init__(self):
+        self.baseline = 0
+        self.peak = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def peak_delta_mb(self) -> float:
+        return round((self.peak - self.baseline) / (1024 * 1024), 1)
+
+    async def __aenter__(self) -> "RssSampler":
+        self.baseline = self.peak = current_rss_bytes()
+        self._task = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._task.cancel()
+        self.peak = max(self.peak, current_rss_bytes())
+
+    async def _sample(self) -> None:
+        while True:
+            self.peak = max(self.peak, current_rss_bytes())
+            await asyncio.sleep(RSS_SAMPLE_INTERVAL_SECONDS)
+
+
+async def stream_get(
+    app: Any, path: str, headers: Dict[str, str]
+) -> Tuple[int, int, int]:
+    """
+    GET ``path`` straight through the ASGI interface, discarding the body as
+    it streams (httpx's ASGI transport buffers whole responses). Returns the
+    status, body size and number of lines.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    request_sent = False
+    status = 0
+    size = 0
+    lines = 0
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client never disconnects
+        await asyncio.Event().wait()
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status, size, lines
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            size += len(body)
+            lines += body.count(b"\n")
+
+    await app(scope, receive, send)
+    return status, size, lines
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse ``list=50,get=30,...`` into operation weights"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = int(weight)
+    unknown = set(weights) - set(MIXED_OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations in mix: {', '.join(sorted(unknown))}")
+    return weights
+
+
+def new_track_payload(rng: random.Random, articles: int) -> Dict[str, Any]:
+    return {
+        "title": "Bench created track",
+        "description": "Created during a benchmark run",
+        "articles": [
+            {"title": title, "url": f"https://en.wikipedia.org/wiki/{title}"}
+            for title in (article_title(rng=rng) for _ in range(articles))
+        ],
+    }
+
+
+async def op_list(context, recorder, rng, dataset, user_id, created) -> None:
+    await context.request(
+        recorder=recorder,
+        operation="list",
+        method="GET",
+        url="/api/tracks/",
+        user_id=user_id,
+    )
+
+
+async def op_get(context, recorder, rng, dataset, user_id, created) -> None:
+    track = rng.choice(dataset.tracks_by_user[user_id])
+    await context.request(
+        recorder=recorder,
+        operation="get",
+        method="GET",
+        url=f"/api/tracks/{track.track_id}",
+        user_id=user_id,
+    )
+
+
+async def op_create(context, recorder, rng, dataset, user_id, created) -> None:
+    response = await context.request(
+        recorder=recorder,
+        operation="create",
+        method="POST",
+        url="/api/tracks/",
+        user_id=user_id,
+        expected_status=201,
+        json=new_track_payload(rng=rng, articles=context.options.articles),
+    )
+    if response is not None:
+        created.append((user_id, response.json()["id"]))
+
+
+async def op_update_complete(context, recorder, rng, dataset, user_id, created) -> None:
+    track = rng.choice(dataset.tracks_by_user[user_id])
+    if not track.item_ids:
+        return
+    await context.request(
+        recorder=recorder,
+        operation="update_complete",
+        method="PATCH",
+        url=f"/api/tracks/{track.track_id}/items/{rng.choice(track.item_ids)}",
+        user_id=user_id,
+        json={"completed": rng.random() < 0.5},
+    )
+
+
+async def op_delete(context, recorder, rng, dataset, user_id, created) -> None:
+    # Only tracks this worker created are deleted, so the seeded tracks other
+    # workers read stay in place
+    if not created:
+        await op_create(context, recorder, rng, dataset, user_id, created)
+        return
+    owner_id, track_id = created.pop(rng.randrange(len(created)))
+    await context.request(
+        recorder=recorder,
+        operation="delete",
+        method="DELETE",
+        url=f"/api/tracks/{track_id}",
+        user_id=owner_id,
+        expected_status=204,
+    )
+
+
+MIXED_OPERATIONS = {
+    "list": op_list,
+    "get": op_get,
+    "create": op_create,
+    "update_complete": op_update_complete,
+    "delete": op_delete,
+}
+
+
+async def scenario_mixed(context: BenchmarkContext) -> Dict[str, Any]:
+    """
+    Mixed read/write traffic from many users: track lists, single tracks,
+    creates, article completion toggles and deletes.
+    """
+    options = context.options
+    dataset = await seed_dataset(
+        rng=random.Random(options.seed),
+        users=options.users,
+        tracks_per_user=options.tracks,
+        articles_per_track=options.articles,
+    )
+    weights = parse_mix(mix=options.mix)
+    names = list(weights)
+    worker_rngs = [
+        random.Random(options.seed + worker) for worker in range(options.concurrency)
+    ]
+    created: List[List[Tuple[str, str]]] = [[] for _ in range(options.concurrency)]
+    cache_before = cache_counts()
+    upstream_before = context.wikipedia_stub.stats.requests
+
+    recorder = Recorder()
+
+    async def task(worker_index: int, index: int) -> None:
+        rng = worker_rngs[worker_index]
+        user_id = rng.choice(dataset.user_ids)
+        name = rng.choices(names, weights=[weights[n] for n in names])[0]
+        await MIXED_OPERATIONS[name](
+            context, recorder, rng, dataset, user_id, created[worker_index]
+        )
+
+    await run_concurrently(
+        total=options.requests, concurrency=options.concurrency, task=task
+    )
+    recorder.finish()
+
+    cache_after = cache_counts()
+    hits = cache_after["hit"] - cache_before["hit"]
+    misses = cache_after["miss"] - cache_before["miss"]
+    return {
+        **recorder.summary(),
+        "cache_hit_ratio": round(hits / (hits + misses), 3) if hits + misses else 0,
+        "cache": {
+            "backend": (
+                tracks_cache.backend.__class__.__name__
+                if tracks_cache.enabled
+                else "none"
+            ),
+            "hits": hits,
+            "misses": misses,
+        },
+        "wikipedia_upstream_requests": context.wikipedia_stub.stats.requests
+        - upstream_before,
+        "pool": pool_stats(),
+        "dataset": {
+            "users": options.users,
+            "tracks_per_user": options.tracks,
+            "articles_per_track": options.articles,
+            "concurrency": options.concurrency,
+            "mix": weights,
+        },
+    }
+
+
+async def scenario_auth(context: BenchmarkContext) -> Dict[str, Any]:
+    """
+    Authenticated request cost (GET /api/user/profile): first requests of
+    new users, repeat requests, and remote verification against a stub
+    Supabase client with simulated network latency.
+    """
+    options = context.options
+    users = [f"{BENCH_USER_PREFIX}auth-{index}" for index in range(options.users)]
+    async with AsyncSession(get_engine()) as session:
+        await reset_benchmark_data(session=session)
+
+    recorder = Recorder()
+
+    async def profile(operation: str, user_id: str) -> None:
+        await context.request(
+            recorder=recorder,
+            operation=operation,
+            method="GET",
+            url="/api/user/profile",
+            user_id=user_id,
+        )
+
+    for user_id in users:
+        await profile(operation="local_first_request", user_id=user_id)
+    for _ in range(max(1, options.requests // len(users))):
+        for user_id in users:
+            await profile(operation="local_repeat", user_id=user_id)
+
+    stub_client = StubSupabaseClient(latency_seconds=options.supabase_latency_ms / 1000)
+    local_verifier = auth.get_token_verifier()
+    # Swap in a remote-only verifier for this phase; the app builds its
+    # verifier lazily, so the module-level instance is the seam
+    auth._token_verifier = TokenVerifier(
+        supabase_client_factory=lambda: stub_client,
+        supabase_url=BENCH_SUPABASE_URL,
+        mode="remote",
+    )
+    try:
+        for user_id in users:
+            await profile(operation="remote", user_id=user_id)
+    finally:
+        auth._token_verifier = local_verifier
+
+    recorder.finish()
+    return {
+        **recorder.summary(),
+        "supabase_calls": stub_client.auth.calls,
+        "supabase_latency_ms": options.supabase_latency_ms,
+    }
+
+
+async def scenario_middleware(context: BenchmarkContext) -> Dict[str, Any]:
+    """Throughput of a trivial endpoint, i.e. the middleware stack's overhead"""
+    options = context.options
+    recorder = Recorder()
+
+    async def task(worker_index: int, index: int) -> None:
+        with recorder.measure(operation="health") as measurement:
+            response = await context.client.get("/api/health")
+            if response.status_code != 200:
+                measurement.fail(detail=f"GET /api/health: {response.status_code}")
+
+    await run_concurrently(
+        total=options.requests, concurrency=options.concurrency, task=task
+    )
+    recorder.finish()
+    return recorder.summary()
+
+
+async def scenario_logging(context: BenchmarkContext) -> Dict[str, Any]:
+    """Cost of one logger.info call through the configured handlers"""
+    calls = context.options.requests * 10
+
+    start = time.perf_counter_ns()
+    for index in range(calls):
+        logger.info(f"Benchmark log record {index}")
+    info_ns = (time.perf_counter_ns() - start) / calls
+
+    start = time.perf_counter_ns()
+    for index in range(calls):
+        logger.debug(f"Benchmark log record {index}")
+    debug_ns = (time.perf_counter_ns() - start) / calls
+
+    return {
+        "calls": calls,
+        "log_call_ns": round(info_ns),
+        "disabled_call_ns": round(debug_ns),
+    }
+
+
+async def scenario_bulk(context: BenchmarkContext) -> Dict[str, Any]:
+    """Bulk import and NDJSON export of one large account, with peak memory"""
+    options = context.options
+    rng = random.Random(options.seed)
+    user_id = f"{BENCH_USER_PREFIX}bulk"
+    async with AsyncSession(get_engine()) as session:
+        await reset_benchmark_data(session=session)
+    payload = [
+        new_track_payload(rng=rng, articles=options.articles)
+        for _ in range(options.bulk_tracks)
+    ]
+
+    recorder = Recorder()
+    async with RssSampler() as import_rss:
+        response = await context.request(
+            recorder=recorder,
+            operation="import",
+            method="POST",
+            url="/api/tracks/bulk",
+            user_id=user_id,
+            expected_status=201,
+            json=payload,
+        )
+    created = len(response.json()["created"]) if response is not None else 0
+    del payload, response
+
+    async with RssSampler() as export_rss:
+        with recorder.measure(operation="export") as measurement:
+            status, size, lines = await stream_get(
+                app=context.app,
+                path="/api/tracks/export",
+                headers=context.auth_headers(user_id=user_id),
+            )
+            if status != 200 or lines != created:
+                measurement.fail(detail=f"export: {status}, {lines} lines")
+    recorder.finish()
+
+    return {
+        **recorder.summary(),
+        "tracks": created,
+        "articles_per_track": options.articles,
+        "export_bytes": size,
+        "import_rss": {"peak_rss_delta_mb": import_rss.peak_delta_mb},
+        "export_rss": {"peak_rss_delta_mb": export_rss.peak_delta_mb},
+    }
+
+
+async def scenario_list_cpu(context: BenchmarkContext) -> Dict[str, Any]:
+    """
+    CPU time to build full pages of a large account (500 tracks of 30
+    articles), rendered from the database and served from the cache.
+    """
+    options = context.options
+    dataset = await seed_dataset(
+        rng=random.Random(options.seed),
+        users=1,
+        tracks_per_user=500,
+        articles_per_track=30,
+    )
+    user_id = dataset.user_ids[0]
+    url = "/api/tracks/?limit=200"
+    results: Dict[str, Any] = {}
+    for phase, invalidate in (("rendered", True), ("cached", False)):
+        recorder = Recorder()
+        cpu_seconds = 0.0
+        for _ in range(30):
+            if invalidate:
+                await tracks_cache.invalidate(owner_id=user_id)
+            cpu_start = time.process_time()
+            await context.request(
+                recorder=recorder,
+                operation=phase,
+                method="GET",
+                url=url,
+                user_id=user_id,
+            )
+            cpu_seconds += time.process_time() - cpu_start
+        recorder.finish()
+        summary = recorder.summary()
+        results[phase] = {
+            **summary["operations"][phase],
+            "cpu_ms_per_request": round(cpu_seconds / summary["requests"] * 1000, 3),
+        }
+    return results
+
+
+async def scenario_startup(context: BenchmarkContext) -> Dict[str, Any]:
+    """Import time and time to the first 200, in fresh interpreters"""
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+    runs = []
+    for _ in range(STARTUP_RUNS):
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            STARTUP_PROBE,
+            cwd=str(REPO_ROOT),
+            env=env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate()
+        runs.append(json.loads(stdout.decode().strip().splitlines()[-1]))
+
+    # One more run for a breakdown of the modules that are slowest to import
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-X",
+        "importtime",
+        "-c",
+        "import apps.backend.app.main",
+        cwd=str(REPO_ROOT),
+        env=env,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    self_times = []
+    for line in stderr.decode().splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[0].startswith("import time:"):
+            try:
+                self_micros = int(parts[0].split(":")[1])
+            except ValueError:
+                continue
+            self_times.append((self_micros, parts[2].strip()))
+    self_times.sort(reverse=True)
+
+    def median(key: str) -> float:
+        values = sorted(run[key] for run in runs)
+        return round(values[len(values) // 2], 4)
+
+    return {
+        "runs": len(runs),
+        "import_seconds": median(key="import_seconds"),
+        "first_response_seconds": median(key="first_response_seconds"),
+        "statuses": sorted({run["status"] for run in runs}),
+        "slowest_imports_ms": {
+            name: round(micros / 1000, 1) for micros, name in self_times[:10]
+        },
+    }
+
+
+JOB_DRAIN_TIMEOUT_SECONDS = 120.0
+
+
+async def wait_for_jobs(kind: str) -> float:
+    """Seconds until no ``kind`` job is waiting or running"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < JOB_DRAIN_TIMEOUT_SECONDS:
+        async with AsyncSession(get_engine()) as session:
+            result = await session.execute(
+                select(func.count())
+                .select_from(Job)
+                .where(Job.kind == kind, Job.status.in_(["pending", "running"]))
+            )
+            if result.scalar_one() == 0:
+                break
+        await asyncio.sleep(0.01)
+    return time.perf_counter() - start
+
+
+async def scenario_wikipedia(context: BenchmarkContext) -> Dict[str, Any]:
+    """
+    Track creation with server-side article resolution against the stub
+    Wikipedia API, cold titles then titles already cached: resolved before
+    responding (inline), and by enrich_track jobs (background), where the
+    time until every job has finished is reported too.
+    """
+    options = context.options
+    user_id = f"{BENCH_USER_PREFIX}wikipedia"
+    creates = max(1, options.requests // 20)
+    previous_mode = tracks_service_module.TRACK_ENRICHMENT
+    results: Dict[str, Any] = {}
+    try:
+        for mode in ("inline", "background"):
+            tracks_service_module.TRACK_ENRICHMENT = mode
+            async with AsyncSession(get_engine()) as session:
+                await reset_benchmark_data(session=session)
+            # Same titles in both modes, each starting from a cold cache
+            rng = random.Random(options.seed)
+            payloads = [
+                new_track_payload(rng=rng, articles=options.articles)
+                for _ in range(creates)
+            ]
+            results[mode] = {}
+            for phase in ("cold", "cached"):
+                recorder = Recorder()
+                upstream_before = context.wikipedia_stub.stats.requests
+
+                async def task(worker_index: int, index: int) -> None:
+                    await context.request(
+                        recorder=recorder,
+                        operation=phase,
+                        method="POST",
+                        url="/api/tracks/",
+                        user_id=user_id,
+                        expected_status=201,
+                        json=payloads[index],
+                    )
+
+                await run_concurrently(
+                    total=creates, concurrency=options.concurrency, task=task
+                )
+                recorder.finish()
+                enriched_after = await wait_for_jobs(kind="enrich_track")
+                upstream = context.wikipedia_stub.stats.requests - upstream_before
+                results[mode][phase] = {
+                    **recorder.summary()["operations"][phase],
+                    "upstream_requests": upstream,
+                    "upstream_requests_per_create": round(upstream / creates, 3),
+                }
+                if mode == "background":
+                    results[mode][phase]["enriched_after_seconds"] = round(
+                        enriched_after, 3
+                    )
+    finally:
+        tracks_service_module.TRACK_ENRICHMENT = previous_mode
+    results["wikipedia_latency_ms"] = options.wikipedia_latency_ms
+    return results
+
+
+SEARCH_ACCOUNT_SIZES = (1000, 10000)
+# Query kinds over the seeded vocabulary (see seed.TOPICS and seed.SUBTOPICS)
+SEARCH_QUERIES = {
+    "word": ["astronomy", "philosophy", "chemistry"],
+    "multi_word": ["physics methods", "history timeline", "music theory glossary"],
+    "phrase": ['"open problems"', '"key figures"'],
+    "typo": ["astronmy", "philosphy", "chemestry"],
+    "no_match": ["zeppelin"],
+}
+SEARCH_REQUESTS_PER_KIND = 30
+
+
+async def scenario_search(context: BenchmarkContext) -> Dict[str, Any]:
+    """
+    Latency of /api/tracks/search for one account of each size in
+    SEARCH_ACCOUNT_SIZES (5 articles per track), per kind of query. On
+    SQLite this measures the LIKE fallback, not the GIN-backed search.
+    """
+    rng = random.Random(context.options.seed)
+    user_ids = {}
+    async with AsyncSession(get_engine()) as session:
+        await reset_benchmark_data(session=session)
+        for size in SEARCH_ACCOUNT_SIZES:
+            dataset = await seed(
+                session=session,
+                rng=rng,
+                users=1,
+                tracks_per_user=size,
+                articles_per_track=5,
+                user_prefix=f"{BENCH_USER_PREFIX}search-{size}-",
+            )
+            user_ids[size] = dataset.user_ids[0]
+
+    results: Dict[str, Any] = {}
+    for size, user_id in user_ids.items():
+        recorder = Recorder()
+        for kind, queries in SEARCH_QUERIES.items():
+            for index in range(SEARCH_REQUESTS_PER_KIND):
+                await context.request(
+                    recorder=recorder,
+                    operation=kind,
+                    method="GET",
+                    url="/api/tracks/search",
+                    user_id=user_id,
+                    params={"q": queries[index % len(queries)]},
+                )
+        recorder.finish()
+        results[f"tracks_{size}"] = recorder.summary()
+    return results
+
+
+TRENDING_SIZES = (1000, 20000)
+TRENDING_ACTIVITY_PER_TRACK = 5
+TRENDING_INCREMENTAL_ACTIVITY = 1000
+TRENDING_REQUESTS = 30
+TRENDING_DEEP_PAGE = 10
+
+
+async def insert_activity(
+    session: AsyncSession, rng: random.Random, track_ids: List[str], count: int
+) -> None:
+    """``count`` joins and completions on random tracks over the last 14 days"""
+    now = datetime.utcnow()
+    rows = [
+        {
+            "track_id": rng.choice(track_ids),
+            "user_id": f"{BENCH_USER_PREFIX}activity",
+            "kind": kind,
+            "weight": JOIN_WEIGHT if kind == "join" else COMPLETION_WEIGHT,
+            "created_at": now - timedelta(seconds=rng.randint(0, 14 * 24 * 3600)),
+            "ranked": False,
+        }
+        for kind in rng.choices(["join", "completion"], weights=[1, 4], k=count)
+    ]
+    for start in range(0, len(rows), SEED_BATCH_SIZE):
+        await session.execute(
+            insert(TrackActivity), rows[start : start + SEED_BATCH_SIZE]
+        )
+    await session.commit()
+
+
+async def scenario_trending(context: BenchmarkContext) -> Dict[str, Any]:
+    """
+    Trending ranking at each of TRENDING_SIZES public tracks: a full refresh
+    of TRENDING_ACTIVITY_PER_TRACK activity rows per track, an incremental
+    refresh of TRENDING_INCREMENTAL_ACTIVITY new rows, and /api/tracks/trending
+    latency for the first page and page TRENDING_DEEP_PAGE
+    """
+    rng = random.Random(context.options.seed)
+    user_id = f"{BENCH_USER_PREFIX}trending-reader"
+    results: Dict[str, Any] = {}
+    for size in TRENDING_SIZES:
+        async with AsyncSession(get_engine()) as session:
+            await reset_benchmark_data(session=session)
+            dataset = await seed(
+                session=session,
+                rng=rng,
+                users=20,
+                tracks_per_user=size // 20,
+                articles_per_track=3,
+                user_prefix=f"{BENCH_USER_PREFIX}trending-{size}-",
+            )
+            track_ids = [
+                track.track_id
+                for tracks in dataset.tracks_by_user.values()
+                for track in tracks
+            ]
+            await session.execute(
+                update(Track)
+                .where(Track.user_id.like(f"{BENCH_USER_PREFIX}trending-{size}-%"))
+                .values(visibility="public")
+            )
+            await session.commit()
+
+            await insert_activity(
+                session=session,
+                rng=rng,
+                track_ids=track_ids,
+                count=size * TRENDING_ACTIVITY_PER_TRACK,
+            )
+            full = await trending_service.refresh(session=session)
+            await insert_activity(
+                session=session,
+                rng=rng,
+                track_ids=track_ids,
+                count=TRENDING_INCREMENTAL_ACTIVITY,
+            )
+            incremental = await trending_service.refresh(session=session)
+
+        recorder = Recorder()
+        cursor = None
+        for _ in range(TRENDING_DEEP_PAGE - 1):
+            response = await context.request(
+                recorder=recorder,
+                operation="walk",
+                method="GET",
+                url="/api/tracks/trending",
+                user_id=user_id,
+                params={"cursor": cursor} if cursor else {},
+            )
+            cursor = response.json()["next_cursor"] if response is not None else None
+        for index in range(TRENDING_REQUESTS):
+            await context.request(
+                recorder=recorder,
+                operation="first_page",
+                method="GET",
+                url="/api/tracks/trending",
+                user_id=user_id,
+            )
+            await context.request(
+                recorder=recorder,
+                operation="deep_page",
+                method="GET",
+                url="/api/tracks/trending",
+                user_id=user_id,
+                params={"cursor": cursor},
+            )
+        recorder.finish()
+
+        results[f"tracks_{size}"] = {
+            **recorder.summary(),
+            "full_refresh": {
+                "activity": full.activity,
+                "seconds": full.seconds,
+                "activity_per_second": full.activity / full.seconds,
+            },
+            "incremental_refresh": {
+                "activity": incremental.activity,
+                "seconds": incremental.seconds,
+                "activity_per_second": incremental.activity / incremental.seconds,
+            },
+        }
+    return results
+
+
+COALESCING_BURSTS = 20
+COALESCING_BURST_SIZE = 8
+
+
+async def scenario_coalescing(context: BenchmarkContext) -> Dict[str, Any]:
+    """
+    Bursts of COALESCING_BURST_SIZE identical concurrent requests, as the
+    frontend sends on tab focus or remount, to /api/tracks/ and
+    /api/user/profile. Caches are cleared before every burst, so each burst
+    needs one token verification, user upsert and page load between them.
+    """
+    options = context.options
+    dataset = await seed_dataset(
+        rng=random.Random(options.seed),
+        users=1,
+        tracks_per_user=options.tracks,
+        articles_per_track=options.articles,
+    )
+    user_id = dataset.user_ids[0]
+
+    recorder = Recorder()
+    before = single_flight_counts()
+    for operation, url in (("list", "/api/tracks/"), ("profile", "/api/user/profile")):
+        for _ in range(COALESCING_BURSTS):
+            auth.user_cache.clear()
+            await tracks_cache.invalidate(owner_id=user_id)
+            await asyncio.gather(
+                *[
+                    context.request(
+                        recorder=recorder,
+                        operation=operation,
+                        method="GET",
+                        url=url,
+                        user_id=user_id,
+                    )
+                    for _ in range(COALESCING_BURST_SIZE)
+                ]
+            )
+    recorder.finish()
+    after = single_flight_counts()
+
+    return {
+        **recorder.summary(),
+        "single_flight": {name: after[name] - before[name] for name in after},
+        "bursts": COALESCING_BURSTS,
+        "burst_size": COALESCING_BURST_SIZE,
+    }
+
+
+AUTH_OUTAGE_REQUESTS = 40
+AUTH_OUTAGE_TIMEOUT_SECONDS = 0.2
+AUTH_OUTAGE_RESET_SECONDS = 0.5
+
+
+async def scenario_auth_outage(context: BenchmarkContext) -> Dict[str, Any]:
+    """
+    Remote verification against a stub Supabase client that misbehaves: a
+    client retrying with an expired token, latency spikes past the remote
+    timeout, a full outage and the recovery after it. Reports latencies and
+    how many calls reached the stub in each phase.
+    """
+    options = context.options
+    latency_seconds = options.supabase_latency_ms / 1000
+    stub_client = StubSupabaseClient(
+        latency_seconds=latency_seconds,
+        spike_seconds=AUTH_OUTAGE_TIMEOUT_SECONDS * 2,
+        spike_every=4,
+    )
+    local_verifier = auth.get_token_verifier()
+    auth._token_verifier = TokenVerifier(
+        supabase_client_factory=lambda: stub_client,
+        supabase_url=BENCH_SUPABASE_URL,
+        mode="remote",
+        remote_timeout_seconds=AUTH_OUTAGE_TIMEOUT_SECONDS,
+        breaker_failure_threshold=5,
+        breaker_reset_seconds=AUTH_OUTAGE_RESET_SECONDS,
+    )
+    async with AsyncSession(get_engine()) as session:
+        await reset_benchmark_data(session=session)
+
+    recorder = Recorder()
+    calls: Dict[str, int] = {}
+
+    async def phase(operation: str, tokens: List[str], expected_status: int) -> None:
+        calls_before = stub_client.auth.calls
+        for token in tokens:
+            with recorder.measure(operation=operation) as measurement:
+                response = await context.client.get(
+                    "/api/user/profile", headers={"Authorization": f"Bearer {token}"}
+                )
+                if response.status_code != expected_status:
+                    measurement.fail(detail=f"{operation}: {response.status_code}")
+        calls[operation] = stub_client.auth.calls - calls_before
+
+    def fresh_tokens(name: str) -> List[str]:
+        return [
+            make_token(user_id=f"{BENCH_USER_PREFIX}auth-outage-{name}-{index}")
+            for index in range(AUTH_OUTAGE_REQUESTS)
+        ]
+
+    try:
+        expired = make_token(user_id=f"{BENCH_USER_PREFIX}expired", expires_in=-60)
+        await phase(
+            operation="expired_retry",
+            tokens=[expired] * AUTH_OUTAGE_REQUESTS,
+            expected_status=401,
+        )
+
+        # Every 4th call overruns the timeout: too few in a row to open the
+        # circuit, so those requests get 503 and the rest go through
+        calls_before = stub_client.auth.calls
+        for token in fresh_tokens(name="spikes"):
+            with recorder.measure(operation="latency_spikes") as measurement:
+                response = await context.client.get(
+                    "/api/user/profile", headers={"Authorization": f"Bearer {token}"}
+                )
+                if response.status_code not in (200, 503):
+                    measurement.fail(detail=f"latency_spikes: {response.status_code}")
+        calls["latency_spikes"] = stub_client.auth.calls - calls_before
+
+        stub_client.auth.spike_every = 0
+        stub_client.auth.outage = True
+        await phase(
+            operation="outage", tokens=fresh_tokens(name="outage"), expected_status=503
+        )
+
+        stub_client.auth.outage = False
+        await asyncio.sleep(AUTH_OUTAGE_RESET_SECONDS)
+        await phase(
+            operation="recovery",
+            tokens=fresh_tokens(name="recovery"),
+            expected_status=200,
+        )
+    finally:
+        auth._token_verifier = local_verifier
+    recorder.finish()
+
+    return {
+        **recorder.summary(),
+        "supabase_calls": calls,
+        "requests_per_phase": AUTH_OUTAGE_REQUESTS,
+        "supabase_latency_ms": options.supabase_latency_ms,
+        "remote_timeout_ms": AUTH_OUTAGE_TIMEOUT_SECONDS * 1000,
+    }
+
+
+SCALING_WARMUP_SECONDS = 2.0
+SCALING_STARTUP_TIMEOUT_SECONDS = 60.0
+
+
+def worker_counts(max_workers: int) -> List[int]:
+    """1, 2, 4, ... up to and including ``max_workers``"""
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    return counts + [max_workers]
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+async def wait_until_healthy(base_url: str, process: asyncio.subprocess.Process):
+    deadline = time.monotonic() + SCALING_STARTUP_TIMEOUT_SECONDS
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if process.returncode is not None:
+                raise RuntimeError(f"Server exited with {process.returncode}")
+            try:
+                if (await client.get("/api/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Server didn't become healthy")
+
+
+async def scenario_scaling(context: BenchmarkContext) -> Dict[str, Any]:
+    """
+    /api/tracks/ throughput of the production server (app.server) with 1, 2,
+    4, ... up to --max-workers worker processes, driven over real sockets by
+    --load-processes load-generating processes with --concurrency
+    connections in total. Load generators need CPUs of their own, so the
+    machine should have --max-workers + --load-processes cores for the
+    numbers to show the server's scaling rather than CPU contention.
+    """
+    options = context.options
+    max_workers = options.max_workers or available_cpus()
+    load_processes = options.load_processes or max_workers
+    dataset = await seed_dataset(
+        rng=random.Random(options.seed),
+        users=options.users,
+        tracks_per_user=options.tracks,
+        articles_per_track=options.articles,
+    )
+    tokens = [make_token(user_id=user_id) for user_id in dataset.user_ids]
+    per_process = max(1, options.concurrency // load_processes)
+
+    results: Dict[str, Any] = {}
+    pool = ProcessPoolExecutor(
+        max_workers=load_processes, mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        for workers in worker_counts(max_workers=max_workers):
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                "apps.backend.app.server",
+                cwd=str(REPO_ROOT),
+                env={
+                    **os.environ,
+                    "PYTHONPATH": str(REPO_ROOT),
+                    "HOST": "127.0.0.1",
+                    "PORT": str(port),
+                    "WEB_CONCURRENCY": str(workers),
+                    # Tables exist already; workers mustn't race to create them
+                    "DB_CREATE_TABLES": "false",
+                    # Several workers can't share a memory cache, so compare
+                    # every worker count without one
+                    "TRACKS_CACHE_BACKEND": (
+                        "none"
+                        if options.cache_backend == "memory"
+                        else options.cache_backend
+                    ),
+                    "TRENDING_REFRESH_SECONDS": "0",
+                },
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            try:
+                await wait_until_healthy(base_url=base_url, process=process)
+                loop = asyncio.get_running_loop()
+
+                async def load(seconds: float) -> List[Dict[str, Any]]:
+                    return await asyncio.gather(
+                        *[
+                            loop.run_in_executor(
+                                pool,
+                                run_load,
+                                base_url,
+                                "/api/tracks/",
+                                tokens[index::load_processes] or tokens,
+                                per_process,
+                                seconds,
+                            )
+                            for index in range(load_processes)
+                        ]
+                    )
+
+                # Fill every worker's caches and connection pools first
+                await load(seconds=SCALING_WARMUP_SECONDS)
+                started = time.perf_counter()
+                runs = await load(seconds=options.scaling_seconds)
+                elapsed = time.perf_counter() - started
+            finally:
+                process.send_signal(signal.SIGTERM)
+                await process.wait()
+
+            latencies = [latency for run in runs for latency in run["latencies"]]
+            first_errors = [run["first_error"] for run in runs if run["first_error"]]
+            result = {
+                "requests": len(latencies),
+                "errors": sum(run["errors"] for run in runs),
+                "throughput_rps": round(len(latencies) / elapsed, 1),
+                **summarize(latencies=latencies),
+            }
+            if first_errors:
+                result["first_error"] = first_errors[0]
+            results[f"workers_{workers}"] = result
+    finally:
+        pool.shutdown()
+
+    single = results["workers_1"]["throughput_rps"]
+    for workers in worker_counts(max_workers=max_workers):
+        result = results[f"workers_{workers}"]
+        result["speedup"] = round(result["throughput_rps"] / single, 2) if single else 0
+    return {
+        **results,
+        "load_processes": load_processes,
+        "connections": per_process * load_processes,
+        "available_cpus": available_cpus(),
+    }
+
+
+# Shared with the tests
+SUGGEST_FIXTURE = (
+    Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "link_graph.tsv"
+)
+SUGGEST_QUERIES = 200
+SUGGEST_REQUESTS = 100
+SUGGEST_LIMIT = 10
+# Synthetic articles link mostly to articles shortly before them, some to any
+# article, and some to the first SYNTHETIC_HUBS, which become hubs
+SYNTHETIC_LOCALITY = 2000
+SYNTHETIC_HUBS = 1000
+
+
+def write_synthetic_link_graph(
+    path: str, rng: random.Random, nodes: int, edges: int
+) -> None:
+    mean_degree = edges / nodes + 0.5
+    offsets = array("Q", [0])
+    targets = array("I")
+    for node in range(nodes):
+        links = set()
+        for _ in range(int(rng.expovariate(1 / mean_degree))):
+            roll = rng.random()
+            if roll < 0.7:
+                target = max(0, node - 1 - int(rng.expovariate(1 / SYNTHETIC_LOCALITY)))
+            elif roll < 0.9:
+                target = rng.randrange(nodes)
+            else:
+                target = rng.randrange(SYNTHETIC_HUBS)
+            if target != node:
+                links.add(target)
+        targets.extend(sorted(links))
+        offsets.append(len(targets))
+    write_link_graph(
+        path=path,
+        titles=[f"Article {node:08d}" for node in range(nodes)],
+        offsets=offsets,
+        targets=targets,
+    )
+
+
+async def scenario_suggest(context: BenchmarkContext) -> Dict[str, Any]:
+    """
+    Article suggestions: the fixture graph's answer for "Deep learning",
+    then a synthetic graph of --graph-nodes articles and about --graph-edges
+    links: build time, file size, resident memory (heap and mapped file
+    pages) after mapping it and after SUGGEST_QUERIES suggestions, and
+    suggestion latency in-process and through POST /api/tracks/suggest
+    """
+    options = context.options
+    rng = random.Random(options.seed)
+    user_id = f"{BENCH_USER_PREFIX}suggest"
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        fixture_path = os.path.join(directory, "fixture.graph")
+        build_link_graph(edges=read_edges(path=str(SUGGEST_FIXTURE)), path=fixture_path)
+        fixture = LinkGraph(path=fixture_path)
+        suggestions, _ = fixture.suggest(titles=["Deep learning"], limit=SUGGEST_LIMIT)
+        fixture.close()
+        results["fixture"] = [
+            {"title": suggestion.title, "after": suggestion.prerequisites}
+            for suggestion in suggestions
+        ]
+
+        path = os.path.join(directory, "synthetic.graph")
+        start = time.perf_counter()
+        await asyncio.to_thread(
+            write_synthetic_link_graph,
+            path=path,
+            rng=rng,
+            nodes=options.graph_nodes,
+            edges=options.graph_edges,
+        )
+        build_seconds = time.perf_counter() - start
+
+        rss_before = rss_breakdown()
+        start = time.perf_counter()
+        graph = LinkGraph(path=path)
+        open_seconds = time.perf_counter() - start
+        rss_opened = rss_breakdown()
+
+        latencies = []
+        for _ in range(SUGGEST_QUERIES):
+            titles = [
+                graph.title(node=rng.randrange(graph.node_count))
+                for _ in range(rng.randint(1, 3))
+            ]
+            start = time.perf_counter()
+            graph.suggest(titles=titles, limit=SUGGEST_LIMIT)
+            latencies.append(time.perf_counter() - start)
+        rss_queried = rss_breakdown()
+        graph_stats = {
+            "nodes": graph.node_count,
+            "links": graph.edge_count,
+            "file_mb": round(graph.size_bytes / (1024 * 1024), 1),
+            "bytes_per_link": round(graph.size_bytes / graph.edge_count, 2),
+            "build_seconds": round(build_seconds, 2),
+            "open_ms": round(open_seconds * 1000, 3),
+        }
+        # Growth of the heap and of the graph's pages mapped into the process
+        for stage, rss in (("open", rss_opened), ("queries", rss_queried)):
+            for kind in ("anon", "file"):
+                graph_stats[f"rss_{kind}_after_{stage}_mb"] = round(
+                    (rss[kind] - rss_before[kind]) / (1024 * 1024), 1
+                )
+        graph.close()
+
+        service = SuggestionService(graph_path=path)
+        context.app.dependency_overrides[get_suggestion_service] = lambda: service
+        recorder = Recorder()
+        try:
+            for _ in range(SUGGEST_REQUESTS):
+                titles = [
+                    f"Article {rng.randrange(options.graph_nodes):08d}"
+                    for _ in range(rng.randint(1, 3))
+                ]
+                await context.request(
+                    recorder=recorder,
+                    operation="suggest",
+                    method="POST",
+                    url="/api/tracks/suggest",
+                    user_id=user_id,
+                    json={"titles": titles, "limit": SUGGEST_LIMIT},
+                )
+            recorder.finish()
+        finally:
+            context.app.dependency_overrides.pop(get_suggestion_service, None)
+            service.close()
+
+    results["synthetic"] = {
+        **graph_stats,
+        "in_process": summarize(latencies=latencies),
+        **recorder.summary(),
+    }
+    return results
+
+
+HOME_USERS = 5
+HOME_TRACKS_PER_USER = 200
+HOME_ARTICLES_PER_TRACK = 10
+# Share of each user's tracks already finished, per phase
+HOME_FINISHED_SHARES = {"mostly_unfinished": 0.0, "mostly_finished": 0.9}
+HOME_ROUNDS = 50
+HOME_QUEUE_LENGTH = 20
+
+
+async def finish_tracks(session: AsyncSession, track_ids: List[str]) -> None:
+    """Complete every article of ``track_ids``, counters included"""
+    now = datetime.utcnow()
+    for start in range(0, len(track_ids), SEED_BATCH_SIZE):
+        batch = track_ids[start : start + SEED_BATCH_SIZE]
+        await session.execute(
+            update(TrackItem)
+            .where(TrackItem.track_id.in_(batch), TrackItem.completed.is_(False))
+            .values(completed=True, completed_at=now)
+        )
+        await session.execute(
+            update(Track)
+            .where(Track.id.in_(batch))
+            .values(completed_count=Track.article_count)
+        )
+    await session.commit()
+
+
+async def scan_track_list(
+    context: BenchmarkContext, user_id: str
+) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    The home queue the way a client builds it from the track list: page
+    through every track with its articles and pick each unfinished track's
+    first unread article. Returns the queue, bytes received and requests.
+    """
+    queue = []
+    received = 0
+    requests = 0
+    cursor = None
+    while True:
+        params = {"limit": MAX_PAGE_SIZE, "fields": "id,title,updated_at,articles"}
+        if cursor:
+            params["cursor"] = cursor
+        response = await context.client.get(
+            "/api/tracks/", params=params, headers=context.auth_headers(user_id=user_id)
+        )
+        response.raise_for_status()
+        received += len(response.content)
+        requests += 1
+        page = response.json()
+        for track in page["items"]:
+            unread = [
+                article for article in track["articles"] if not article["completed"]
+            ]
+            if unread:
+                queue.append(
+                    {
+                        "id": track["id"],
+                        "updated_at": track["updated_at"],
+                        "next_article": unread[0],
+                    }
+                )
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    queue.sort(key=lambda track: track["updated_at"], reverse=True)
+    return queue[:HOME_QUEUE_LENGTH], received, requests
+
+
+async def scenario_home(context: BenchmarkContext) -> Dict[str, Any]:
+    """
+    GET /api/home against building the same queue from the full track list,
+    for HOME_USERS users with HOME_TRACKS_PER_USER tracks, with most tracks
+    unfinished and with most finished. Each round ends by completing the
+    first queued article, so the user's track list is never read from the
+    tracks cache.
+    """
+    rng = random.Random(context.options.seed)
+    results: Dict[str, Any] = {}
+    for phase, finished_share in HOME_FINISHED_SHARES.items():
+        dataset = await seed_dataset(
+            rng=rng,
+            users=HOME_USERS,
+            tracks_per_user=HOME_TRACKS_PER_USER,
+            articles_per_track=HOME_ARTICLES_PER_TRACK,
+        )
+        finished = [
+            track.track_id
+            for tracks in dataset.tracks_by_user.values()
+            for track in tracks[: int(len(tracks) * finished_share)]
+        ]
+        async with AsyncSession(get_engine()) as session:
+            await finish_tracks(session=session, track_ids=finished)
+
+        recorder = Recorder()
+        scan_latencies = []
+        home_bytes = []
+        scan_bytes = []
+        scan_requests = []
+        for index in range(HOME_ROUNDS):
+            user_id = dataset.user_ids[index % len(dataset.user_ids)]
+            response = await context.request(
+                recorder=recorder,
+                operation="home",
+                method="GET",
+                url="/api/home",
+                user_id=user_id,
+                params={"limit": HOME_QUEUE_LENGTH},
+            )
+            if response is None:
+                continue
+            home_bytes.append(len(response.content))
+            queue = response.json()["queue"]
+
+            start = time.perf_counter()
+            _, received, requests = await scan_track_list(
+                context=context, user_id=user_id
+            )
+            scan_latencies.append(time.perf_counter() - start)
+            scan_bytes.append(received)
+            scan_requests.append(requests)
+
+            if queue:
+                track = queue[0]
+                await context.request(
+                    recorder=recorder,
+                    operation="complete",
+                    method="PATCH",
+                    url=f"/api/tracks/{track['id']}/items/{track['next_article']['id']}",
+                    user_id=user_id,
+                    json={"completed": True},
+                )
+        recorder.finish()
+        results[phase] = {
+            **recorder.summary(),
+            "list_scan": summarize(latencies=scan_latencies),
+            "home_bytes": round(sum(home_bytes) / max(len(home_bytes), 1)),
+            "list_scan_bytes": round(sum(scan_bytes) / max(len(scan_bytes), 1)),
+            "list_scan_requests": max(scan_requests, default=0),
+        }
+    return results
+
+
+SCENARIOS: Dict[str, Callable[[BenchmarkContext], Awaitable[Dict[str, Any]]]] = {
+    "mixed": scenario_mixed,
+    "auth": scenario_auth,
+    "middleware": scenario_middleware,
+    "logging": scenario_logging,
+    "bulk": scenario_bulk,
+    "list_cpu": scenario_list_cpu,
+    "startup": scenario_startup,
+    "wikipedia": scenario_wikipedia,
+    "search": scenario_search,
+    "trending": scenario_trending,
+    "coalescing": scenario_coalescing,
+    "auth_outage": scenario_auth_outage,
+    "scaling": scenario_scaling,
+    "suggest": scenario_suggest,
+    "home": scenario_home,
+}
@@ -0,0 +1,183 @@
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from apps.backend.app.models.progress import CompletionEvent, ReadingStreak
+from apps.backend.app.models.track import POSITION_GAP, Track, TrackItem
+from apps.backend.app.models.trending import TrackActivity, TrendingTrack
+from apps.backend.app.models.user import User
+from apps.backend.app.models.wikipedia import WikipediaPage
+from apps.backend.app.repositories.tracks_repository import TracksRepository
+from apps.backend.benchmarks.environment import BENCH_USER_PREFIX
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+TOPICS = [
+    "History",
+    "Mathematics",
+    "Physics",
+    "Biology",
+    "Philosophy",
+    "Economics",
+    "Astronomy",
+    "Linguistics",
+    "Chemistry",
+    "Geography",
+    "Music theory",
+    "Computer science",
+]
+SUBTOPICS = [
+    "Overview",
+    "Timeline",
+    "Key figures",
+    "Methods",
+    "Open problems",
+    "Applications",
+    "Criticism",
+    "Glossary",
+]
+# Rows per INSERT batch while seeding, to keep statements a sane size
+SEED_BATCH_SIZE = 5000
+
+
+@dataclass
+class SeededTrack:
+    track_id: str
+    item_ids: List[str]
+
+
+@dataclass
+class Dataset:
+    """What was seeded, so workloads can address existing rows"""
+
+    tracks_by_user: Dict[str, List[SeededTrack]] = field(default_factory=dict)
+
+    @property
+    def user_ids(self) -> List[str]:
+        return list(self.tracks_by_user)
+
+
+def bench_uuid(rng: random.Random) -> str:
+    """A UUID4 drawn from ``rng``, so seeded ids repeat across runs"""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def article_title(rng: random.Random) -> str:
+    return f"Bench {rng.choice(TOPICS)}: {rng.choice(SUBTOPICS)} {rng.randint(1, 500)}"
+
+
+async def reset_benchmark_data(session: AsyncSession) -> None:
+    """Delete everything earlier benchmark runs created"""
+    bench_tracks = select(Track.id).where(Track.user_id.like(f"{BENCH_USER_PREFIX}%"))
+    await session.execute(
+        delete(TrackActivity).where(TrackActivity.track_id.in_(bench_tracks))
+    )
+    await session.execute(
+        delete(TrendingTrack).where(TrendingTrack.track_id.in_(bench_tracks))
+    )
+    await session.execute(
+        delete(CompletionEvent).where(CompletionEvent.track_id.in_(bench_tracks))
+    )
+    await session.execute(
+        delete(ReadingStreak).where(ReadingStreak.user_id.like(f"{BENCH_USER_PREFIX}%"))
+    )
+    await session.execute(delete(TrackItem).where(TrackItem.track_id.in_(bench_tracks)))
+    await session.execute(
+        delete(Track).where(Track.user_id.like(f"{BENCH_USER_PREFIX}%"))
+    )
+    await session.execute(delete(User).where(User.id.like(f"{BENCH_USER_PREFIX}%")))
+    await session.execute(
+        delete(WikipediaPage).where(WikipediaPage.title.like("Bench%"))
+    )
+    await session.commit()
+
+
+async def seed(
+    session: AsyncSession,
+    rng: random.Random,
+    users: int,
+    tracks_per_user: int,
+    articles_per_track: int,
+    user_prefix: str = BENCH_USER_PREFIX,
+) -> Dataset:
+    """
+    Create ``users`` users with ``tracks_per_user`` tracks of
+    ``articles_per_track`` articles each. Timestamps are spread over the last
+    90 days and about a third of the articles are completed.
+    """
+    tracks_repository = TracksRepository()
+    dataset = Dataset()
+    now = datetime.utcnow()
+
+    user_rows = []
+    track_rows = []
+    item_rows = []
+    for user_index in range(users):
+        user_id = f"{user_prefix}{user_index}"
+        user_rows.append(
+            {
+                "id": user_id,
+                "email": f"{user_id}@benchmark.invalid",
+                "name": f"Benchmark {user_id}",
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        dataset.tracks_by_user[user_id] = []
+        for _ in range(tracks_per_user):
+            track_id = bench_uuid(rng=rng)
+            updated_at = now - timedelta(seconds=rng.randint(0, 90 * 24 * 3600))
+            track_row = {
+                "id": track_id,
+                "user_id": user_id,
+                "title": f"Bench {rng.choice(TOPICS)} track",
+                "description": "Seeded by the benchmark suite",
+                "article_count": articles_per_track,
+                "completed_count": 0,
+                "last_activity_at": updated_at,
+                "created_at": updated_at,
+                "updated_at": updated_at,
+            }
+            track_rows.append(track_row)
+            item_ids = []
+            for position in range(1, articles_per_track + 1):
+                item_id = bench_uuid(rng=rng)
+                title = article_title(rng=rng)
+                completed = rng.random() < 0.33
+                track_row["completed_count"] += completed
+                item_rows.append(
+                    {
+                        "id": item_id,
+                        "track_id": track_id,
+                        "position": position * POSITION_GAP,
+                        "title": title,
+                        "url": f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}",
+                        "description": None,
+                        "completed": completed,
+                        "completed_at": updated_at if completed else None,
+                        "created_at": updated_at,
+                        "updated_at": updated_at,
+                    }
+                )
+                item_ids.append(item_id)
+            dataset.tracks_by_user[user_id].append(
+                SeededTrack(track_id=track_id, item_ids=item_ids)
+            )
+
+    if user_rows:
+        await session.execute(insert(User), user_rows)
+        await session.commit()
+    # All tracks go in before any items, so every item's track exists
+    for start in range(0, len(track_rows), SEED_BATCH_SIZE):
+        await tracks_repository.bulk_create(
+            tracks=track_rows[start : start + SEED_BATCH_SIZE],
+            items=[],
+            session=session,
+        )
+    for start in range(0, len(item_rows), SEED_BATCH_SIZE):
+        await tracks_repository.bulk_create(
+            tracks=[], items=item_rows[start : start + SEED_BATCH_SIZE], session=session
+        )
+    return dataset
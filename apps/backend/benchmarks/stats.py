@@ -0,0 +1,200 @@
+import contextvars
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Metric names compared against a baseline, and which direction is worse
+HIGHER_IS_WORSE = {
+    "p50_ms",
+    "p95_ms",
+    "p99_ms",
+    "db_queries_per_request",
+    "cpu_ms_per_request",
+    "peak_rss_delta_mb",
+    "import_seconds",
+    "first_response_seconds",
+    "log_call_ns",
+    "upstream_requests_per_create",
+}
+LOWER_IS_WORSE = {"throughput_rps", "cache_hit_ratio"}
+
+_query_counter: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar(
+    "benchmark_query_counter", default=None
+)
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(values)))
+    return values[rank - 1]
+
+
+def summarize(latencies: Sequence[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds"""
+    ordered = sorted(latencies)
+    if not ordered:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0}
+    return {
+        "p50_ms": round(percentile(values=ordered, fraction=0.50) * 1000, 3),
+        "p95_ms": round(percentile(values=ordered, fraction=0.95) * 1000, 3),
+        "p99_ms": round(percentile(values=ordered, fraction=0.99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+class Measurement:
+    """Outcome of one measured request; ``fail`` marks it as an error"""
+
+    __slots__ = ("error",)
+
+    def __init__(self):
+        self.error: Optional[str] = None
+
+    def fail(self, detail: str) -> None:
+        self.error = detail
+
+
+class OperationStats:
+    """Latencies, errors and database queries recorded for one operation"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.first_error: Optional[str] = None
+        self.queries = 0
+
+    def summary(self) -> Dict[str, Any]:
+        count = len(self.latencies)
+        summary = {
+            "requests": count,
+            "errors": self.errors,
+            **summarize(latencies=self.latencies),
+            "db_queries_per_request": round(self.queries / count, 3) if count else 0,
+        }
+        if self.first_error is not None:
+            summary["first_error"] = self.first_error
+        return summary
+
+
+class Recorder:
+    """Collects per-operation statistics for one workload run"""
+
+    def __init__(self):
+        self.operations: Dict[str, OperationStats] = {}
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+
+    @contextmanager
+    def measure(self, operation: str) -> Iterator[Measurement]:
+        """Time one request and count the statements it executes"""
+        stats = self.operations.setdefault(operation, OperationStats())
+        counter = [0]
+        token = _query_counter.set(counter)
+        measurement = Measurement()
+        start = time.perf_counter()
+        try:
+            yield measurement
+        except Exception as e:
+            measurement.fail(detail=repr(e))
+            raise
+        finally:
+            stats.latencies.append(time.perf_counter() - start)
+            stats.queries += counter[0]
+            if measurement.error is not None:
+                stats.errors += 1
+                stats.first_error = stats.first_error or measurement.error
+            _query_counter.reset(token)
+
+    def finish(self) -> None:
+        self.finished_at = time.perf_counter()
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        all_latencies: List[float] = []
+        errors = 0
+        queries = 0
+        for stats in self.operations.values():
+            all_latencies.extend(stats.latencies)
+            errors += stats.errors
+            queries += stats.queries
+        count = len(all_latencies)
+        return {
+            "requests": count,
+            "errors": errors,
+            "seconds": round(elapsed, 3),
+            "throughput_rps": round(count / elapsed, 1) if elapsed else 0,
+            **summarize(latencies=all_latencies),
+            "db_queries_per_request": round(queries / count, 3) if count else 0,
+            "db_queries_per_second": round(queries / elapsed, 1) if elapsed else 0,
+            "operations": {
+                name: stats.summary() for name, stats in sorted(self.operations.items())
+            },
+        }
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def count_queries(engine: Engine) -> None:
+    """
+    Attribute statements executed through ``engine`` (a sync Engine) to the
+    request being measured. The counter lives in a context variable, which
+    follows each request through the async driver's greenlets.
+    """
+    event.listen(engine, "before_cursor_execute", _count_query)
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Regressions of ``current`` against ``baseline``: every compared metric
+    that got worse by more than ``threshold`` (a fraction, 0.1 = 10%).
+    """
+    regressions = []
+    for name, scenario in current.get("scenarios", {}).items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        for path, old, new in _paired_metrics(previous=previous, current=scenario):
+            metric = path[-1]
+            if old <= 0:
+                # A path that needed no queries and now does has regressed,
+                # however small the new count
+                if metric == "db_queries_per_request" and new > 0:
+                    regressions.append(f"{name}.{'.'.join(path)}: {old} -> {new}")
+                continue
+            change = (new - old) / old
+            if (metric in HIGHER_IS_WORSE and change > threshold) or (
+                metric in LOWER_IS_WORSE and -change > threshold
+            ):
+                regressions.append(
+                    f"{name}.{'.'.join(path)}: {old} -> {new} ({change:+.1%})"
+                )
+    return regressions
+
+
+def _paired_metrics(
+    previous: Dict[str, Any], current: Dict[str, Any], path: Tuple[str, ...] = ()
+) -> Iterator[Tuple[Tuple[str, ...], float, float]]:
+    for key, value in current.items():
+        if key not in previous:
+            continue
+        if isinstance(value, dict) and isinstance(previous[key], dict):
+            yield from _paired_metrics(
+                previous=previous[key], current=value, path=path + (key,)
+            )
+        elif (key in HIGHER_IS_WORSE or key in LOWER_IS_WORSE) and isinstance(
+            previous[key], (int, float)
+        ):
+            yield path + (key,), previous[key], value
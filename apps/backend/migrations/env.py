@@ -0,0 +1,76 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from apps.backend.app.database import DATABASE_URL
+from apps.backend.app.models import (  # noqa: F401 (registers tables)
+    job,
+    progress,
+    track,
+    trending,
+    user,
+    wikipedia,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = SQLModel.metadata
+
+# Maintained by the search triggers (0004_track_search) rather than declared
+# on the models, so autogenerate must not drop them
+UNMANAGED_OBJECTS = {
+    "search_text",
+    "search_vector",
+    "search_words",
+    "ix_tracks_user_id_search_vector",
+    "ix_search_words_word_trgm",
+}
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    return not (reflected and compare_to is None and name in UNMANAGED_OBJECTS)
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting to the database"""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    """Run migrations over the app's async driver"""
+    engine = create_async_engine(DATABASE_URL)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
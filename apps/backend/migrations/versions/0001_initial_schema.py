@@ -0,0 +1,67 @@
+"""Initial schema: users and tracks
+
+Databases created earlier by SQLModel.metadata.create_all already have these
+tables; in that case only the missing pieces (e.g. the keyset pagination
+index) are added, so the migration can be applied to them as-is.
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_initial_schema"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if "users" not in tables:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("name", sa.String(), nullable=True),
+            sa.Column("avatar_url", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"])
+
+    if "tracks" not in tables:
+        op.create_table(
+            "tracks",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("articles", sa.JSON(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_tracks_user_id", "tracks", ["user_id"])
+
+    track_indexes = {index["name"] for index in inspector.get_indexes("tracks")}
+    if "ix_tracks_user_id_updated_at_id" not in track_indexes:
+        op.create_index(
+            "ix_tracks_user_id_updated_at_id",
+            "tracks",
+            ["user_id", "updated_at", "id"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("tracks")
+    op.drop_table("users")
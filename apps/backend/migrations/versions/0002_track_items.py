@@ -0,0 +1,152 @@
+"""Normalize tracks.articles into the track_items table
+
+Existing JSON article lists are copied into track_items in chunks of tracks
+(keyset on tracks.id, so memory stays bounded on large tables) before the
+JSON column is dropped. The downgrade rebuilds the JSON column from the items.
+
+Revision ID: 0002_track_items
+Revises: 0001_initial_schema
+Create Date: 2026-10-17
+"""
+
+import uuid
+from collections import defaultdict
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_track_items"
+down_revision: Union[str, None] = "0001_initial_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+POSITION_GAP = 1024
+
+tracks = sa.table(
+    "tracks",
+    sa.column("id", sa.String()),
+    sa.column("articles", sa.JSON()),
+    sa.column("updated_at", sa.DateTime()),
+)
+
+track_items = sa.table(
+    "track_items",
+    sa.column("id", sa.String()),
+    sa.column("track_id", sa.String()),
+    sa.column("position", sa.Integer()),
+    sa.column("title", sa.String()),
+    sa.column("url", sa.String()),
+    sa.column("description", sa.String()),
+    sa.column("completed", sa.Boolean()),
+    sa.column("completed_at", sa.DateTime()),
+    sa.column("created_at", sa.DateTime()),
+    sa.column("updated_at", sa.DateTime()),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "track_items",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("track_id", sa.String(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("completed", sa.Boolean(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["track_id"], ["tracks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_track_items_track_id_position", "track_items", ["track_id", "position"]
+    )
+
+    bind = op.get_bind()
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(tracks.c.id, tracks.c.articles, tracks.c.updated_at)
+            .where(tracks.c.id > last_id)
+            .order_by(tracks.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        items = []
+        for row in rows:
+            for index, article in enumerate(row.articles or []):
+                completed = bool(article.get("completed", False))
+                items.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "track_id": row.id,
+                        "position": (index + 1) * POSITION_GAP,
+                        "title": article["title"],
+                        "url": article["url"],
+                        "description": article.get("description"),
+                        "completed": completed,
+                        # Best available approximation of when it was completed
+                        "completed_at": row.updated_at if completed else None,
+                        "created_at": row.updated_at,
+                        "updated_at": row.updated_at,
+                    }
+                )
+        if items:
+            bind.execute(track_items.insert(), items)
+        last_id = rows[-1].id
+
+    with op.batch_alter_table("tracks") as batch_op:
+        batch_op.drop_column("articles")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("tracks") as batch_op:
+        batch_op.add_column(sa.Column("articles", sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    last_id = ""
+    while True:
+        track_ids = (
+            bind.execute(
+                sa.select(tracks.c.id)
+                .where(tracks.c.id > last_id)
+                .order_by(tracks.c.id)
+                .limit(BATCH_SIZE)
+            )
+            .scalars()
+            .all()
+        )
+        if not track_ids:
+            break
+
+        articles = defaultdict(list)
+        for item in bind.execute(
+            sa.select(track_items)
+            .where(track_items.c.track_id.in_(track_ids))
+            .order_by(track_items.c.track_id, track_items.c.position)
+        ):
+            articles[item.track_id].append(
+                {
+                    "title": item.title,
+                    "url": item.url,
+                    "description": item.description,
+                    "completed": item.completed,
+                }
+            )
+        for track_id in track_ids:
+            bind.execute(
+                tracks.update()
+                .where(tracks.c.id == track_id)
+                .values(articles=articles[track_id])
+            )
+        last_id = track_ids[-1]
+
+    op.drop_index("ix_track_items_track_id_position", table_name="track_items")
+    op.drop_table("track_items")
@@ -0,0 +1,36 @@
+"""Add the wikipedia_pages metadata cache
+
+Revision ID: 0003_wikipedia_pages
+Revises: 0002_track_items
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_wikipedia_pages"
+down_revision: Union[str, None] = "0002_track_items"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "wikipedia_pages",
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("page_id", sa.Integer(), nullable=True),
+        sa.Column("canonical_title", sa.String(), nullable=True),
+        sa.Column("url", sa.String(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("title"),
+    )
+    op.create_index("ix_wikipedia_pages_fetched_at", "wikipedia_pages", ["fetched_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_wikipedia_pages_fetched_at", table_name="wikipedia_pages")
+    op.drop_table("wikipedia_pages")
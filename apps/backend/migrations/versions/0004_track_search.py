@@ -0,0 +1,202 @@
+"""Full-text search over tracks and their articles
+
+Each track gets a search document covering its title, description and its
+articles' titles and descriptions: ``search_text`` (plain text, for snippets
+and the search vocabulary) and ``search_vector`` (weighted tsvector). Both
+are kept current by triggers: a row trigger on tracks, and statement-level
+triggers on track_items that refresh each affected track once per statement,
+so bulk inserts don't recompute a track per item. Item updates only refresh
+tracks whose article titles or descriptions changed.
+
+The GIN index leads with user_id (btree_gin), so a search only walks the
+searching user's entries. Typo tolerance works on ``search_words``, the
+vocabulary of every indexed document: misspelled query words are corrected
+against it by trigram similarity and the corrected query is searched as
+usual, which stays cheap however many tracks contain the intended word.
+Words are only ever added; a stale word at worst yields an empty search.
+
+Revision ID: 0004_track_search
+Revises: 0003_wikipedia_pages
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_track_search"
+down_revision: Union[str, None] = "0003_wikipedia_pages"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# One statement per entry: asyncpg runs a single command per execute
+SEARCH_FUNCTIONS = [
+    """
+CREATE FUNCTION search_words_add(document text) RETURNS void
+LANGUAGE sql AS $$
+    INSERT INTO search_words (word)
+    SELECT DISTINCT word
+    FROM unnest(tsvector_to_array(to_tsvector('simple', document))) AS word
+    WHERE word ~ '^[[:alpha:]]{3,40}$'
+    ON CONFLICT DO NOTHING
+$$
+""",
+    """
+CREATE FUNCTION tracks_search_vector(
+    title text, description text, item_titles text, item_descriptions text
+) RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+    SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(item_titles, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        || setweight(to_tsvector('english', coalesce(item_descriptions, '')), 'D')
+$$
+""",
+    """
+CREATE FUNCTION tracks_search_refresh(track_ids text[]) RETURNS void
+LANGUAGE sql AS $$
+    UPDATE tracks
+    SET search_text = concat_ws(
+            ' ', tracks.title, tracks.description,
+            items.titles, items.descriptions
+        ),
+        search_vector = tracks_search_vector(
+            tracks.title, tracks.description, items.titles, items.descriptions
+        )
+    FROM (
+        SELECT t.id,
+               string_agg(i.title, ' ' ORDER BY i.position) AS titles,
+               string_agg(i.description, ' ' ORDER BY i.position) AS descriptions
+        FROM tracks t
+        LEFT JOIN track_items i ON i.track_id = t.id
+        WHERE t.id = ANY(track_ids)
+        GROUP BY t.id
+    ) AS items
+    WHERE tracks.id = items.id;
+
+    SELECT search_words_add(search_text) FROM tracks WHERE id = ANY(track_ids);
+$$
+""",
+    """
+CREATE FUNCTION tracks_search_before_write() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    item_titles text;
+    item_descriptions text;
+BEGIN
+    SELECT string_agg(title, ' ' ORDER BY position),
+           string_agg(description, ' ' ORDER BY position)
+    INTO item_titles, item_descriptions
+    FROM track_items
+    WHERE track_id = NEW.id;
+
+    NEW.search_text := concat_ws(
+        ' ', NEW.title, NEW.description, item_titles, item_descriptions
+    );
+    NEW.search_vector := tracks_search_vector(
+        NEW.title, NEW.description, item_titles, item_descriptions
+    );
+    PERFORM search_words_add(NEW.search_text);
+    RETURN NEW;
+END
+$$
+""",
+    """
+CREATE FUNCTION track_items_search_changed() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM tracks_search_refresh(
+        ARRAY(SELECT DISTINCT track_id FROM changed_items)
+    );
+    RETURN NULL;
+END
+$$
+""",
+    """
+CREATE FUNCTION track_items_search_updated() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM tracks_search_refresh(
+        ARRAY(
+            SELECT DISTINCT new_items.track_id
+            FROM new_items
+            JOIN old_items ON old_items.id = new_items.id
+            WHERE old_items.title IS DISTINCT FROM new_items.title
+               OR old_items.description IS DISTINCT FROM new_items.description
+               OR old_items.track_id IS DISTINCT FROM new_items.track_id
+        )
+    );
+    RETURN NULL;
+END
+$$
+""",
+]
+
+SEARCH_TRIGGERS = [
+    """
+CREATE TRIGGER tracks_search_before_write
+    BEFORE INSERT OR UPDATE OF title, description ON tracks
+    FOR EACH ROW EXECUTE FUNCTION tracks_search_before_write()
+""",
+    """
+CREATE TRIGGER track_items_search_inserted
+    AFTER INSERT ON track_items
+    REFERENCING NEW TABLE AS changed_items
+    FOR EACH STATEMENT EXECUTE FUNCTION track_items_search_changed()
+""",
+    """
+CREATE TRIGGER track_items_search_deleted
+    AFTER DELETE ON track_items
+    REFERENCING OLD TABLE AS changed_items
+    FOR EACH STATEMENT EXECUTE FUNCTION track_items_search_changed()
+""",
+    """
+CREATE TRIGGER track_items_search_updated
+    AFTER UPDATE ON track_items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION track_items_search_updated()
+""",
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    op.execute("ALTER TABLE tracks ADD COLUMN search_text text NOT NULL DEFAULT ''")
+    op.execute(
+        "ALTER TABLE tracks ADD COLUMN search_vector tsvector NOT NULL "
+        "DEFAULT ''::tsvector"
+    )
+    op.execute("CREATE TABLE search_words (word text PRIMARY KEY)")
+    op.execute(
+        "CREATE INDEX ix_search_words_word_trgm "
+        "ON search_words USING gin (word gin_trgm_ops)"
+    )
+    for statement in SEARCH_FUNCTIONS + SEARCH_TRIGGERS:
+        op.execute(statement)
+
+    # Backfill existing tracks
+    op.execute("SELECT tracks_search_refresh(ARRAY(SELECT id FROM tracks))")
+
+    op.execute(
+        "CREATE INDEX ix_tracks_user_id_search_vector "
+        "ON tracks USING gin (user_id, search_vector)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX ix_tracks_user_id_search_vector")
+    op.execute("DROP TRIGGER track_items_search_updated ON track_items")
+    op.execute("DROP TRIGGER track_items_search_deleted ON track_items")
+    op.execute("DROP TRIGGER track_items_search_inserted ON track_items")
+    op.execute("DROP TRIGGER tracks_search_before_write ON tracks")
+    op.execute("DROP FUNCTION track_items_search_updated()")
+    op.execute("DROP FUNCTION track_items_search_changed()")
+    op.execute("DROP FUNCTION tracks_search_before_write()")
+    op.execute("DROP FUNCTION tracks_search_refresh(text[])")
+    op.execute("DROP FUNCTION tracks_search_vector(text, text, text, text)")
+    op.execute("DROP FUNCTION search_words_add(text)")
+    op.execute("DROP TABLE search_words")
+    op.execute("ALTER TABLE tracks DROP COLUMN search_vector")
+    op.execute("ALTER TABLE tracks DROP COLUMN search_text")
@@ -0,0 +1,91 @@
+"""Public tracks, track activity and the trending ranking
+
+Tracks get a visibility and, for copies joined from a public track, the
+source track. track_activity logs joins and completions credited to public
+tracks; the trending refresh folds unranked activity into trending_tracks.
+
+Revision ID: 0005_trending
+Revises: 0004_track_search
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_trending"
+down_revision: Union[str, None] = "0004_track_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tracks",
+        sa.Column("visibility", sa.String(), nullable=False, server_default="private"),
+    )
+    op.add_column("tracks", sa.Column("source_track_id", sa.String(), nullable=True))
+    op.create_foreign_key(
+        "tracks_source_track_id_fkey",
+        "tracks",
+        "tracks",
+        ["source_track_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index(
+        "ix_tracks_source_track_id_user_id",
+        "tracks",
+        ["source_track_id", "user_id"],
+        unique=True,
+    )
+
+    op.create_table(
+        "track_activity",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("track_id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("weight", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("ranked", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["track_id"], ["tracks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_track_activity_track_id", "track_activity", ["track_id"])
+    op.create_index(
+        "ix_track_activity_unranked",
+        "track_activity",
+        ["id"],
+        postgresql_where=sa.text("NOT ranked"),
+    )
+
+    op.create_table(
+        "trending_tracks",
+        sa.Column("track_id", sa.String(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("last_activity_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["track_id"], ["tracks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("track_id"),
+    )
+    op.create_index(
+        "ix_trending_tracks_score_track_id", "trending_tracks", ["score", "track_id"]
+    )
+    op.create_index(
+        "ix_trending_tracks_last_activity_at", "trending_tracks", ["last_activity_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trending_tracks_last_activity_at", table_name="trending_tracks")
+    op.drop_index("ix_trending_tracks_score_track_id", table_name="trending_tracks")
+    op.drop_table("trending_tracks")
+    op.drop_index("ix_track_activity_unranked", table_name="track_activity")
+    op.drop_index("ix_track_activity_track_id", table_name="track_activity")
+    op.drop_table("track_activity")
+    op.drop_index("ix_tracks_source_track_id_user_id", table_name="tracks")
+    op.drop_constraint("tracks_source_track_id_fkey", "tracks", type_="foreignkey")
+    op.drop_column("tracks", "source_track_id")
+    op.drop_column("tracks", "visibility")
@@ -0,0 +1,160 @@
+"""Progress counters, completion events and reading streaks for the home queue
+
+Tracks get counters of their articles and completed articles plus the time
+of their latest activity, maintained by the service on every item write, so
+the home queue reads unfinished tracks from a partial index instead of
+scanning items. completion_events logs article completions and
+reading_streaks holds each user's streak, advanced with every completion.
+
+Existing data is backfilled: counters from the items, one completion event
+per completed item (at its completed_at) and streaks from those events.
+
+Revision ID: 0006_home_progress
+Revises: 0005_trending
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_home_progress"
+down_revision: Union[str, None] = "0005_trending"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_COUNTERS = """
+UPDATE tracks
+SET article_count = items.article_count,
+    completed_count = items.completed_count,
+    last_activity_at = greatest(tracks.created_at, items.last_completed_at)
+FROM (
+    SELECT track_id,
+           count(*) AS article_count,
+           count(*) FILTER (WHERE completed) AS completed_count,
+           max(completed_at) AS last_completed_at
+    FROM track_items
+    GROUP BY track_id
+) AS items
+WHERE tracks.id = items.track_id
+"""
+
+BACKFILL_EVENTS = """
+INSERT INTO completion_events (user_id, track_id, item_id, created_at)
+SELECT tracks.user_id, tracks.id, track_items.id, track_items.completed_at
+FROM track_items
+JOIN tracks ON tracks.id = track_items.track_id
+WHERE track_items.completed AND track_items.completed_at IS NOT NULL
+ORDER BY track_items.completed_at
+"""
+
+# Runs of consecutive days per user (gaps and islands); the latest run is the
+# current streak
+BACKFILL_STREAKS = """
+INSERT INTO reading_streaks (
+    user_id, current_streak, longest_streak, last_day, last_day_completions
+)
+WITH days AS (
+    SELECT user_id, created_at::date AS day, count(*) AS completions
+    FROM completion_events
+    GROUP BY user_id, created_at::date
+), runs AS (
+    SELECT user_id, day, completions,
+           day - (row_number() OVER (PARTITION BY user_id ORDER BY day))::int
+               AS run_start
+    FROM days
+), run_lengths AS (
+    SELECT user_id, run_start, count(*) AS length, max(day) AS last_day
+    FROM runs
+    GROUP BY user_id, run_start
+)
+SELECT DISTINCT ON (run_lengths.user_id)
+       run_lengths.user_id,
+       run_lengths.length,
+       max(run_lengths.length) OVER (PARTITION BY run_lengths.user_id),
+       run_lengths.last_day,
+       days.completions
+FROM run_lengths
+JOIN days
+  ON days.user_id = run_lengths.user_id AND days.day = run_lengths.last_day
+ORDER BY run_lengths.user_id, run_lengths.last_day DESC
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tracks",
+        sa.Column("article_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "tracks",
+        sa.Column("completed_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "tracks",
+        sa.Column(
+            "last_activity_at",
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.text("(now() AT TIME ZONE 'utc')"),
+        ),
+    )
+    op.execute("UPDATE tracks SET last_activity_at = created_at")
+    op.execute(BACKFILL_COUNTERS)
+    op.create_index(
+        "ix_tracks_user_id_active",
+        "tracks",
+        ["user_id", "last_activity_at", "id"],
+        postgresql_where=sa.text("completed_count < article_count"),
+    )
+    op.create_index(
+        "ix_track_items_unread",
+        "track_items",
+        ["track_id", "position"],
+        postgresql_where=sa.text("NOT completed"),
+    )
+
+    op.create_table(
+        "completion_events",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("track_id", sa.String(), nullable=False),
+        sa.Column("item_id", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["track_id"], ["tracks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_completion_events_user_id_created_at",
+        "completion_events",
+        ["user_id", "created_at"],
+    )
+    op.create_index("ix_completion_events_track_id", "completion_events", ["track_id"])
+
+    op.create_table(
+        "reading_streaks",
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("current_streak", sa.Integer(), nullable=False),
+        sa.Column("longest_streak", sa.Integer(), nullable=False),
+        sa.Column("last_day", sa.Date(), nullable=False),
+        sa.Column("last_day_completions", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.execute(BACKFILL_EVENTS)
+    op.execute(BACKFILL_STREAKS)
+
+
+def downgrade() -> None:
+    op.drop_table("reading_streaks")
+    op.drop_index("ix_completion_events_track_id", table_name="completion_events")
+    op.drop_index(
+        "ix_completion_events_user_id_created_at", table_name="completion_events"
+    )
+    op.drop_table("completion_events")
+    op.drop_index("ix_track_items_unread", table_name="track_items")
+    op.drop_index("ix_tracks_user_id_active", table_name="tracks")
+    op.drop_column("tracks", "last_activity_at")
+    op.drop_column("tracks", "completed_count")
+    op.drop_column("tracks", "article_count")
@@ -0,0 +1,129 @@
+"""Per-user search vocabulary
+
+search_words held the words of every user's tracks, so spelling corrections
+could reveal words from other users' private tracks. The vocabulary is now
+keyed by user: each track's words are added under its owner, corrections
+only consider the searching user's words, and the trigram index leads with
+user_id (btree_gin). The table is rebuilt from the current tracks.
+
+Revision ID: 0008_search_words_per_user
+Revises: 0007_jobs
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_search_words_per_user"
+down_revision: Union[str, None] = "0007_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_WORDS_ADD = """
+CREATE FUNCTION search_words_add(owner text, document text) RETURNS void
+LANGUAGE sql AS $$
+    INSERT INTO search_words (user_id, word)
+    SELECT DISTINCT owner, word
+    FROM unnest(tsvector_to_array(to_tsvector('simple', document))) AS word
+    WHERE word ~ '^[[:alpha:]]{3,40}$'
+    ON CONFLICT DO NOTHING
+$$
+"""
+
+# The previous definition of search_words_add, for downgrades
+GLOBAL_SEARCH_WORDS_ADD = """
+CREATE FUNCTION search_words_add(document text) RETURNS void
+LANGUAGE sql AS $$
+    INSERT INTO search_words (word)
+    SELECT DISTINCT word
+    FROM unnest(tsvector_to_array(to_tsvector('simple', document))) AS word
+    WHERE word ~ '^[[:alpha:]]{3,40}$'
+    ON CONFLICT DO NOTHING
+$$
+"""
+
+TRACKS_SEARCH_REFRESH = """
+CREATE OR REPLACE FUNCTION tracks_search_refresh(track_ids text[]) RETURNS void
+LANGUAGE sql AS $$
+    UPDATE tracks
+    SET search_text = concat_ws(
+            ' ', tracks.title, tracks.description,
+            items.titles, items.descriptions
+        ),
+        search_vector = tracks_search_vector(
+            tracks.title, tracks.description, items.titles, items.descriptions
+        )
+    FROM (
+        SELECT t.id,
+               string_agg(i.title, ' ' ORDER BY i.position) AS titles,
+               string_agg(i.description, ' ' ORDER BY i.position) AS descriptions
+        FROM tracks t
+        LEFT JOIN track_items i ON i.track_id = t.id
+        WHERE t.id = ANY(track_ids)
+        GROUP BY t.id
+    ) AS items
+    WHERE tracks.id = items.id;
+
+    SELECT search_words_add({arguments}) FROM tracks WHERE id = ANY(track_ids);
+$$
+"""
+
+TRACKS_SEARCH_BEFORE_WRITE = """
+CREATE OR REPLACE FUNCTION tracks_search_before_write() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    item_titles text;
+    item_descriptions text;
+BEGIN
+    SELECT string_agg(title, ' ' ORDER BY position),
+           string_agg(description, ' ' ORDER BY position)
+    INTO item_titles, item_descriptions
+    FROM track_items
+    WHERE track_id = NEW.id;
+
+    NEW.search_text := concat_ws(
+        ' ', NEW.title, NEW.description, item_titles, item_descriptions
+    );
+    NEW.search_vector := tracks_search_vector(
+        NEW.title, NEW.description, item_titles, item_descriptions
+    );
+    PERFORM search_words_add({arguments});
+    RETURN NEW;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.execute("DROP TABLE search_words")
+    op.execute(
+        "CREATE TABLE search_words ("
+        "user_id text NOT NULL, word text NOT NULL, PRIMARY KEY (user_id, word))"
+    )
+    op.execute(
+        "CREATE INDEX ix_search_words_user_id_word_trgm "
+        "ON search_words USING gin (user_id, word gin_trgm_ops)"
+    )
+    op.execute("DROP FUNCTION search_words_add(text)")
+    op.execute(SEARCH_WORDS_ADD)
+    op.execute(TRACKS_SEARCH_REFRESH.format(arguments="user_id, search_text"))
+    op.execute(
+        TRACKS_SEARCH_BEFORE_WRITE.format(arguments="NEW.user_id, NEW.search_text")
+    )
+    op.execute("SELECT search_words_add(user_id, search_text) FROM tracks")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE search_words")
+    op.execute("CREATE TABLE search_words (word text PRIMARY KEY)")
+    op.execute(
+        "CREATE INDEX ix_search_words_word_trgm "
+        "ON search_words USING gin (word gin_trgm_ops)"
+    )
+    op.execute(GLOBAL_SEARCH_WORDS_ADD)
+    op.execute(TRACKS_SEARCH_REFRESH.format(arguments="search_text"))
+    op.execute(TRACKS_SEARCH_BEFORE_WRITE.format(arguments="NEW.search_text"))
+    op.execute("DROP FUNCTION search_words_add(text, text)")
+    op.execute("SELECT search_words_add(search_text) FROM tracks")
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import uuid
+from typing import Dict, List
+
+import httpx
+import pytest
+from apps.backend.benchmarks.environment import (
+    BENCH_JWT_SECRET,
+    BENCH_SUPABASE_URL,
+    WikipediaStub,
+    make_token,
+)
+from sqlalchemy import event
+from sqlmodel import SQLModel
+
+TEST_DATABASE_PATH = os.path.join(tempfile.gettempdir(), "project-vista-tests.db")
+
+# Before the app is imported, since it reads its settings at import time.
+# Tokens are signed with the benchmark secret and verified locally.
+os.environ.update(
+    DATABASE_URL=f"sqlite+aiosqlite:///{TEST_DATABASE_PATH}",
+    SUPABASE_URL=BENCH_SUPABASE_URL,
+    SUPABASE_SERVICE_ROLE_KEY="test",
+    SUPABASE_JWT_SECRET=BENCH_JWT_SECRET,
+    AUTH_VERIFICATION_MODE="local",
+    TRACKS_CACHE_BACKEND="memory",
+    ENVIRONMENT="test",
+    # Nothing listens here; tests that resolve articles use the Wikipedia stub
+    WIKIPEDIA_API_URL="http://127.0.0.1:9/w/api.php",
+)
+
+from apps.backend.app.database import get_engine  # noqa: E402
+from apps.backend.app.main import app  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def database():
+    """A fresh SQLite schema per test"""
+    engine = get_engine()
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.drop_all)
+        await connection.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(database):
+    """The app over ASGI, without its lifespan (no background tasks)"""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def user_id() -> str:
+    # Unique per test, so per-user caches never carry over between tests
+    return f"test-{uuid.uuid4().hex}"
+
+
+@pytest.fixture
+def headers(user_id) -> Dict[str, str]:
+    """Authenticates requests as ``user_id``"""
+    return {"Authorization": f"Bearer {make_token(user_id=user_id)}"}
+
+
+@pytest.fixture
+async def wikipedia_stub():
+    """A local MediaWiki API; see WikipediaStub for the pages it knows"""
+    stub = WikipediaStub(latency_seconds=0.05)
+    await stub.start()
+    yield stub
+    await stub.close()
+
+
+@pytest.fixture
+def statements(database):
+    """SQL statements run while the test records (``statements.clear()`` to reset)"""
+    executed: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(database.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(database.sync_engine, "before_cursor_execute", record)
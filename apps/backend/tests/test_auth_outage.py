@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from apps.backend.app import auth
+from apps.backend.app.token_verifier import (
+    AuthProviderUnavailableError,
+    TokenVerificationError,
+    TokenVerifier,
+)
+from apps.backend.benchmarks.environment import (
+    BENCH_SUPABASE_URL,
+    StubSupabaseClient,
+    make_token,
+)
+
+pytestmark = pytest.mark.anyio
+
+REMOTE_TIMEOUT_SECONDS = 0.1
+BREAKER_RESET_SECONDS = 0.2
+
+
+@pytest.fixture
+def supabase():
+    return StubSupabaseClient(latency_seconds=0.005)
+
+
+@pytest.fixture
+def verifier(supabase, monkeypatch) -> TokenVerifier:
+    """A remote-mode verifier against the stub client, also used by the app"""
+    verifier = TokenVerifier(
+        supabase_client_factory=lambda: supabase,
+        supabase_url=BENCH_SUPABASE_URL,
+        mode="remote",
+        remote_timeout_seconds=REMOTE_TIMEOUT_SECONDS,
+        breaker_failure_threshold=3,
+        breaker_reset_seconds=BREAKER_RESET_SECONDS,
+    )
+    monkeypatch.setattr(auth, "_token_verifier", verifier)
+    return verifier
+
+
+async def test_verifies_with_supabase(verifier, supabase, user_id):
+    identity = await verifier.verify(token=make_token(user_id=user_id))
+
+    assert identity.user_id == user_id
+    assert supabase.auth.calls == 1
+
+
+async def test_expired_token_is_rejected_once(verifier, supabase, user_id):
+    expired = make_token(user_id=user_id, expires_in=-60)
+
+    for _ in range(5):
+        with pytest.raises(TokenVerificationError):
+            await verifier.verify(token=expired)
+
+    assert supabase.auth.calls == 1
+    # Rejections are answers, so they don't count towards opening the circuit
+    assert verifier.breaker.state == "closed"
+
+
+async def test_latency_spike_past_the_timeout(verifier, supabase, user_id):
+    supabase.auth.spike_seconds = REMOTE_TIMEOUT_SECONDS * 3
+    supabase.auth.spike_every = 2
+
+    await verifier.verify(token=make_token(user_id=f"{user_id}-1"))
+    with pytest.raises(AuthProviderUnavailableError):
+        await verifier.verify(token=make_token(user_id=f"{user_id}-2"))
+    identity = await verifier.verify(token=make_token(user_id=f"{user_id}-3"))
+
+    assert identity.user_id == f"{user_id}-3"
+    assert verifier.breaker.state == "closed"
+
+
+async def test_outage_opens_the_circuit_until_reset(verifier, supabase, user_id):
+    supabase.auth.outage = True
+    for index in range(3):
+        with pytest.raises(AuthProviderUnavailableError):
+            await verifier.verify(token=make_token(user_id=f"{user_id}-{index}"))
+    calls = supabase.auth.calls
+
+    # Open: fails at once without calling Supabase
+    with pytest.raises(AuthProviderUnavailableError):
+        await verifier.verify(token=make_token(user_id=f"{user_id}-open"))
+    assert supabase.auth.calls == calls
+
+    supabase.auth.outage = False
+    await asyncio.sleep(BREAKER_RESET_SECONDS)
+    identity = await verifier.verify(token=make_token(user_id=f"{user_id}-back"))
+
+    assert identity.user_id == f"{user_id}-back"
+    assert verifier.breaker.state == "closed"
+
+
+async def test_app_answers_503_while_supabase_is_down(
+    client, verifier, supabase, user_id, headers
+):
+    supabase.auth.outage = True
+
+    response = await client.get("/api/user/profile", headers=headers)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(int(BREAKER_RESET_SECONDS))
+
+    supabase.auth.outage = False
+    response = await client.get("/api/user/profile", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == user_id
+
+
+async def test_app_answers_401_for_an_expired_token(client, verifier, user_id):
+    token = make_token(user_id=user_id, expires_in=-60)
+
+    response = await client.get(
+        "/api/user/profile", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 401
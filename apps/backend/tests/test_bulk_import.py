@@ -0,0 +1,91 @@
+from typing import Any, Dict
+
+import pytest
+from apps.backend.app.services import tracks_service as tracks_service_module
+
+pytestmark = pytest.mark.anyio
+
+
+def track(title: str, articles: int = 2) -> Dict[str, Any]:
+    return {
+        "title": title,
+        "articles": [
+            {
+                "title": f"{title} {index}",
+                "url": f"https://en.wikipedia.org/wiki/{title}_{index}",
+                "completed": index == 0,
+            }
+            for index in range(articles)
+        ],
+    }
+
+
+async def test_valid_tracks_are_stored_and_invalid_ones_reported(
+    client, headers, statements
+):
+    tracks = [
+        track("First"),
+        {"title": "No articles"},
+        track("Second", articles=3),
+        "not a track",
+        {**track("Third"), "visibility": "everyone"},
+        track("Fourth", articles=0),
+    ]
+
+    statements.clear()
+    response = await client.post("/api/tracks/bulk", json=tracks, headers=headers)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert len(body["created"]) == 3
+    errors = {error["index"]: error["errors"] for error in body["errors"]}
+    assert sorted(errors) == [1, 3, 4]
+    assert [error["loc"] for error in errors[1]] == [["articles"]]
+    assert errors[1][0]["type"] == "missing"
+    assert errors[3][0]["type"] == "model_attributes_type"
+    assert [error["loc"] for error in errors[4]] == [["visibility"]]
+
+    # One executemany per table, whether or not optional fields are set
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+    assert len([s for s in inserts if "INTO tracks " in s]) == 1
+    assert len([s for s in inserts if "INTO track_items " in s]) == 1
+
+    for track_id, expected in zip(body["created"], ["First", "Second", "Fourth"]):
+        response = await client.get(f"/api/tracks/{track_id}", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["title"] == expected
+    response = await client.get(f"/api/tracks/{body['created'][1]}", headers=headers)
+    assert [article["title"] for article in response.json()["articles"]] == [
+        "Second 0",
+        "Second 1",
+        "Second 2",
+    ]
+    assert [article["completed"] for article in response.json()["articles"]] == [
+        True,
+        False,
+        False,
+    ]
+
+
+async def test_import_with_only_invalid_tracks(client, headers):
+    response = await client.post(
+        "/api/tracks/bulk", json=[{"title": "No articles"}], headers=headers
+    )
+
+    assert response.status_code == 201
+    assert response.json()["created"] == []
+    assert [error["index"] for error in response.json()["errors"]] == [0]
+    response = await client.get("/api/tracks/", headers=headers)
+    assert response.json()["items"] == []
+
+
+async def test_import_size_is_capped(client, headers, monkeypatch):
+    monkeypatch.setattr(tracks_service_module, "BULK_IMPORT_MAX_TRACKS", 2)
+
+    response = await client.post(
+        "/api/tracks/bulk",
+        json=[track(str(index)) for index in range(3)],
+        headers=headers,
+    )
+
+    assert response.status_code == 413
@@ -0,0 +1,124 @@
+from typing import Dict, List
+
+import pytest
+from apps.backend.app.cache import MemoryCacheBackend, tracks_cache
+
+pytestmark = pytest.mark.anyio
+
+TRACK = {
+    "title": "Physics",
+    "description": "From mechanics to fields",
+    "articles": [
+        {
+            "title": "Classical mechanics",
+            "url": "https://en.wikipedia.org/wiki/Classical_mechanics",
+        },
+        {
+            "title": "Electromagnetism",
+            "url": "https://en.wikipedia.org/wiki/Electromagnetism",
+        },
+    ],
+}
+
+
+@pytest.fixture(params=["off", "cold"])
+def cache_mode(request, monkeypatch) -> str:
+    monkeypatch.setattr(tracks_cache, "backend", None)
+    if request.param == "cold":
+        monkeypatch.setattr(tracks_cache, "backend", MemoryCacheBackend())
+    return request.param
+
+
+async def create_track(client, headers: Dict[str, str]) -> dict:
+    response = await client.post("/api/tracks/", json=TRACK, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def track_reads(statements: List[str]) -> List[str]:
+    return [
+        statement
+        for statement in statements
+        if statement.lstrip().upper().startswith("SELECT")
+        and "track" in statement.lower()
+    ]
+
+
+def cold_cache(cache_mode: str):
+    # Drop every cached entry so the next conditional request finds nothing
+    if cache_mode == "cold":
+        tracks_cache.backend._entries.clear()
+
+
+async def test_track_not_modified_reads_only_updated_at(
+    client, headers, statements, cache_mode
+):
+    track = await create_track(client, headers=headers)
+    response = await client.get(f"/api/tracks/{track['id']}", headers=headers)
+    etag = response.headers["ETag"]
+    cold_cache(cache_mode)
+
+    statements.clear()
+    response = await client.get(
+        f"/api/tracks/{track['id']}", headers={**headers, "If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
+    reads = track_reads(statements)
+    assert len(reads) == 1
+    assert "updated_at" in reads[0]
+    assert "track_items" not in reads[0]
+    assert "description" not in reads[0]
+
+
+async def test_track_page_not_modified_reads_only_version(
+    client, headers, statements, cache_mode
+):
+    await create_track(client, headers=headers)
+    response = await client.get("/api/tracks/", headers=headers)
+    etag = response.headers["ETag"]
+    cold_cache(cache_mode)
+
+    statements.clear()
+    response = await client.get(
+        "/api/tracks/", headers={**headers, "If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
+    reads = track_reads(statements)
+    assert len(reads) == 1
+    assert "track_items" not in reads[0]
+    assert "description" not in reads[0]
+
+
+async def test_changed_track_is_sent_again(client, headers, cache_mode):
+    track = await create_track(client, headers=headers)
+    response = await client.get(f"/api/tracks/{track['id']}", headers=headers)
+    etag = response.headers["ETag"]
+
+    await client.patch(
+        f"/api/tracks/{track['id']}", json={"title": "Modern physics"}, headers=headers
+    )
+    cold_cache(cache_mode)
+    response = await client.get(
+        f"/api/tracks/{track['id']}", headers={**headers, "If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "Modern physics"
+    assert response.headers["ETag"] != etag
+
+
+async def test_warm_cache_needs_no_statements(client, headers, statements, monkeypatch):
+    monkeypatch.setattr(tracks_cache, "backend", MemoryCacheBackend())
+    track = await create_track(client, headers=headers)
+    response = await client.get(f"/api/tracks/{track['id']}", headers=headers)
+    etag = response.headers["ETag"]
+
+    statements.clear()
+    response = await client.get(
+        f"/api/tracks/{track['id']}", headers={**headers, "If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
+    assert track_reads(statements) == []
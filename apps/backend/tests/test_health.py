@@ -0,0 +1,28 @@
+import pytest
+from apps.backend.app import database
+from sqlalchemy.ext.asyncio import create_async_engine
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_database_health(client):
+    response = await client.get("/api/health/db")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert "pool" in response.json()
+
+
+async def test_database_health_when_the_primary_is_down(client, monkeypatch, tmp_path):
+    # A database in a directory that doesn't exist can't be opened
+    unreachable = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'vista.db'}"
+    )
+    monkeypatch.setattr(database, "get_engine", lambda: unreachable)
+
+    response = await client.get("/api/health/db")
+    await unreachable.dispose()
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "unhealthy"
+    assert "unable to open database file" in response.json()["error"]
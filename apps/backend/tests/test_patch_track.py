@@ -0,0 +1,189 @@
+from typing import Any, Dict, List
+
+import pytest
+from apps.backend.app.models.track import TrackItem
+from apps.backend.app.repositories import track_items_repository
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+pytestmark = pytest.mark.anyio
+
+TITLES = ["A", "B", "C", "D"]
+
+
+def article(title: str) -> Dict[str, Any]:
+    return {"title": title, "url": f"https://en.wikipedia.org/wiki/{title}"}
+
+
+@pytest.fixture
+async def track(client, headers) -> Dict[str, Any]:
+    body = {"title": "Letters", "articles": [article(title) for title in TITLES]}
+    response = await client.post("/api/tracks/", json=body, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+async def patch(client, headers, track, **body):
+    return await client.patch(f"/api/tracks/{track['id']}", json=body, headers=headers)
+
+
+def titles(response) -> List[str]:
+    assert response.status_code == 200, response.text
+    return [article["title"] for article in response.json()["articles"]]
+
+
+async def test_stale_if_match_fails_with_412(client, headers, track):
+    response = await client.get(f"/api/tracks/{track['id']}", headers=headers)
+    etag = response.headers["ETag"]
+
+    response = await client.patch(
+        f"/api/tracks/{track['id']}",
+        json={"title": "First"},
+        headers={**headers, "If-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    response = await client.patch(
+        f"/api/tracks/{track['id']}",
+        json={"title": "Second", "operations": [{"op": "remove", "index": 0}]},
+        headers={**headers, "If-Match": etag},
+    )
+    assert response.status_code == 412
+
+    response = await client.get(f"/api/tracks/{track['id']}", headers=headers)
+    assert response.json()["title"] == "First"
+    assert titles(response) == TITLES
+
+
+async def test_foreign_if_match_fails_with_412(client, headers, track):
+    response = await client.patch(
+        f"/api/tracks/{track['id']}",
+        json={"title": "Renamed"},
+        headers={**headers, "If-Match": 'W/"something-else"'},
+    )
+
+    assert response.status_code == 412
+
+
+async def test_if_match_any(client, headers, track):
+    response = await client.patch(
+        f"/api/tracks/{track['id']}",
+        json={"title": "Renamed"},
+        headers={**headers, "If-Match": "*"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+
+
+@pytest.mark.parametrize(
+    "index, expected",
+    [
+        (0, ["New", "A", "B", "C", "D"]),
+        (2, ["A", "B", "New", "C", "D"]),
+        (99, ["A", "B", "C", "D", "New"]),
+    ],
+)
+async def test_insert(client, headers, track, index, expected):
+    operation = {"op": "insert", "index": index, "article": article("New")}
+
+    response = await patch(client, headers, track, operations=[operation])
+
+    assert titles(response) == expected
+
+
+@pytest.mark.parametrize(
+    "index, to_index, expected",
+    [
+        (0, 2, ["B", "C", "A", "D"]),
+        (2, 0, ["C", "A", "B", "D"]),
+        (1, 2, ["A", "C", "B", "D"]),
+        (0, 99, ["B", "C", "D", "A"]),
+    ],
+)
+async def test_move(client, headers, track, index, to_index, expected):
+    operation = {"op": "move", "index": index, "to_index": to_index}
+
+    response = await patch(client, headers, track, operations=[operation])
+
+    assert titles(response) == expected
+
+
+@pytest.mark.parametrize(
+    "index, expected", [(0, ["B", "C", "D"]), (2, ["A", "B", "D"])]
+)
+async def test_remove(client, headers, track, index, expected):
+    response = await patch(
+        client, headers, track, operations=[{"op": "remove", "index": index}]
+    )
+
+    assert titles(response) == expected
+
+
+async def test_operation_past_the_end_rolls_back_the_patch(client, headers, track):
+    response = await patch(
+        client,
+        headers,
+        track,
+        title="Renamed",
+        operations=[
+            {"op": "remove", "index": 0},
+            {"op": "remove", "index": 99},
+        ],
+    )
+
+    assert response.status_code == 422
+    response = await client.get(f"/api/tracks/{track['id']}", headers=headers)
+    assert response.json()["title"] == "Letters"
+    assert titles(response) == TITLES
+
+
+async def test_operations_apply_in_order(client, headers, track):
+    response = await patch(
+        client,
+        headers,
+        track,
+        operations=[
+            {"op": "set_completed", "title": "B", "completed": True},
+            {"op": "move", "title": "D", "to_index": 0},
+            {"op": "remove", "index": 1},
+            {"op": "insert", "index": 1, "article": article("New")},
+        ],
+    )
+
+    assert titles(response) == ["D", "New", "B", "C"]
+    assert [item["completed"] for item in response.json()["articles"]] == [
+        False,
+        False,
+        True,
+        False,
+    ]
+
+
+async def test_move_into_an_exhausted_gap_renumbers(
+    client, headers, database, monkeypatch
+):
+    # Positions 2, 4, 6, so the second move finds no gap left
+    monkeypatch.setattr(track_items_repository, "POSITION_GAP", 2)
+    body = {"title": "Letters", "articles": [article(title) for title in "ABC"]}
+    response = await client.post("/api/tracks/", json=body, headers=headers)
+    track = response.json()
+
+    response = await patch(
+        client, headers, track, operations=[{"op": "move", "index": 2, "to_index": 1}]
+    )
+    assert titles(response) == ["A", "C", "B"]
+    response = await patch(
+        client, headers, track, operations=[{"op": "move", "index": 2, "to_index": 1}]
+    )
+    assert titles(response) == ["A", "B", "C"]
+
+    async with AsyncSession(database) as session:
+        result = await session.execute(
+            select(TrackItem.title, TrackItem.position)
+            .where(TrackItem.track_id == track["id"])
+            .order_by(TrackItem.position)
+        )
+        # A and C were adjacent (2 and 3); renumbered to 2, 4, 6 first
+        assert result.all() == [("A", 2), ("B", 3), ("C", 4)]
@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import pytest
+from apps.backend.app.models.progress import ReadingStreak
+from apps.backend.app.repositories.progress_repository import ProgressRepository
+from sqlalchemy.ext.asyncio import AsyncSession
+
+pytestmark = pytest.mark.anyio
+
+DAY = datetime(2026, 3, 2, 9, 30)
+
+
+def articles(*titles: str, completed: int = 0) -> List[Dict[str, Any]]:
+    return [
+        {
+            "title": title,
+            "url": f"https://en.wikipedia.org/wiki/{title}",
+            "completed": index < completed,
+        }
+        for index, title in enumerate(titles)
+    ]
+
+
+async def create_track(client, headers, title: str, **body) -> Dict[str, Any]:
+    response = await client.post(
+        "/api/tracks/", json={"title": title, **body}, headers=headers
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture
+async def track(client, headers) -> Dict[str, Any]:
+    return await create_track(client, headers, "Optics", articles=articles("Lens"))
+
+
+async def complete_at(database, user_id, track, completed_at) -> ReadingStreak:
+    """Record a completion at ``completed_at`` and return the streak after it"""
+    async with AsyncSession(database) as session:
+        await ProgressRepository().record_completion(
+            user_id=user_id,
+            track_id=track["id"],
+            item_id=track["articles"][0]["id"],
+            completed_at=completed_at,
+            session=session,
+        )
+        await session.commit()
+        return await session.get(ReadingStreak, user_id)
+
+
+def streak(row: ReadingStreak) -> tuple:
+    return (
+        row.current_streak,
+        row.longest_streak,
+        row.last_day,
+        row.last_day_completions,
+    )
+
+
+async def test_completions_on_the_same_day(database, user_id, track):
+    await complete_at(database, user_id, track, DAY)
+    row = await complete_at(database, user_id, track, DAY + timedelta(hours=12))
+
+    assert streak(row) == (1, 1, DAY.date(), 2)
+
+
+async def test_completion_on_the_next_day_extends_the_streak(database, user_id, track):
+    await complete_at(database, user_id, track, DAY)
+    await complete_at(database, user_id, track, DAY + timedelta(hours=1))
+    row = await complete_at(database, user_id, track, DAY + timedelta(days=1))
+
+    assert streak(row) == (2, 2, DAY.date() + timedelta(days=1), 1)
+
+
+async def test_gap_of_more_than_a_day_restarts_the_streak(database, user_id, track):
+    for days in range(3):
+        await complete_at(database, user_id, track, DAY + timedelta(days=days))
+    row = await complete_at(database, user_id, track, DAY + timedelta(days=4))
+
+    assert streak(row) == (1, 3, DAY.date() + timedelta(days=4), 1)
+
+    row = await complete_at(database, user_id, track, DAY + timedelta(days=5))
+    assert streak(row) == (2, 3, DAY.date() + timedelta(days=5), 1)
+
+
+async def test_home_of_a_user_without_tracks(database, client, headers, user_id):
+    async with AsyncSession(database) as session:
+        rows = await ProgressRepository().find_home(
+            user_id=user_id, limit=20, session=session
+        )
+
+    assert len(rows) == 1
+    assert rows[0]["id"] is None
+    assert rows[0]["current_streak"] is None
+
+    response = await client.get("/api/home", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "queue": [],
+        "streak": {
+            "current": 0,
+            "longest": 0,
+            "completed_today": 0,
+            "last_day": None,
+        },
+    }
+
+
+async def test_home_with_a_streak_and_only_finished_tracks(
+    database, client, headers, user_id
+):
+    finished = await create_track(
+        client, headers, "Done", articles=articles("Lens", "Prism", completed=2)
+    )
+    await complete_at(database, user_id, finished, datetime.utcnow())
+
+    async with AsyncSession(database) as session:
+        rows = await ProgressRepository().find_home(
+            user_id=user_id, limit=20, session=session
+        )
+
+    # The streak-only row
+    assert len(rows) == 1
+    assert rows[0]["id"] is None
+    assert rows[0]["current_streak"] == 1
+
+    response = await client.get("/api/home", headers=headers)
+    assert response.json()["queue"] == []
+    assert response.json()["streak"]["current"] == 1
+    assert response.json()["streak"]["completed_today"] == 1
+
+
+async def test_home_queue(client, headers):
+    older = await create_track(
+        client, headers, "Older", articles=articles("A", "B", "C", completed=1)
+    )
+    await create_track(client, headers, "Finished", articles=articles("D", completed=1))
+    newer = await create_track(client, headers, "Newer", articles=articles("E", "F"))
+
+    response = await client.get("/api/home", headers=headers)
+    queue = response.json()["queue"]
+    assert [(item["id"], item["next_article"]["title"]) for item in queue] == [
+        (newer["id"], "E"),
+        (older["id"], "B"),
+    ]
+
+    # Completing an article moves its track to the front and counts today
+    response = await client.patch(
+        f"/api/tracks/{older['id']}",
+        json={"operations": [{"op": "set_completed", "index": 1, "completed": True}]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    response = await client.get("/api/home", headers=headers)
+    body = response.json()
+    assert [(item["id"], item["next_article"]["title"]) for item in body["queue"]] == [
+        (older["id"], "C"),
+        (newer["id"], "E"),
+    ]
+    assert body["queue"][0]["completed_count"] == 2
+    assert body["streak"]["current"] == 1
+    assert body["streak"]["completed_today"] == 1
+
+    response = await client.get("/api/home?limit=1", headers=headers)
+    assert len(response.json()["queue"]) == 1
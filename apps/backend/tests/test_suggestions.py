@@ -0,0 +1,129 @@
+from pathlib import Path
+
+import pytest
+from apps.backend.app.link_graph import LinkGraph, build_link_graph, read_edges
+from apps.backend.app.main import app
+from apps.backend.app.services.suggestion_service import (
+    SuggestionService,
+    get_suggestion_service,
+)
+
+pytestmark = pytest.mark.anyio
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "link_graph.tsv"
+
+
+@pytest.fixture
+def graph_path(tmp_path) -> str:
+    path = str(tmp_path / "link_graph.bin")
+    build_link_graph(edges=read_edges(path=str(FIXTURE)), path=path)
+    return path
+
+
+@pytest.fixture
+def graph(graph_path):
+    graph = LinkGraph(path=graph_path)
+    yield graph
+    graph.close()
+
+
+@pytest.fixture
+def suggestion_service(graph_path):
+    service = SuggestionService(graph_path=graph_path)
+    app.dependency_overrides[get_suggestion_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_suggestion_service, None)
+    service.close()
+
+
+def test_prerequisites_come_first(graph):
+    suggestions, unknown = graph.suggest(titles=["Deep learning"], limit=6)
+
+    assert [suggestion.title for suggestion in suggestions] == [
+        "Set (mathematics)",
+        "Gradient descent",
+        "Real number",
+        "Linear algebra",
+        "Backpropagation",
+        "Artificial neural network",
+    ]
+    placed = set()
+    for suggestion in suggestions:
+        assert set(suggestion.prerequisites) <= placed
+        placed.add(suggestion.title)
+    assert unknown == []
+
+
+def test_hubs_and_seeds_are_left_out(graph):
+    suggestions, _ = graph.suggest(titles=["Deep learning"], limit=6)
+    titles = [suggestion.title for suggestion in suggestions]
+
+    # Linked from Deep learning, but also from nearly everything else
+    assert "United States" not in titles
+    assert "Deep learning" not in titles
+
+
+def test_unknown_titles_are_reported(graph):
+    suggestions, unknown = graph.suggest(
+        titles=["deep_learning", "No such article"], limit=3
+    )
+
+    assert len(suggestions) == 3
+    assert unknown == ["No such article"]
+    assert graph.suggest(titles=["No such article"], limit=3) == (
+        [],
+        ["No such article"],
+    )
+
+
+def test_completed_articles_are_excluded(graph):
+    suggestions, _ = graph.suggest(
+        titles=["Deep learning"], limit=6, exclude=["Linear algebra"]
+    )
+    by_title = {suggestion.title: suggestion for suggestion in suggestions}
+
+    assert "Linear algebra" not in by_title
+    assert by_title["Artificial neural network"].completed_prerequisites == [
+        "Linear algebra"
+    ]
+
+
+async def test_suggest_leaves_out_completed_articles(
+    client, headers, suggestion_service
+):
+    track = {
+        "title": "Linear algebra",
+        "articles": [
+            {
+                "title": "Linear algebra",
+                "url": "https://en.wikipedia.org/wiki/Linear_algebra",
+                "completed": True,
+            }
+        ],
+    }
+    response = await client.post("/api/tracks/", json=track, headers=headers)
+    assert response.status_code == 201
+
+    response = await client.post(
+        "/api/tracks/suggest",
+        json={"titles": ["Deep learning", "No such article"], "limit": 6},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    titles = [item["title"] for item in body["items"]]
+    assert "Linear algebra" not in titles
+    assert titles[:2] == ["Set (mathematics)", "Gradient descent"]
+    assert (
+        body["items"][0]["url"] == "https://en.wikipedia.org/wiki/Set_%28mathematics%29"
+    )
+    assert body["unknown_titles"] == ["No such article"]
+
+
+async def test_suggest_without_a_graph(client, headers):
+    response = await client.post(
+        "/api/tracks/suggest", json={"titles": ["Deep learning"]}, headers=headers
+    )
+
+    assert response.status_code == 503
@@ -0,0 +1,178 @@
+import asyncio
+from typing import Any, Callable, Dict, List
+
+import pytest
+from apps.backend.app import tasks
+from apps.backend.app.models.job import Job
+from apps.backend.app.services.tracks_service import tracks_service
+from apps.backend.app.services.wikipedia_service import WikipediaService
+from apps.backend.app.tasks import TaskRunner, task_runner
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def runner(database):
+    runner = TaskRunner(workers=2, queue_size=4, poll_interval=0.05)
+    yield runner
+    await runner.stop(timeout=1)
+
+
+async def find_jobs(database) -> List[Job]:
+    async with AsyncSession(database) as session:
+        result = await session.execute(select(Job).order_by(Job.id))
+        return list(result.scalars().all())
+
+
+async def wait_until(condition: Callable[[], bool], timeout: float = 5) -> None:
+    async def poll() -> None:
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout=timeout)
+
+
+async def jobs_finished(database) -> None:
+    while await find_jobs(database):
+        await asyncio.sleep(0.05)
+
+
+async def test_enqueued_job_runs_and_is_deleted(database, runner):
+    payloads: List[Dict[str, Any]] = []
+
+    async def handler(payload: Dict[str, Any]) -> None:
+        payloads.append(payload)
+
+    runner.register(kind="record", handler=handler)
+    runner.start()
+    await runner.enqueue(kind="record", payload={"track_id": "a"})
+    await wait_until(lambda: payloads)
+    await runner.stop()
+
+    assert payloads == [{"track_id": "a"}]
+    assert await find_jobs(database) == []
+
+
+async def test_unknown_kind_is_refused(runner):
+    with pytest.raises(ValueError):
+        await runner.enqueue(kind="unknown", payload={})
+
+
+async def test_failed_job_is_retried_with_backoff(database, runner, monkeypatch):
+    monkeypatch.setattr(tasks, "TASK_RETRY_BASE_SECONDS", 0.05)
+    attempts: List[float] = []
+
+    async def flaky(payload: Dict[str, Any]) -> None:
+        attempts.append(asyncio.get_running_loop().time())
+        if len(attempts) < 3:
+            raise RuntimeError("Try again")
+
+    runner.register(kind="flaky", handler=flaky)
+    runner.start()
+    await runner.enqueue(kind="flaky", payload={})
+    await wait_until(lambda: len(attempts) == 3)
+    await runner.stop()
+
+    # About base * 2^(n - 1) between attempts, at least half of it with jitter
+    assert attempts[1] - attempts[0] >= 0.025
+    assert attempts[2] - attempts[1] >= 0.05
+    assert await find_jobs(database) == []
+
+
+async def test_job_out_of_attempts_is_parked(database, runner, monkeypatch):
+    monkeypatch.setattr(tasks, "TASK_RETRY_BASE_SECONDS", 0.01)
+    calls: List[Dict[str, Any]] = []
+
+    async def broken(payload: Dict[str, Any]) -> None:
+        calls.append(payload)
+        raise RuntimeError("Always fails")
+
+    runner.register(kind="broken", handler=broken)
+    runner.start()
+    await runner.enqueue(kind="broken", payload={}, max_attempts=2)
+    await wait_until(lambda: len(calls) == 2)
+    await asyncio.sleep(0.2)
+    await runner.stop()
+
+    assert len(calls) == 2
+    [job] = await find_jobs(database)
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert job.last_error == "RuntimeError: Always fails"
+
+
+async def test_job_enqueued_in_a_rolled_back_transaction_never_runs(database, runner):
+    payloads: List[Dict[str, Any]] = []
+
+    async def handler(payload: Dict[str, Any]) -> None:
+        payloads.append(payload)
+
+    runner.register(kind="record", handler=handler)
+    runner.start()
+    async with AsyncSession(database) as session:
+        await runner.enqueue(kind="record", payload={"write": 1}, session=session)
+        await session.rollback()
+    async with AsyncSession(database) as session:
+        await runner.enqueue(kind="record", payload={"write": 2}, session=session)
+        await session.commit()
+    await wait_until(lambda: payloads)
+    await asyncio.sleep(0.2)
+    await runner.stop()
+
+    assert payloads == [{"write": 2}]
+    assert await find_jobs(database) == []
+
+
+async def test_stop_finishes_running_jobs_and_releases_queued_ones(database):
+    runner = TaskRunner(workers=1, queue_size=4, poll_interval=0.05)
+    gate = asyncio.Event()
+    started: List[int] = []
+
+    async def slow(payload: Dict[str, Any]) -> None:
+        started.append(payload["index"])
+        await gate.wait()
+
+    runner.register(kind="slow", handler=slow)
+    for index in range(3):
+        await runner.enqueue(kind="slow", payload={"index": index})
+    runner.start()
+    await wait_until(lambda: started and runner.queued == 2)
+
+    stopping = asyncio.create_task(runner.stop(timeout=5))
+    await asyncio.sleep(0.1)
+    gate.set()
+    await stopping
+
+    assert started == [0]
+    jobs = await find_jobs(database)
+    assert [job.payload["index"] for job in jobs] == [1, 2]
+    # Handed back without using up an attempt
+    assert all(job.status == "pending" and job.attempts == 0 for job in jobs)
+
+
+async def test_new_tracks_articles_are_resolved_by_a_job(
+    database, client, headers, wikipedia_stub, monkeypatch
+):
+    wikipedia = WikipediaService(api_url=wikipedia_stub.url)
+    monkeypatch.setattr(tracks_service, "wikipedia_service", wikipedia)
+    track = {
+        "title": "Computing",
+        "articles": [{"title": "Alan Turing", "url": "https://example.com/turing"}],
+    }
+    task_runner.start()
+    try:
+        response = await client.post("/api/tracks/", json=track, headers=headers)
+        assert response.status_code == 201
+        track_id = response.json()["id"]
+
+        await asyncio.wait_for(jobs_finished(database), timeout=5)
+    finally:
+        await task_runner.stop()
+        await wikipedia.close()
+
+    response = await client.get(f"/api/tracks/{track_id}", headers=headers)
+    [resolved] = response.json()["articles"]
+    assert resolved["url"] == "https://en.wikipedia.org/wiki/Alan_Turing"
+    assert resolved["description"] == "Stub description of Alan Turing"
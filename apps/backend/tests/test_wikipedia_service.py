@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from apps.backend.app.models.user import User
+from apps.backend.app.services.wikipedia_service import (
+    WikipediaService,
+    WikipediaUnavailableError,
+)
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def wikipedia(wikipedia_stub):
+    service = WikipediaService(api_url=wikipedia_stub.url)
+    yield service
+    await service.close()
+
+
+async def test_resolves_titles_and_leaves_out_missing_pages(database, wikipedia):
+    async with AsyncSession(database) as session:
+        pages = await wikipedia.resolve(
+            titles=["alan_turing", "Nothing here (missing)"], session=session
+        )
+
+    assert list(pages) == ["alan_turing"]
+    assert pages["alan_turing"].title == "Alan turing"
+    assert pages["alan_turing"].url == "https://en.wikipedia.org/wiki/Alan_turing"
+
+
+async def test_cached_titles_are_not_fetched_again(database, wikipedia, wikipedia_stub):
+    titles = ["Entropy", "Enthalpy", "Nothing here (missing)"]
+    async with AsyncSession(database) as session:
+        first = await wikipedia.resolve(titles=titles, session=session)
+    async with AsyncSession(database) as session:
+        second = await wikipedia.resolve(titles=titles, session=session)
+
+    assert second == first
+    # Misses are cached too
+    assert wikipedia_stub.stats.requests == 1
+
+
+async def test_concurrent_lookups_share_one_request(
+    database, wikipedia, wikipedia_stub
+):
+    async def resolve():
+        async with AsyncSession(database) as session:
+            return await wikipedia.resolve(titles=["Photon", "Quark"], session=session)
+
+    results = await asyncio.gather(*[resolve() for _ in range(10)])
+
+    assert all(result == results[0] for result in results)
+    assert set(results[0]) == {"Photon", "Quark"}
+    assert wikipedia_stub.stats.requests == 1
+    assert wikipedia_stub.stats.titles == 2
+
+
+async def test_unreachable_api(database, wikipedia, wikipedia_stub):
+    await wikipedia_stub.close()
+
+    async with AsyncSession(database) as session:
+        assert await wikipedia.resolve(titles=["Photon"], session=session) == {}
+        with pytest.raises(WikipediaUnavailableError):
+            await wikipedia.resolve(
+                titles=["Photon"], session=session, require_all=True
+            )
+
+
+async def test_caching_leaves_the_callers_transaction_alone(
+    database, wikipedia, wikipedia_stub
+):
+    async with AsyncSession(database) as session:
+        session.add(User(id="reader", email="reader@example.com"))
+        await session.commit()
+
+    async with AsyncSession(database) as session:
+        user = await session.get(User, "reader")
+        await wikipedia.resolve(titles=["Photon"], session=session)
+        # A commit of this session would have expired the user
+        assert inspect(user).expired_attributes == set()
+        assert session.in_transaction()
+
+    async with AsyncSession(database) as session:
+        await wikipedia.resolve(titles=["Photon"], session=session)
+    assert wikipedia_stub.stats.requests == 1
+
+
+async def test_cancelled_waiter_leaves_the_shared_lookup_alone(
+    database, wikipedia, wikipedia_stub
+):
+    async def resolve():
+        async with AsyncSession(database) as session:
+            return await wikipedia.resolve(titles=["Photon"], session=session)
+
+    owner = asyncio.create_task(resolve())
+    await asyncio.sleep(0.01)
+    waiters = [asyncio.create_task(resolve()) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    # The owner's request to the stub is still in flight
+    waiters[0].cancel()
+
+    assert set(await owner) == {"Photon"}
+    assert set(await waiters[1]) == {"Photon"}
+    with pytest.raises(asyncio.CancelledError):
+        await waiters[0]
+    assert wikipedia_stub.stats.requests == 1
@@ -1,9 +1,12 @@
 import { supabase } from "./supabase";
 import { logger } from "./logger";
+import type { Track, TrackPage } from "@/types";
 
 const API_BASE_URL =
   import.meta.env.VITE_API_BASE_URL || "https://api.project-vista.com";
 
+const TRACKS_PAGE_SIZE = 100;
+
 async function getAuthHeaders() {
   const {
     data: { session },
@@ -105,14 +108,29 @@ export async function apiCall(url: string, options: RequestInit = {}) {
   }
 }
 
-export async function fetchTracks() {
-  const response = await apiCall("/api/tracks/");
+export async function fetchTracks(): Promise<Track[]> {
+  // The list endpoint is paginated; follow next_cursor until all pages are read
+  const tracks: Track[] = [];
+  let cursor: string | null = null;
 
-  if (!response.ok) {
-    throw new Error(`Failed to fetch tracks: ${response.statusText}`);
-  }
+  do {
+    const params = new URLSearchParams({ limit: String(TRACKS_PAGE_SIZE) });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
 
-  return response.json();
+    const response = await apiCall(`/api/tracks/?${params.toString()}`);
+
+    if (!response.ok) {
+      throw new Error(`Failed to fetch tracks: ${response.statusText}`);
+    }
+
+    const page: TrackPage = await response.json();
+    tracks.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+
+  return tracks;
 }
 
 export async function createTrack(
@@ -165,3 +183,23 @@ export async function updateTrack(
 
   return response.json();
 }
+
+export async function updateTrackItem(
+  trackId: string,
+  itemId: string,
+  updateData: {
+    completed?: boolean;
+    index?: number;
+  },
+) {
+  const response = await apiCall(`/api/tracks/${trackId}/items/${itemId}`, {
+    method: "PATCH",
+    body: JSON.stringify(updateData),
+  });
+
+  if (!response.ok) {
+    throw new Error(`Failed to update track item: ${response.statusText}`);
+  }
+
+  return response.json();
+}
@@ -26,7 +26,7 @@ import {
 import { ThemeToggle } from "@/components/ThemeToggle";
 import UserMenu from "@/components/UserMenu";
 import { supabase } from "@/lib/supabase";
-import { fetchTrack, updateTrack } from "@/lib/api";
+import { fetchTrack, updateTrackItem } from "@/lib/api";
 import { useToast } from "@/hooks/use-toast";
 import { User } from "@supabase/supabase-js";
 
@@ -80,21 +80,19 @@ const ItemPage = () => {
     setUpdating(true);
 
     try {
-      // Create updated articles array
-      const updatedArticles = track.articles.map((article, index) => {
-        if (index === currentIndex) {
-          return { ...article, completed: !article.completed };
-        }
-        return article;
-      });
-
-      // Update backend
-      const updatedTrack = await updateTrack(trackId, {
-        articles: updatedArticles,
+      // Toggle just this article on the backend
+      const target = track.articles[currentIndex];
+      const updatedItem = await updateTrackItem(trackId, target.id!, {
+        completed: !target.completed,
       });
 
       // Update local state with backend response
-      setTrack(updatedTrack);
+      const updatedArticles = track.articles.map((article, index) =>
+        index === currentIndex
+          ? { ...article, completed: updatedItem.completed }
+          : article,
+      );
+      setTrack({ ...track, articles: updatedArticles });
 
       // Show success toast
       const updatedArticle = updatedArticles[currentIndex];
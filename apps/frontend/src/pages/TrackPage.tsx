@@ -33,7 +33,7 @@ import {
 import { ThemeToggle } from "@/components/ThemeToggle";
 import UserMenu from "@/components/UserMenu";
 import { supabase } from "@/lib/supabase";
-import { fetchTrack, updateTrack } from "@/lib/api";
+import { fetchTrack, updateTrackItem } from "@/lib/api";
 import { useToast } from "@/hooks/use-toast";
 import { User } from "@supabase/supabase-js";
 import { useNavigate } from "react-router-dom";
@@ -183,21 +183,19 @@ const TrackPage = () => {
     setUpdatingArticles((prev) => new Set(prev).add(articleIndex));
 
     try {
-      // Create updated articles array
-      const updatedArticles = track.articles.map((article, index) => {
-        if (index === articleIndex) {
-          return { ...article, completed: !article.completed };
-        }
-        return article;
-      });
-
-      // Update backend
-      const updatedTrack = await updateTrack(trackId, {
-        articles: updatedArticles,
+      // Toggle just this article on the backend
+      const target = track.articles[articleIndex];
+      const updatedItem = await updateTrackItem(trackId, target.id!, {
+        completed: !target.completed,
       });
 
       // Update local state with backend response
-      setTrack(updatedTrack);
+      const updatedArticles = track.articles.map((article, index) =>
+        index === articleIndex
+          ? { ...article, completed: updatedItem.completed }
+          : article,
+      );
+      setTrack({ ...track, articles: updatedArticles });
 
       // Show success toast
       const article = updatedArticles[articleIndex];
@@ -6,6 +6,7 @@ export interface User {
 }
 
 export interface WikipediaArticle {
+  id?: string;
   title: string;
   url: string;
   description?: string;
@@ -22,6 +23,11 @@ export interface Track {
   updated_at: string;
 }
 
+export interface TrackPage {
+  items: Track[];
+  next_cursor: string | null;
+}
+
 export interface WikipediaSearchResult {
   title: string;
   url: string;